@@ -0,0 +1,302 @@
+"""Time and memory-profile the Cif, supercell, environment and ensemble
+stages on the test .cif files and the ErCoIn_big example folder.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json
+
+With a baseline, the stages whose minimum time or peak memory grow beyond
+the tolerance are reported, and the exit code is 1.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from functools import cached_property
+
+from cifkit import Cif, CifEnsemble
+from cifkit.coordination.filter import find_best_polyhedron
+from cifkit.data import radius_optimization
+from cifkit.data.example import Example
+from cifkit.data.radius_handler import get_is_radius_data_available
+from cifkit.data.radius_optimization import get_refined_CIF_radius
+from cifkit.preprocessors.environment import get_site_connections
+from cifkit.preprocessors.supercell import get_supercell_points
+from cifkit.utils.benchmark import (
+    compare_benchmark_results,
+    load_benchmark_results,
+    measure,
+    save_benchmark_results,
+)
+from cifkit.utils.cif_parser import get_cif_block
+from cifkit.utils.folder import get_file_paths
+
+TEST_CIF_DIR_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "data",
+    "cif",
+)
+
+# Folder of .cif files and the folder of well-formatted files for the
+# ensemble stages, by dataset name
+DATASETS = {
+    "tests": (
+        TEST_CIF_DIR_PATH,
+        os.path.join(TEST_CIF_DIR_PATH, "ensemble_test"),
+    ),
+    "ErCoIn_big": (
+        Example.ErCoIn_big_folder_path.value,
+        Example.ErCoIn_big_folder_path.value,
+    ),
+}
+
+
+class Dataset:
+    """Copies of the .cif files of a folder, so that preprocessing and
+    moving ill-formatted files leave the folder unchanged."""
+
+    def __init__(
+        self,
+        name: str,
+        dir_path: str,
+        ensemble_dir_path: str,
+        work_dir: str,
+    ) -> None:
+        self.name = name
+        self.dir_path = dir_path
+        self.ensemble_dir_path = ensemble_dir_path
+        self.work_dir = work_dir
+        self._copy_count = 0
+
+    @cached_property
+    def cifs(self) -> list[Cif]:
+        """Cif objects with connections, for the stages after them."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.init_cifs(self.copy())
+
+    def copy(self) -> str:
+        """Return the path to a new copy of the folder."""
+        return self._copy_dir(self.dir_path)
+
+    def copy_ensemble(self) -> str:
+        """Return the path to a new copy of the ensemble folder."""
+        return self._copy_dir(self.ensemble_dir_path)
+
+    def _copy_dir(self, dir_path: str) -> str:
+        self._copy_count += 1
+        copy_dir_path = os.path.join(
+            self.work_dir, f"{self.name}_{self._copy_count}"
+        )
+        shutil.copytree(dir_path, copy_dir_path)
+        return copy_dir_path
+
+    def copy_file_paths(self) -> list[str]:
+        return get_file_paths(self.copy(), add_nested_files=True)
+
+    @staticmethod
+    def init_cifs(dir_path: str) -> list[Cif]:
+        """Initialize the .cif files in the folder, skipping the files that
+        fail as the test folder holds ill-formatted ones on purpose."""
+        cifs = []
+        for file_path in get_file_paths(dir_path, add_nested_files=True):
+            try:
+                cif = Cif(file_path)
+                cif.compute_connections()
+            except Exception:
+                continue
+            cifs.append(cif)
+        return cifs
+
+
+def benchmark_cif_init(dataset: Dataset, repeat: int) -> dict:
+    def init_cifs(file_paths):
+        for file_path in file_paths:
+            try:
+                Cif(file_path)
+            except Exception:
+                continue
+
+    return measure(init_cifs, dataset.copy_file_paths, repeat)
+
+
+def benchmark_supercell_points(dataset: Dataset, repeat: int) -> dict:
+    blocks = [get_cif_block(cif.file_path) for cif in dataset.cifs]
+
+    def get_all_supercell_points():
+        for block in blocks:
+            get_supercell_points(block, 3)
+
+    return measure(get_all_supercell_points, repeat=repeat)
+
+
+def benchmark_site_connections(dataset: Dataset, repeat: int) -> dict:
+    inputs = [
+        (
+            [cif.site_labels, cif.unitcell_lengths, cif.unitcell_angles],
+            cif.unitcell_point_array,
+            cif.supercell_point_array,
+        )
+        for cif in dataset.cifs
+    ]
+
+    def get_all_site_connections():
+        for parsed_data, unitcell_points, supercell_points in inputs:
+            get_site_connections(
+                parsed_data,
+                unitcell_points,
+                supercell_points,
+                cutoff_radius=10.0,
+            )
+
+    return measure(get_all_site_connections, repeat=repeat)
+
+
+def benchmark_refined_CIF_radius(dataset: Dataset, repeat: int) -> dict:
+    inputs = [
+        (list(cif.unique_elements), cif.shortest_bond_pair_distance)
+        for cif in dataset.cifs
+        if get_is_radius_data_available(cif.unique_elements)
+    ]
+
+    def get_all_refined_CIF_radius():
+        # Refine the radii from scratch, not from the memoized results
+        radius_optimization._REFINED_RADIUS_CACHE.clear()
+        for elements, shortest_distances in inputs:
+            get_refined_CIF_radius(elements, shortest_distances)
+
+    return measure(get_all_refined_CIF_radius, repeat=repeat)
+
+
+def benchmark_find_best_polyhedron(dataset: Dataset, repeat: int) -> dict:
+    inputs = [
+        (cif.CN_max_gap_per_site, cif.connections) for cif in dataset.cifs
+    ]
+
+    def find_all_best_polyhedron():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for max_gaps_per_label, connections in inputs:
+                find_best_polyhedron(max_gaps_per_label, connections)
+
+    return measure(find_all_best_polyhedron, repeat=repeat)
+
+
+def benchmark_ensemble_init(dataset: Dataset, repeat: int) -> dict:
+    def init_ensemble(dir_path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            CifEnsemble(dir_path)
+
+    return measure(init_ensemble, dataset.copy_ensemble, repeat)
+
+
+def benchmark_ensemble_filters(dataset: Dataset, repeat: int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        ensemble = CifEnsemble(dataset.copy_ensemble())
+    cifs = ensemble.cifs
+
+    def filter_ensemble():
+        ensemble.filter_by_formulas([cifs[0].formula])
+        ensemble.filter_by_structures([cifs[0].structure])
+        ensemble.filter_by_space_group_numbers([cifs[0].space_group_number])
+        ensemble.filter_by_site_mixing_types(["full_occupancy"])
+        ensemble.filter_by_composition_types([2, 3])
+        ensemble.filter_by_elements_containing(["Er"])
+        ensemble.filter_by_elements_exact_matching(["Er", "Co", "In"])
+        ensemble.filter_by_supercell_count(
+            cifs[0].supercell_atom_count, cifs[-1].supercell_atom_count
+        )
+
+    return measure(filter_ensemble, repeat=repeat)
+
+
+BENCHMARKS = {
+    "cif_init": benchmark_cif_init,
+    "supercell_points": benchmark_supercell_points,
+    "site_connections": benchmark_site_connections,
+    "refined_CIF_radius": benchmark_refined_CIF_radius,
+    "find_best_polyhedron": benchmark_find_best_polyhedron,
+    "ensemble_init": benchmark_ensemble_init,
+    "ensemble_filters": benchmark_ensemble_filters,
+}
+
+
+def run_benchmarks(
+    dataset_names: list[str], benchmark_names: list[str], repeat: int
+) -> dict[str, dict]:
+    """Return the results of each benchmark per dataset, by names such as
+    "site_connections[ErCoIn_big]"."""
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for dataset_name in dataset_names:
+            dataset = Dataset(dataset_name, *DATASETS[dataset_name], work_dir)
+            for benchmark_name in benchmark_names:
+                name = f"{benchmark_name}[{dataset_name}]"
+                result = BENCHMARKS[benchmark_name](dataset, repeat)
+                results[name] = result
+                print(
+                    f"{name}: {result['min_time']:.3f} s, "
+                    f"{result['peak_memory'] / 1e6:.1f} MB"
+                )
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Path to save the results as JSON.")
+    parser.add_argument(
+        "--baseline", help="Path to the JSON results to compare against."
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=list(DATASETS),
+        default=list(DATASETS),
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed growth of the minimum time, by default 0.2 (20%%).",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed growth of the peak memory, by default 0.2 (20%%).",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.datasets, args.benchmarks, args.repeat)
+    if args.output:
+        save_benchmark_results(args.output, results)
+
+    if args.baseline:
+        regressions = compare_benchmark_results(
+            results,
+            load_benchmark_results(args.baseline),
+            time_tolerance=args.time_tolerance,
+            memory_tolerance=args.memory_tolerance,
+        )
+        for regression in regressions:
+            print(
+                f"Regression in {regression['name']} "
+                f"{regression['metric']}: {regression['baseline']:.4g} -> "
+                f"{regression['value']:.4g} ({regression['ratio']}x)"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from .data.example import Example
 from .models.cif import Cif
 from .models.cif_ensemble import CifEnsemble
+from .models.cif_stream import CifStream
 
-__all__ = ["Cif", "CifEnsemble", "Example"]
+__all__ = ["Cif", "CifEnsemble", "CifStream", "Example"]
@@ -1,13 +1,15 @@
 import numpy as np
 
+from cifkit.models.neighbor_list import NeighborList
 from cifkit.utils import bond_pair
-from cifkit.utils.string_parser import get_atom_type_from_label
+from cifkit.utils.label_encoding import LabelEncoding
 
 
 def get_bond_counts(
     elements: list[str],
     connections: dict[str, list],
     sorted_by_mendeleev=False,
+    label_encoding: LabelEncoding | None = None,
 ) -> dict:
     """
     Return a dictionary containing bond pairs and counts per label site.
@@ -17,35 +19,26 @@ def get_bond_counts(
     else:
         bond_pairs = bond_pair.get_bond_pairs(elements)
 
+    if label_encoding is None:
+        label_encoding = LabelEncoding.from_connections(connections)
+    label_ids = label_encoding.label_ids
+    # Element pairs sorted by Mendeleev number or alphabetically
+    label_pairs = label_encoding.get_label_pairs(sorted_by_mendeleev)
+
     # Initialize the dictionary to hold bond pair counts for each label
     bond_counts: dict = {}
 
-    # Iterate over each label and its connections
-    for label, label_connections in connections.items():
+    # Iterate over each label and the labels of its connections
+    for label, conn_label_ids in get_connected_label_ids(
+        connections, label_ids
+    ):
         # Initialize the bond count for the current label
         bond_counts[label] = {}
-
-        # Get the atom type for the reference label
-        ref_element = get_atom_type_from_label(label)
+        ref_label_pairs = label_pairs[label_ids[label]]
 
         # Iterate over each connection for the current label
-        for conn in label_connections:
-            conn_label, _, _, _ = conn
-
-            # Get the atom type for the connected label
-            conn_element = get_atom_type_from_label(conn_label)
-
-            # Create a tuple representing the bond pair, sorted
-            pair = (ref_element, conn_element)
-            sorted_bond_pair = None
-
-            # Sort by Mendeeleve
-            if sorted_by_mendeleev:
-                sorted_bond_pair = bond_pair.order_tuple_pair_by_mendeleev(
-                    pair
-                )
-            else:
-                sorted_bond_pair = tuple(sorted((ref_element, conn_element)))
+        for conn_label_id in conn_label_ids:
+            sorted_bond_pair = ref_label_pairs[conn_label_id]
 
             # Check if the bond pair is one of the valid pairs
             if sorted_bond_pair in bond_pairs:
@@ -57,6 +50,24 @@ def get_bond_counts(
     return bond_counts
 
 
+def get_connected_label_ids(connections, label_ids: dict[str, int]):
+    """
+    Yield each site label with the label ids of its connections.
+    """
+    if isinstance(connections, NeighborList):
+        _, neighbor_ids = connections.get_encoded_label_ids(label_ids)
+        for label, start, end in zip(
+            connections.site_labels,
+            connections.offsets[:-1].tolist(),
+            connections.offsets[1:].tolist(),
+        ):
+            yield label, neighbor_ids[start:end].tolist()
+        return
+
+    for label, label_connections in connections.items():
+        yield label, [label_ids[conn[0]] for conn in label_connections]
+
+
 def get_bond_fractions(bond_pair_data: dict) -> dict[tuple[str, str], float]:
     """
     Calculate the fraction of each bond type across all labels.
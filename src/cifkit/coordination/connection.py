@@ -1,3 +1,6 @@
+from cifkit.models.neighbor_list import NeighborList
+
+
 def get_CN_connections_by_best_methods(
     best_methods, conncetions: dict
 ) -> dict:
@@ -5,6 +8,14 @@ def get_CN_connections_by_best_methods(
     Retrieve connections limited by the number of vertices (CN_value)
     for each label.
     """
+    if isinstance(conncetions, NeighborList):
+        return conncetions.truncate(
+            {
+                label: data["number_of_vertices"]
+                for label, data in best_methods.items()
+            }
+        )
+
     CN_connections = {}
 
     for label, data in best_methods.items():
@@ -1,6 +1,75 @@
+import numpy as np
 from scipy.spatial import ConvexHull
 
 from cifkit.coordination.geometry import compute_polyhedron_metrics
+from cifkit.models.neighbor_list import NeighborList
+
+
+def get_polyhedron_point_count(connections, label, CN) -> int:
+    """
+    Return the number of connected atoms in the polyhedron of the first CN,
+    without building the connections.
+    """
+    if isinstance(connections, NeighborList):
+        return min(CN, len(connections.get_distances(label)))
+    return min(CN, len(connections[label]))
+
+
+def get_polyhedron_points(connections, label, CN):
+    """
+    Return the Cartesian coordinates of the first CN connected atoms and
+    the central atom as the last element, or None if there are fewer than
+    4 connected atoms.
+    """
+    if isinstance(connections, NeighborList):
+        points = connections.get_coordinates(label)[:CN]
+        if len(points) <= 3:
+            return None
+        return np.vstack([points, connections.get_center(label)])
+
+    connection_data = connections[label][:CN]
+
+    # Only if there are 4 or more points in the polyhedron
+    if len(connection_data) <= 3:
+        return None
+
+    polyhedron_points = [connection[3] for connection in connection_data]
+    # Add the central atom as the last element
+    polyhedron_points.append(connection_data[0][2])
+    return polyhedron_points
+
+
+def compute_candidate_polyhedron_metrics(max_gaps_per_label, connections):
+    """
+    Compute the metrics of every candidate polyhedron in one call. Methods
+    often agree on the CN, so each (label, CN) hull is computed once.
+
+    Returns a dict of metrics by CN per label. The metrics are None if
+    they cannot be computed. CN values with fewer than 4 connected atoms,
+    or where the hull cannot be made, are left out.
+    """
+    metrics_per_label = {}
+    for label, CN_data_per_method in max_gaps_per_label.items():
+        metrics_by_CN = {}
+        for CN in dict.fromkeys(
+            CN_data["CN"] for CN_data in CN_data_per_method.values()
+        ):
+            polyhedron_points = get_polyhedron_points(connections, label, CN)
+            if polyhedron_points is None:
+                continue
+
+            # Try to make a polyhedron
+            try:
+                hull = ConvexHull(polyhedron_points)
+            except Exception:
+                continue
+
+            # Returns none if there is any error
+            metrics_by_CN[CN] = compute_polyhedron_metrics(
+                polyhedron_points, hull
+            )
+        metrics_per_label[label] = metrics_by_CN
+    return metrics_per_label
 
 
 def find_best_polyhedron(max_gaps_per_label, connections):
@@ -10,6 +79,9 @@ def find_best_polyhedron(max_gaps_per_label, connections):
     connected atoms.
     """
     best_polyhedrons = {}
+    metrics_per_label = compute_candidate_polyhedron_metrics(
+        max_gaps_per_label, connections
+    )
 
     for label, CN_data_per_method in max_gaps_per_label.items():
         # Initialize variables to track the best polyhedron
@@ -19,33 +91,17 @@ def find_best_polyhedron(max_gaps_per_label, connections):
 
         # Loop through each method
         for method, CN_data in CN_data_per_method.items():
-            connection_data = connections[label][: CN_data["CN"]]
-            polyhedron_points = []
-
-            # Only if there are 4 or more points in the polyhedron
-            if len(connection_data) > 3:
-                for connection in connection_data:
-                    polyhedron_points.append(connection[3])
-            else:
+            CN = CN_data["CN"]
+            if get_polyhedron_point_count(connections, label, CN) <= 3:
                 continue
 
-            # Add the central atom as the last element
-            polyhedron_points.append(connection_data[0][2])
-
-            # Try to make a polyhedron
-            try:
-                hull = ConvexHull(polyhedron_points)
-
-            except Exception:
+            if CN not in metrics_per_label[label]:
                 print(
                     f"Error in determining polyhedron for {label} using {method} - skipped"
                 )
                 continue  # Move to the next method
 
-            # Returns non if ther eis any error
-            polyhedron_metrics = compute_polyhedron_metrics(
-                polyhedron_points, hull
-            )
+            polyhedron_metrics = metrics_per_label[label][CN]
 
             # If there is no metrics, then skip the mthod
             if polyhedron_metrics is None:
@@ -62,9 +118,11 @@ def find_best_polyhedron(max_gaps_per_label, connections):
                 best_method_used = method
 
         if best_polyhedron_metrics:
-            best_polyhedron_metrics["method_used"] = (
-                best_method_used  # Add method information to the metrics
-            )
+            # Copy since methods with the same CN share the metrics
+            best_polyhedron_metrics = {
+                **best_polyhedron_metrics,
+                "method_used": best_method_used,
+            }
             best_polyhedrons[label] = best_polyhedron_metrics
     return best_polyhedrons
 
@@ -77,6 +135,15 @@ def get_CN_connections_by_min_dist_method(max_gaps_per_label, connections):
             "CN"
         ]
 
+    if isinstance(connections, NeighborList):
+        return connections.truncate(
+            {
+                label: CN_value
+                for label, CN_value in CN_by_shortest_dist.items()
+                if label in connections
+            }
+        )
+
     CN_connections: dict = {}
     # Iterate through each label and number of connections
     for label, CN_value in CN_by_shortest_dist.items():
@@ -1,5 +1,6 @@
 import numpy as np
 
+from cifkit.models.neighbor_list import NeighborList
 from cifkit.utils.unit import round_dict_values
 
 
@@ -10,6 +11,13 @@ def get_polyhedron_coordinates_labels(
     Return a list of Cartesian coordinates and labels. The central atom is
     the last index.
     """
+    if isinstance(connections, NeighborList):
+        polyhedron_points = connections.get_coordinates(label).tolist()
+        polyhedron_points.append(connections.get_center(label).tolist())
+        vertex_labels = connections.get_neighbor_labels(label)
+        vertex_labels.append(label)
+        return polyhedron_points, vertex_labels
+
     conn_data = connections[label]
     polyhedron_points = [conn[3] for conn in conn_data]
     vertex_labels = [conn[0] for conn in conn_data]
@@ -37,14 +45,7 @@ def compute_polyhedron_metrics(polyhedron_points, hull):
             polyhedron_points, hull, central_atom_coord
         )
 
-        edges = set()
-        for simplex in hull.simplices:
-            for i in range(-1, len(simplex) - 1):
-                if (simplex[i], simplex[i + 1]) not in edges and (
-                    simplex[i + 1],
-                    simplex[i],
-                ) not in edges:
-                    edges.add((simplex[i], simplex[i + 1]))
+        edges = get_hull_edges(hull.simplices)
 
         # Basic polyhedron info
         number_of_edges = len(edges)
@@ -57,12 +58,9 @@ def compute_polyhedron_metrics(polyhedron_points, hull):
         )
         shortest_distance_to_face = np.min(distances_to_faces)
 
-        edge_centers = np.array(
-            [
-                (polyhedron_points[edge[0]] + polyhedron_points[edge[1]]) / 2
-                for edge in edges
-            ]
-        )
+        edge_centers = (
+            polyhedron_points[edges[:, 0]] + polyhedron_points[edges[:, 1]]
+        ) / 2
         distances_to_edges = np.linalg.norm(
             edge_centers - central_atom_coord, axis=1
         )
@@ -95,6 +93,19 @@ def compute_polyhedron_metrics(polyhedron_points, hull):
         return None
 
 
+def get_hull_edges(simplices: np.ndarray) -> np.ndarray:
+    """
+    Return the (n_edges, 2) unique edges of the simplices, each sorted by
+    point index.
+    """
+    simplices = np.asarray(simplices)
+    # Pair each point of a simplex with the next one, wrapping around
+    edges = np.stack(
+        [simplices, np.roll(simplices, -1, axis=1)], axis=-1
+    ).reshape(-1, 2)
+    return np.unique(np.sort(edges, axis=1), axis=0)
+
+
 def compute_center_of_mass_and_distance(
     polyhedron_points, hull, central_atom_coord
 ):
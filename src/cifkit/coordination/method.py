@@ -1,4 +1,11 @@
-from cifkit.utils.string_parser import get_atom_type_from_label
+import numpy as np
+
+from cifkit.models.neighbor_list import NeighborList
+from cifkit.utils.label_encoding import LabelEncoding
+from cifkit.utils.unit import round_array
+
+# Number of nearest neighbors the CN is determined from
+CN_NEIGHBOR_COUNT = 20
 
 
 def compute_CN_max_gap_per_site(
@@ -6,129 +13,231 @@ def compute_CN_max_gap_per_site(
     all_labels_connections,
     is_radius_data_available: bool,
     site_mixing_type: str,
+    label_encoding: LabelEncoding | None = None,
 ):
+    """
+    Return the largest gap between consecutive normalized distances of the
+    first 20 neighbors, and the CN before the gap, per site and method.
+    All sites and methods are computed together as arrays.
+    """
+    if label_encoding is None:
+        label_encoding = LabelEncoding.from_connections(all_labels_connections)
     use_all_methods = False
 
     if is_radius_data_available and site_mixing_type == "full_occupancy":
         use_all_methods = True
 
     if use_all_methods:
-        methods: dict[str, list[float]] = {
-            "dist_by_shortest_dist": [],
-            "dist_by_CIF_radius_sum": [],
-            "dist_by_CIF_radius_refined_sum": [],
-            "dist_by_Pauling_radius_sum": [],
-        }
+        methods = [
+            "dist_by_shortest_dist",
+            "dist_by_CIF_radius_sum",
+            "dist_by_CIF_radius_refined_sum",
+            "dist_by_Pauling_radius_sum",
+        ]
     else:
-        methods = {
-            "dist_by_shortest_dist": [],
-        }
+        methods = ["dist_by_shortest_dist"]
 
-    norm_dists_per_label: dict = {}
-    max_gaps_per_label: dict = {}
+    ref_labels = list(all_labels_connections)
+    # Limit to 20 connection data points
+    distances, connected_label_ids = get_neighbor_matrices(
+        all_labels_connections, label_encoding, CN_NEIGHBOR_COUNT
+    )
 
-    for ref_label, connection_data in all_labels_connections.items():
-        # Initialize each label
-        norm_dists_per_label[ref_label] = {key: [] for key in methods}
-        max_gaps_per_label[ref_label] = {
-            method: {"max_gap": 0, "CN": -1} for method in methods
-        }
-        # Limit to 20 connection data points
-        connection_data = connection_data[:20]
-        shortest_dist = connection_data[0][1]
-        previous_values: dict[str, float] = {method: 0.0 for method in methods}
-
-        for i, connection in enumerate(connection_data):
-            pair_dist = connection[1]
-            connected_label = connection[0]
-            # Get new rad sum for each ref label
-            if use_all_methods:
-                CIF_radius_sum_norm_value = get_rad_sum_value(
-                    radius_sum_data,
-                    "CIF_radius_sum",
-                    ref_label,
-                    connected_label,
-                )
-                CIF_radius_sum_refined_norm_value = get_rad_sum_value(
-                    radius_sum_data,
-                    "CIF_radius_refined_sum",
-                    ref_label,
-                    connected_label,
-                )
-                Pauling_rad_sum_norm_value = get_rad_sum_value(
-                    radius_sum_data,
-                    "Pauling_radius_sum",
-                    ref_label,
-                    connected_label,
-                )
-                norm_dist_by_CIF_radius_sum = compute_normalized_value(
-                    pair_dist, CIF_radius_sum_norm_value
-                )
-                norm_dist_by_CIF_radius_refined_sum = compute_normalized_value(
-                    pair_dist, CIF_radius_sum_refined_norm_value
-                )
-                norm_dist_by_Pauling_radius_sum = compute_normalized_value(
-                    pair_dist, Pauling_rad_sum_norm_value
-                )
-
-            # Compute normalized distances
-            norm_dist_by_min_dist = compute_normalized_value(
-                pair_dist, shortest_dist
+    # Normalize by the shortest distance, then by each radius sum
+    ref_distances = [np.broadcast_to(distances[:, :1], distances.shape)]
+    if use_all_methods:
+        label_element_ids = label_encoding.label_element_ids
+        ref_element_ids = label_element_ids[
+            [label_encoding.label_ids[label] for label in ref_labels]
+        ]
+        connected_element_ids = label_element_ids[connected_label_ids]
+        for rad_sum_method in [
+            "CIF_radius_sum",
+            "CIF_radius_refined_sum",
+            "Pauling_radius_sum",
+        ]:
+            rad_sums = get_rad_sum_matrix(
+                radius_sum_data, rad_sum_method, label_encoding
+            )[ref_element_ids[:, None], connected_element_ids]
+            check_rad_sums_found(
+                radius_sum_data,
+                rad_sum_method,
+                rad_sums,
+                distances,
+                ref_labels,
+                connected_label_ids,
+                label_encoding,
             )
-            # Store distances
-            if use_all_methods:
-                distances = {
-                    "dist_by_shortest_dist": norm_dist_by_min_dist,
-                    "dist_by_CIF_radius_sum": norm_dist_by_CIF_radius_sum,
-                    "dist_by_CIF_radius_refined_sum": norm_dist_by_CIF_radius_refined_sum,
-                    "dist_by_Pauling_radius_sum": norm_dist_by_Pauling_radius_sum,
+            ref_distances.append(rad_sums)
+
+    norm_distances = round_array(distances / np.stack(ref_distances), 5)
+
+    # Gaps from the previous distance, skipped when the previous is 0
+    gaps = round_array(np.abs(np.diff(norm_distances, axis=-1)), 3)
+    is_valid_gap = (norm_distances[..., :-1] != 0) & ~np.isnan(gaps)
+    gaps = np.where(is_valid_gap, gaps, -np.inf)
+    if gaps.shape[-1]:
+        # The first of equal gaps is kept, as with argmax
+        max_gap_indices = np.argmax(gaps, axis=-1)
+        max_gaps = np.take_along_axis(
+            gaps, max_gap_indices[..., None], axis=-1
+        )[..., 0]
+    else:
+        max_gap_indices = np.zeros(gaps.shape[:-1], dtype=np.intp)
+        max_gaps = np.full(gaps.shape[:-1], -np.inf)
+
+    max_gaps_per_label: dict = {}
+    for site_index, ref_label in enumerate(ref_labels):
+        max_gaps_per_label[ref_label] = {}
+        for method_index, method in enumerate(methods):
+            max_gap = max_gaps[method_index, site_index]
+            if max_gap > 0:
+                max_gaps_per_label[ref_label][method] = {
+                    "max_gap": float(max_gap),
+                    "CN": int(max_gap_indices[method_index, site_index]) + 1,
                 }
             else:
-                distances = {
-                    "dist_by_shortest_dist": norm_dist_by_min_dist,
+                max_gaps_per_label[ref_label][method] = {
+                    "max_gap": 0,
+                    "CN": -1,
                 }
 
-            for method, norm_distance in distances.items():
-                norm_dists_per_label[ref_label][method].append(norm_distance)
-
-                # Calculate and update max gaps
-                if previous_values[method]:
-                    current_gap = round(
-                        abs(norm_distance - previous_values[method]),
-                        3,
-                    )
-                    if (
-                        current_gap
-                        > max_gaps_per_label[ref_label][method]["max_gap"]
-                    ):
-                        max_gaps_per_label[ref_label][method][
-                            "max_gap"
-                        ] = current_gap
-                        max_gaps_per_label[ref_label][method]["CN"] = i
-
-                previous_values[method] = norm_distance
-
     return max_gaps_per_label
 
 
+def get_neighbor_matrices(
+    all_labels_connections: dict,
+    label_encoding: LabelEncoding,
+    max_neighbors: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the (n_sites, n_neighbors) matrices of the distances and label
+    ids of the first neighbors of each site. Sites with fewer neighbors
+    are padded with NaN distances and label id 0.
+    """
+    if isinstance(all_labels_connections, NeighborList):
+        return get_neighbor_list_matrices(
+            all_labels_connections, label_encoding, max_neighbors
+        )
+
+    connections_per_site = [
+        connection_data[:max_neighbors]
+        for connection_data in all_labels_connections.values()
+    ]
+    neighbor_count = max(map(len, connections_per_site), default=0)
+    site_count = len(connections_per_site)
+    distances = np.full((site_count, neighbor_count), np.nan)
+    connected_label_ids = np.zeros((site_count, neighbor_count), np.intp)
+
+    label_ids = label_encoding.label_ids
+    for site_index, connection_data in enumerate(connections_per_site):
+        count = len(connection_data)
+        distances[site_index, :count] = [
+            connection[1] for connection in connection_data
+        ]
+        connected_label_ids[site_index, :count] = [
+            label_ids[connection[0]] for connection in connection_data
+        ]
+    return distances, connected_label_ids
+
+
+def get_neighbor_list_matrices(
+    neighbor_list: NeighborList,
+    label_encoding: LabelEncoding,
+    max_neighbors: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the matrices of `get_neighbor_matrices`, scattered from the
+    arrays of the neighbor list.
+    """
+    counts = neighbor_list.neighbor_counts
+    neighbor_count = int(min(counts.max(initial=0), max_neighbors))
+    site_count = len(counts)
+    distances = np.full((site_count, neighbor_count), np.nan)
+    connected_label_ids = np.zeros((site_count, neighbor_count), np.intp)
+
+    # Position of each neighbor within its site
+    site_indices = np.repeat(np.arange(site_count), counts)
+    positions = np.arange(len(site_indices)) - np.repeat(
+        neighbor_list.offsets[:-1], counts
+    )
+    is_kept = positions < max_neighbors
+    _, neighbor_ids = neighbor_list.get_encoded_label_ids(
+        label_encoding.label_ids
+    )
+    kept_indices = (site_indices[is_kept], positions[is_kept])
+    distances[kept_indices] = neighbor_list.distances[is_kept]
+    connected_label_ids[kept_indices] = neighbor_ids[is_kept]
+    return distances, connected_label_ids
+
+
+def get_rad_sum_matrix(
+    rad_sum_data, method_name: str, label_encoding: LabelEncoding
+) -> np.ndarray:
+    """
+    Return the (n_elements, n_elements) matrix of the sums of radii by
+    element ids, NaN for pairs not in the data.
+    """
+    if method_name not in rad_sum_data:
+        raise KeyError(f"Method {method_name} not found in rad_sum")
+    elements = label_encoding.elements
+    pair_ids = label_encoding.alphabetical_pair_ids
+    rad_sums = np.full((len(elements), len(elements)), np.nan)
+    for i in range(len(elements)):
+        for j in range(len(elements)):
+            first_id, second_id = pair_ids[i, j]
+            key = f"{elements[first_id]}-{elements[second_id]}"
+            rad_sums[i, j] = rad_sum_data[method_name].get(key, np.nan)
+    return rad_sums
+
+
+def check_rad_sums_found(
+    rad_sum_data,
+    method_name: str,
+    rad_sums: np.ndarray,
+    distances: np.ndarray,
+    ref_labels: list[str],
+    connected_label_ids: np.ndarray,
+    label_encoding: LabelEncoding,
+) -> None:
+    """
+    Raise the KeyError of get_rad_sum_value for the first neighbor whose
+    pair is not in the data.
+    """
+    missing = np.isnan(rad_sums) & ~np.isnan(distances)
+    if missing.any():
+        site_index, neighbor_index = np.argwhere(missing)[0]
+        get_rad_sum_value(
+            rad_sum_data,
+            method_name,
+            ref_labels[site_index],
+            label_encoding.site_labels[
+                connected_label_ids[site_index, neighbor_index]
+            ],
+            label_encoding,
+        )
+
+
 def compute_normalized_value(number: float, ref_number: float) -> float:
     return round((number / ref_number), 5)
 
 
 def get_rad_sum_value(
-    rad_sum_data, method_name: str, ref_label: str, other_label: str
+    rad_sum_data,
+    method_name: str,
+    ref_label: str,
+    other_label: str,
+    label_encoding: LabelEncoding | None = None,
 ) -> float:
     """
     Return the sum of radii value for a given pair of elements,
     ensuring the pair is alphabetically sorted.
     """
+    if label_encoding is None:
+        label_encoding = LabelEncoding([ref_label, other_label])
 
-    # Extract the element types from the labels
-    ref_element = get_atom_type_from_label(ref_label)
-    other_element = get_atom_type_from_label(other_label)
-
-    # Sort the elements alphabetically to form a consistent key
-    sorted_elements = sorted([ref_element, other_element])
+    # Element pair sorted alphabetically to form a consistent key
+    sorted_elements = label_encoding.get_element_pair(ref_label, other_label)
     key = f"{sorted_elements[0]}-{sorted_elements[1]}"
 
     # Ensure that method_name is valid and key exists in the dictionary
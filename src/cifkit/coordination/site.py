@@ -1,4 +1,5 @@
-from cifkit.utils import sort, string_parser
+from cifkit.utils import sort
+from cifkit.utils.label_encoding import LabelEncoding
 
 
 def get_min_distance_pair(
@@ -15,11 +16,14 @@ def get_min_distance_pair(
 
 def get_min_distance_pair_per_site_label(
     connections: dict,
+    label_encoding: LabelEncoding | None = None,
 ) -> list[tuple[tuple[str, str], float]]:
     """
     Return a list of tuples containing element pairs
     and the minimum distance from each site label in the loop.
     """
+    if label_encoding is None:
+        label_encoding = LabelEncoding.from_connections(connections)
     element_pairs = []
     # Iterate over each pair and their list of distances
     for ref_label, pair_data in connections.items():
@@ -27,8 +31,8 @@ def get_min_distance_pair_per_site_label(
         other_label = min_dist_pair_data[0]
         distance = min_dist_pair_data[1]
 
-        ref_element = string_parser.get_atom_type_from_label(ref_label)
-        other_element = string_parser.get_atom_type_from_label(other_label)
+        ref_element = label_encoding.get_element(ref_label)
+        other_element = label_encoding.get_element(other_label)
 
         element_pairs.append(((ref_element, other_element), distance))
     sorted_tuples = sort.sort_element_pair_tuples(element_pairs)
@@ -1,7 +1,19 @@
+from cifkit.models.neighbor_list import NeighborList
+
+
 def get_shortest_distance(connections: dict) -> float:
     """
     Return the shortest distance in the supercell.
     """
+    if isinstance(connections, NeighborList):
+        # The first neighbor of each site is the closest, skip the sites
+        # without neighbors
+        starts = connections.offsets[:-1][connections.neighbor_counts > 0]
+        return min(
+            connections.distances[starts].tolist(),
+            default=float("inf"),
+        )
+
     min_dist = float("inf")
 
     # Iterate over each site's connections in the dictionary
@@ -1,10 +1,14 @@
-from functools import partial
+from collections import OrderedDict
 
 import numpy as np
-from scipy.optimize import minimize
 
 from cifkit.data.radius import get_radius_data
 
+# Refined radii by sorted elements and adjacent pair distances, the least
+# recently used are dropped beyond the maximum size
+REFINED_RADIUS_CACHE_SIZE = 4096
+_REFINED_RADIUS_CACHE: OrderedDict[tuple, tuple[float, ...]] = OrderedDict()
+
 
 def generate_adjacent_pairs(
     elements: list[str],
@@ -31,61 +35,122 @@ def objective(params, original_radii: list[float]) -> list[float]:
     return np.sum(((original_radii - params) / original_radii) ** 2)
 
 
-def constraint(params, index_pair: tuple[int, int], shortest_distance: dict):
+def get_adjacent_pair_distances(
+    sorted_elements: list[str], shortest_distances: dict
+) -> tuple[float, ...]:
     """
-    Enforce that the sum of the radii of the pair does not
-    exceed the shortest allowed distance between them.
+    Return the shortest distance of each adjacent pair of elements.
     """
-    i, j = index_pair
-    i, j = index_pair
-    return shortest_distance - (params[i] + params[j])
+    return tuple(
+        float(shortest_distances[pair])
+        for pair in generate_adjacent_pairs(sorted_elements)
+    )
 
 
-def get_refined_CIF_radius(
-    elements: list[str], shortest_distances: dict
-) -> dict[str, float]:
+def solve_refined_radii(
+    original_radii: np.ndarray, pair_distances: np.ndarray
+) -> np.ndarray:
     """
-    Optimize CIF radii given atom labels and their
-    shortest pair distance constraints.
+    Minimize the objective subject to the constraint of each adjacent pair,
+    r[i] + r[i + 1] = d[i], for a batch of systems with the same number of
+    elements. The weighted least squares problem is solved exactly from
+    the KKT conditions:
+
+    r = r0 - W^-1 A^T (A W^-1 A^T)^-1 (A r0 - d), with W = diag(1 / r0^2)
+
+    Parameters
+    ----------
+    original_radii : np.ndarray
+        (n_systems, n_elements) CIF radii of the sorted elements.
+    pair_distances : np.ndarray
+        (n_systems, n_elements - 1) shortest distances of adjacent pairs.
+
+    Returns
+    -------
+    np.ndarray
+        (n_systems, n_elements) refined radii.
     """
-    sorted_elements = sorted(elements)
-    radii_data = get_radius_data()
-    original_radii = np.array(
-        [radii_data[label]["CIF_radius"] for label in sorted_elements]
+    original_radii = np.asarray(original_radii, dtype=float)
+    pair_distances = np.asarray(pair_distances, dtype=float)
+    element_count = original_radii.shape[1]
+    if element_count < 2:
+        return original_radii.copy()
+
+    # Each row adds the radii of an adjacent pair
+    A = np.eye(element_count - 1, element_count) + np.eye(
+        element_count - 1, element_count, k=1
     )
+    A_w_inv = A[None, :, :] * (original_radii**2)[:, None, :]
+    residuals = original_radii @ A.T - pair_distances
+    multipliers = np.linalg.solve(A_w_inv @ A.T, residuals[:, :, None])[
+        :, :, 0
+    ]
+    return original_radii - np.einsum("bmn,bm->bn", A_w_inv, multipliers)
 
-    label_to_pair = generate_adjacent_pairs(sorted_elements)
-
-    # Constraints setup
-    constraints = []
-    for pair in label_to_pair:
-        dist = shortest_distances[pair]
-        # print(
-        #     f"Setting constraint for {pair[0]}-{pair[1]} with distance {dist}"
-        # )
-        i, j = sorted_elements.index(pair[0]), sorted_elements.index(pair[1])
-        constraints.append(
-            {
-                "type": "eq",
-                "fun": partial(
-                    constraint,
-                    index_pair=(i, j),
-                    shortest_distance=dist,
-                ),
-            }
-        )
 
-    result = minimize(
-        objective,
-        original_radii,
-        args=(original_radii,),
-        constraints=constraints,
-        options={"disp": False},
-    )
+def get_refined_CIF_radii(
+    element_systems: list[list[str]], shortest_distances_list: list[dict]
+) -> list[dict[str, float]]:
+    """
+    Optimize CIF radii of many element systems at once. Systems with the
+    same number of elements are solved in one batch, and results are
+    memoized by elements and shortest pair distances. The radii of each
+    system are returned in the order of its elements.
+    """
+    keys = []
+    radii_by_key: dict[tuple, tuple[float, ...]] = {}
+    missing_keys_by_size: dict[int, dict[tuple, None]] = {}
+    for elements, shortest_distances in zip(
+        element_systems, shortest_distances_list
+    ):
+        sorted_elements = tuple(sorted(elements))
+        key = (
+            sorted_elements,
+            get_adjacent_pair_distances(sorted_elements, shortest_distances),
+        )
+        keys.append(key)
+        if key in _REFINED_RADIUS_CACHE:
+            _REFINED_RADIUS_CACHE.move_to_end(key)
+            radii_by_key[key] = _REFINED_RADIUS_CACHE[key]
+        else:
+            missing_keys_by_size.setdefault(len(sorted_elements), {})[
+                key
+            ] = None
+
+    if missing_keys_by_size:
+        radii_data = get_radius_data()
+    for missing_keys in missing_keys_by_size.values():
+        batch_keys = list(missing_keys)
+        original_radii = np.array(
+            [
+                [radii_data[element]["CIF_radius"] for element in elements]
+                for elements, _ in batch_keys
+            ]
+        )
+        pair_distances = np.array(
+            [distances for _, distances in batch_keys]
+        ).reshape(len(batch_keys), -1)
+        refined_radii = solve_refined_radii(original_radii, pair_distances)
+        for key, radii in zip(batch_keys, refined_radii):
+            radii_by_key[key] = tuple(radii.tolist())
+            _REFINED_RADIUS_CACHE[key] = radii_by_key[key]
+    while len(_REFINED_RADIUS_CACHE) > REFINED_RADIUS_CACHE_SIZE:
+        _REFINED_RADIUS_CACHE.popitem(last=False)
+
+    refined_radii_list = []
+    for elements, key in zip(element_systems, keys):
+        radius_by_element = dict(zip(key[0], radii_by_key[key]))
+        refined_radii_list.append(
+            {element: radius_by_element[element] for element in elements}
+        )
+    return refined_radii_list
 
-    # if result.success:
-    #     print("Optimization succeeded.")
-    # else:
-    #     print("Optimization failed:", result.message)
 
-    return dict(zip(sorted_elements, result.x))
+def get_refined_CIF_radius(
+    elements: list[str], shortest_distances: dict
+) -> dict[str, float]:
+    """
+    Optimize CIF radii given atom labels and their
+    shortest pair distance constraints.
+    """
+    return get_refined_CIF_radii([elements], [shortest_distances])[0]
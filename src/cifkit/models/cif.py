@@ -8,7 +8,9 @@ import logging
 import os
 
 # Bond pair
-from cifkit.coordination.bond_distance import get_shortest_distance_per_bond_pair
+from cifkit.coordination.bond_distance import (
+    get_shortest_distance_per_bond_pair,
+)
 from cifkit.coordination.composition import (
     compute_avg_CN,
     get_bond_counts,
@@ -21,7 +23,10 @@ from cifkit.coordination.filter import (
     get_CN_connections_by_min_dist_method,
 )
 from cifkit.coordination.geometry import get_polyhedron_coordinates_labels
-from cifkit.coordination.method import compute_CN_max_gap_per_site
+from cifkit.coordination.method import (
+    CN_NEIGHBOR_COUNT,
+    compute_CN_max_gap_per_site,
+)
 
 # Site info
 from cifkit.coordination.site_distance import (
@@ -36,41 +41,86 @@ from cifkit.data.radius_handler import (
     get_radius_values_per_element,
 )
 from cifkit.figures import polyhedron
-from cifkit.occupancy.mixing import get_mixing_type_per_pair_dict, get_site_mixing_type
-from cifkit.preprocessors.environment import get_site_connections
+from cifkit.models.compact_cif import CompactCif
+from cifkit.models.neighbor_list import NeighborList
+from cifkit.occupancy.mixing import (
+    get_mixing_type_per_pair_dict,
+    get_site_mixing_type,
+)
+from cifkit.preprocessors.environment import (
+    get_site_connections,
+    get_site_connections_by_kdtree,
+)
 
 # Coordination number
 from cifkit.preprocessors.environment_util import flat_site_connections
 
 # Edit .cif file
-from cifkit.preprocessors.format import preprocess_label_element_loop_values
+from cifkit.preprocessors.format import (
+    preprocess_label_element_loop_values_from_lines,
+)
 
 # Supercell generation
-from cifkit.preprocessors.supercell import get_supercell_points
+from cifkit.preprocessors.supercell import (
+    get_points_from_array,
+    get_unitcell_point_array,
+    shift_point_array,
+)
 from cifkit.preprocessors.supercell_util import get_cell_atom_count
-from cifkit.utils.bond_pair import get_bond_pairs, get_pairs_sorted_by_mendeleev
-from cifkit.utils.cif_editor import add_hashtag_in_first_line, remove_author_loop
+from cifkit.utils.bond_pair import (
+    get_bond_pairs,
+    get_pairs_sorted_by_mendeleev,
+)
+from cifkit.utils.cache import (
+    get_cache_key,
+    get_content_hash,
+    load_cached_results,
+    save_cached_results,
+)
+from cifkit.utils.cif_editor import (
+    add_hashtag_in_first_line_from_lines,
+    remove_author_loop_from_lines,
+)
 
 # Parser .cif file
 from cifkit.utils.cif_parser import (
-    check_unique_atom_site_labels,
-    get_cif_block,
+    check_unique_atom_site_labels_from_block,
+    get_cif_block_from_lines,
+    get_file_lines,
     get_formula_structure_weight_s_group,
     get_loop_values,
-    get_tag_from_third_line,
+    get_tag_from_lines,
     get_unique_elements_from_loop,
     get_unique_site_labels,
     get_unitcell_angles_rad,
     get_unitcell_lengths,
-    parse_atom_site_occupancy_info,
+    parse_atom_site_occupancy_info_from_block,
 )
 
 # Identify .cif database source
-from cifkit.utils.cif_sourcer import get_cif_db_source
+from cifkit.utils.cif_sourcer import get_cif_db_source_from_lines
+from cifkit.utils.error_messages import GeneralError
+from cifkit.utils.label_encoding import LabelEncoding
 from cifkit.utils.log_messages import CifLog
 from cifkit.utils.unit import round_dict_values
 
 
+def get_neighbor_count(neighbor_count) -> int | None:
+    """Return the number of nearest neighbors to keep, the CN neighbor
+    count for True and None for all neighbors."""
+    if neighbor_count is None or neighbor_count is False:
+        return None
+    if neighbor_count is True:
+        return CN_NEIGHBOR_COUNT
+    if not isinstance(neighbor_count, int) or neighbor_count < 1:
+        raise ValueError(
+            GeneralError.INVALID_NEIGHBOR_COUNT.value.format(
+                neighbor_count=neighbor_count
+            )
+        )
+    return neighbor_count
+
+
 def ensure_connections(func):
     """For accessing lazy properties and methods, compute connections."""
 
@@ -82,6 +132,61 @@ def ensure_connections(func):
     return wrapper
 
 
+# Results computed with the connections, stored in the cache
+CONNECTION_RESULT_ATTRIBUTES = [
+    "_connections_flattened",
+    "_shortest_distance",
+    "_shortest_bond_pair_distance",
+    "_shortest_site_pair_distance",
+    "_radius_values",
+    "_radius_sum",
+    "_CN_max_gap_per_site",
+    "_CN_best_methods",
+    "_CN_connections_by_best_methods",
+    "_CN_connections_by_min_dist_method",
+    "_CN_bond_count_by_min_dist_method",
+    "_CN_bond_count_by_best_methods",
+    "_CN_bond_count_by_min_dist_method_sorted_by_mendeleev",
+    "_CN_bond_count_by_best_methods_sorted_by_mendeleev",
+    "_CN_bond_fractions_by_min_dist_method",
+    "_CN_bond_fractions_by_best_methods",
+    "_CN_bond_fractions_by_min_dist_method_sorted_by_mendeleev",
+    "_CN_bond_fractions_by_best_methods_sorted_by_mendeleev",
+    "_CN_unique_values_by_min_dist_method",
+    "_CN_unique_values_by_best_methods",
+    "_CN_avg_by_min_dist_method",
+    "_CN_avg_by_best_methods",
+    "_CN_max_by_min_dist_method",
+    "_CN_max_by_best_methods",
+    "_CN_min_by_min_dist_method",
+    "_CN_min_by_best_methods",
+]
+
+
+def ensure_unitcell(func):
+    """For accessing lazy unit cell points and counts, generate the unit
+    cell."""
+
+    def wrapper(self, *args, **kwargs):
+        if self._unitcell_point_array is None:
+            self._generate_unitcell()
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def ensure_supercell(func):
+    """For accessing lazy supercell points and counts, generate the
+    supercell."""
+
+    def wrapper(self, *args, **kwargs):
+        if self._supercell_point_array is None:
+            self._generate_supercell()
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 # Global logging
 logging.basicConfig(
     level=logging.INFO,
@@ -93,33 +198,142 @@ class Cif:
     def __init__(
         self, file_path: str, is_formatted=False, logging_enabled=False
     ) -> None:
-        """_summary_
+        """Initialize the Cif object with the file path.
 
         Parameters
         ----------
         file_path : str
-            _description_
+            Path to the .cif file.
         is_formatted : bool, optional
-            _description_, by default False
+            Skip preprocessing if the file has been formatted, by default
+            False
         logging_enabled : bool, optional
-            _description_, by default False
+            Log each step of initialization, by default False
         """
+        # Read the file once, all parsing below works from memory
+        lines = get_file_lines(file_path)
+        self._initialize(
+            file_path, lines, is_formatted, logging_enabled, write_back=True
+        )
 
+    @classmethod
+    def from_string(
+        cls,
+        content: str,
+        file_path="memory.cif",
+        is_formatted=False,
+        logging_enabled=False,
+    ) -> "Cif":
+        """Initialize the Cif object from the .cif content in memory.
+
+        Preprocessing runs on the in-memory content and nothing is written
+        to disk.
+
+        Parameters
+        ----------
+        content : str
+            Content of the .cif file.
+        file_path : str, optional
+            Name stored as the file path, such as the member name in an
+            archive, by default "memory.cif"
+        is_formatted : bool, optional
+            Skip preprocessing if the content has been formatted, by
+            default False
+        logging_enabled : bool, optional
+            Log each step of initialization, by default False
+        """
+        cif = cls.__new__(cls)
+        cif._initialize(
+            file_path,
+            content.splitlines(keepends=True),
+            is_formatted,
+            logging_enabled,
+            write_back=False,
+        )
+        return cif
+
+    @classmethod
+    def from_bytes(
+        cls,
+        content: bytes,
+        file_path="memory.cif",
+        is_formatted=False,
+        logging_enabled=False,
+        encoding="utf-8",
+    ) -> "Cif":
+        """Initialize the Cif object from the encoded .cif content in
+        memory. See `Cif.from_string` for the other parameters.
+
+        Parameters
+        ----------
+        content : bytes
+            Encoded content of the .cif file.
+        encoding : str, optional
+            Encoding of the content, by default "utf-8"
+        """
+        return cls.from_string(
+            content.decode(encoding),
+            file_path=file_path,
+            is_formatted=is_formatted,
+            logging_enabled=logging_enabled,
+        )
+
+    def _initialize(
+        self,
+        file_path: str,
+        lines: list[str],
+        is_formatted: bool,
+        logging_enabled: bool,
+        write_back: bool,
+    ) -> None:
+        """Parse the .cif content and generate the supercell."""
         self.file_path = file_path
         self.logging_enabled = logging_enabled
-
-        """Initialize the Cif object with the file path."""
         self.file_name = os.path.basename(file_path)
         self.file_name_without_ext = os.path.splitext(self.file_name)[0]
-        self.db_source = get_cif_db_source(self.file_path)
+        self.db_source = get_cif_db_source_from_lines(lines)
         self.connections = None  # Private attribute to store connections
         self._shortest_pair_distance = None
+        self._block = None
+        # Directory of cached connections, disabled by default
+        self.cache_dir = None
+        # Cell points are generated on first access
+        self._unitcell_point_array = None
+        self._supercell_point_array = None
+        self._unitcell_points = None
+        self._supercell_points = None
+        # Integer ids of site labels and elements, built on first access
+        self._label_encoding = None
 
         # If it is not previously formatted
         if not is_formatted:
-            self._preprocess()
-
-        self._load_data()
+            lines = self._preprocess(lines, write_back)
+
+        # Formatted content of a Cif initialized from memory, without a
+        # file to initialize it again from
+        self._content = None if write_back else "".join(lines)
+        self._load_data(lines)
+
+    def __getstate__(self):
+        """Return the state for pickling, e.g. across worker processes.
+        The gemmi loop columns cannot be pickled and are rebuilt from the
+        block."""
+        state = self.__dict__.copy()
+        state.pop("_loop_values", None)
+        # The point tuples are rebuilt from the arrays on access
+        state["_unitcell_points"] = None
+        state["_supercell_points"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._block is not None:
+            self._loop_values = get_loop_values(self._block)
+
+    def to_compact(self) -> CompactCif:
+        """Return a compact record of the parsed fields without the gemmi
+        block, to keep many files in memory. See `CompactCif`."""
+        return CompactCif.from_cif(self)
 
     def _log_info(self, message):
         """Log a formatted message if logging is enabled."""
@@ -129,27 +343,43 @@ class Cif:
             )
             logging.info(formatted_message)
 
-    def _preprocess(self):
-        """Preprocess each .cif file and check any error."""
+    def _preprocess(self, lines: list[str], write_back: bool) -> list[str]:
+        """Preprocess the .cif content and check any error. The file is
+        written back only if requested and its content has changed."""
         self._log_info(CifLog.PREPROCESSING.value)
+        original_lines = lines
 
         if self.db_source == "ICSD":
-            add_hashtag_in_first_line(self.file_path)
+            lines = add_hashtag_in_first_line_from_lines(lines)
 
         elif self.db_source == "PCD":
-            remove_author_loop(self.file_path)
+            lines = remove_author_loop_from_lines(lines)
 
-        preprocess_label_element_loop_values(self.file_path)
-        check_unique_atom_site_labels(self.file_path)
+        block = get_cif_block_from_lines(lines, self.file_path)
+        formatted_lines = preprocess_label_element_loop_values_from_lines(
+            lines, block
+        )
+        # Parse again only if the site labels have been modified
+        if formatted_lines != lines:
+            block = get_cif_block_from_lines(formatted_lines, self.file_path)
 
-    def _load_data(self):
-        """Load data from the .cif file and process it."""
+        if write_back and formatted_lines != original_lines:
+            with open(self.file_path, "w") as f:
+                f.writelines(formatted_lines)
+
+        check_unique_atom_site_labels_from_block(block)
+        self._block = block
+        return formatted_lines
+
+    def _load_data(self, lines: list[str]):
+        """Load data from the .cif content and process it."""
         self._log_info(CifLog.LOADING_DATA.value)
-        self._block = get_cif_block(self.file_path)
-        self._parse_cif_data()
-        self._generate_supercell()
+        if self._block is None:
+            self._block = get_cif_block_from_lines(lines, self.file_path)
+        self._content_hash = get_content_hash(lines)
+        self._parse_cif_data(lines)
 
-    def _parse_cif_data(self):
+    def _parse_cif_data(self, lines: list[str]):
         """Parse the main CIF data from the block."""
         self._loop_values = get_loop_values(self._block)
         self.unitcell_lengths = get_unitcell_lengths(self._block)
@@ -163,9 +393,11 @@ class Cif:
             self.space_group_number,
             self.space_group_name,
         ) = get_formula_structure_weight_s_group(self._block)
-        self.atom_site_info = parse_atom_site_occupancy_info(self.file_path)
+        self.atom_site_info = parse_atom_site_occupancy_info_from_block(
+            self._block
+        )
         self.composition_type = len(self.unique_elements)
-        self.tag = get_tag_from_third_line(self.file_path, self.db_source)
+        self.tag = get_tag_from_lines(lines, self.db_source)
         self.bond_pairs = get_bond_pairs(self.unique_elements)
         self.site_label_pairs = get_bond_pairs(self.site_labels)
         self.bond_pairs_sorted_by_mendeleev = get_pairs_sorted_by_mendeleev(
@@ -191,42 +423,227 @@ class Cif:
             )
         )
 
-    def _generate_supercell(self) -> None:
-        """Generate supercell information based on the unit cell data.
-
-        This method calculates the supercell points and atom counts based
-        on the unit cell data. It uses the `get_supercell_points` and
-        `get_cell_atom_count` functions to perform the calculations.
+    def _generate_unitcell(self) -> None:
+        """Generate the unit cell points after the symmetry operations as
+        a structured array, with the label field indexing `site_labels`.
+        This runs on the first access of any unit cell property.
 
         Returns:
             None
         """
-        # Method implementation goes here
-        self.unitcell_points = get_supercell_points(self._block, 1)
-        self.supercell_points = get_supercell_points(self._block, 3)
-        self.unitcell_atom_count = get_cell_atom_count(self.unitcell_points)
-        self.supercell_atom_count = get_cell_atom_count(self.supercell_points)
+        self._log_info(CifLog.GENERATE_UNITCELL.value)
+        self._unitcell_point_array = get_unitcell_point_array(self._block)
 
-    def compute_connections(self, cutoff_radius=10.0):
-        """_summary_
+    def _generate_supercell(self) -> None:
+        """Shift the unit cell points to generate the supercell points.
+        This runs on the first access of any supercell property.
+
+        Returns:
+            None
+        """
+        self._log_info(CifLog.GENERATE_SUPERCELL.value)
+        self._supercell_point_array = shift_point_array(
+            self.unitcell_point_array, 3
+        )
+
+    def compute_connections(
+        self,
+        cutoff_radius=10.0,
+        neighbor_search="supercell",
+        cache_dir=None,
+        per_orbit=False,
+        neighbor_count=None,
+    ):
+        """Compute the pair distances per site label and the coordination
+        environment from them.
 
         Args:
-            cutoff_radius (float, optional): _description_. Defaults to 10.0.
+            cutoff_radius (float, optional): Maximum pair distance. Defaults
+                to 10.0.
+            neighbor_search (str, optional): "supercell" scans the 3x3x3
+                supercell, "kdtree" queries a KD-tree over the periodic
+                images within the cutoff. Defaults to "supercell".
+            cache_dir (str, optional): Directory to load and save the
+                results, keyed by the .cif content, cifkit version and the
+                other arguments. Defaults to `self.cache_dir`, which is
+                None unless set, to disable caching.
+            per_orbit (bool, optional): Compute one representative of the
+                symmetry-equivalent copies of each site instead of every
+                copy. See `get_site_connections`. Defaults to False.
+            neighbor_count (int or bool, optional): Keep only the nearest
+                neighbors of each site within the cutoff, and those tied
+                with the last. True keeps the 20 the CN is determined
+                from. The kdtree search then derives its radius from the
+                atomic density instead of scanning the cutoff. The
+                supercell search still computes every distance within the
+                cutoff and only trims the connections, so it is not faster.
+                Defaults to None, to keep every neighbor.
         """
+        neighbor_count = get_neighbor_count(neighbor_count)
+        if cache_dir is None:
+            cache_dir = self.cache_dir
+
+        if cache_dir is not None:
+            cache_key = get_cache_key(
+                self._content_hash,
+                cutoff_radius,
+                neighbor_search,
+                per_orbit,
+                neighbor_count,
+            )
+            results = load_cached_results(cache_dir, cache_key)
+            if results is not None:
+                self._log_info(CifLog.LOAD_CACHED_CONNECTIONS.value)
+                self._set_connection_results(results)
+                return
+
+        self._compute_connections(
+            cutoff_radius, neighbor_search, per_orbit, neighbor_count
+        )
+
+        if cache_dir is not None:
+            save_cached_results(
+                cache_dir, cache_key, self._get_connection_results()
+            )
+
+    def compute_connections_sweep(
+        self,
+        cutoff_radii: list[float],
+        neighbor_search="supercell",
+        cache_dir=None,
+        per_orbit=False,
+    ) -> dict[float, dict]:
+        """Compute the coordination environment for each cutoff radius.
+        The pair distances are computed once at the largest radius, and the
+        connections within each smaller radius are the sorted slices of
+        them. See `compute_connections` for the other arguments.
+
+        The copy of each site is chosen at the largest radius, so with the
+        supercell search, neighbors cut off by the supercell may differ
+        from a separate call with a smaller radius. The Cif object keeps
+        the results of the largest radius, also if a radius fails.
+
+        Raises:
+            ValueError: If a radius leaves a site without neighbors, as
+                the coordination environment needs at least one.
+
+        Returns:
+            dict[float, dict]: Results by cutoff radius, keyed by the
+                property names such as "connections", "CN_best_methods",
+                "CN_bond_count_by_best_methods" and
+                "CN_bond_fractions_by_best_methods".
+        """
+        max_cutoff_radius = max(cutoff_radii)
+        self.compute_connections(
+            max_cutoff_radius,
+            neighbor_search=neighbor_search,
+            cache_dir=cache_dir,
+            per_orbit=per_orbit,
+        )
+        self.connections = NeighborList.from_connections(
+            self.connections, labels=self.label_encoding.site_labels
+        )
+        max_cutoff_results = self._get_connection_results()
+
+        sweep_results = {}
+        try:
+            for cutoff_radius in cutoff_radii:
+                if cutoff_radius == max_cutoff_radius:
+                    results = max_cutoff_results
+                else:
+                    results = self._compute_truncated_coordination(
+                        max_cutoff_results["connections"], cutoff_radius
+                    )
+                sweep_results[cutoff_radius] = {
+                    name.lstrip("_"): value for name, value in results.items()
+                }
+        finally:
+            # Never leave the results of a smaller radius behind
+            self._set_connection_results(max_cutoff_results)
+        return sweep_results
+
+    def _compute_truncated_coordination(
+        self, connections: NeighborList, cutoff_radius: float
+    ) -> dict:
+        """Compute the coordination environment of the connections within
+        the smaller cutoff radius and return the results."""
+        connections = connections.truncate_by_distance(cutoff_radius)
+        empty_labels = [
+            label
+            for label, count in zip(connections, connections.neighbor_counts)
+            if count == 0
+        ]
+        if empty_labels:
+            raise ValueError(
+                GeneralError.EMPTY_SITE_CONNECTIONS.value.format(
+                    labels=", ".join(empty_labels),
+                    cutoff_radius=cutoff_radius,
+                )
+            )
+        self.connections = connections
+        self._compute_coordination()
+        return self._get_connection_results()
+
+    def _get_connection_results(self) -> dict:
+        """Return the connections and the results computed from them."""
+        return {
+            name: getattr(self, name)
+            for name in ["connections", *CONNECTION_RESULT_ATTRIBUTES]
+        }
+
+    def _set_connection_results(self, results: dict) -> None:
+        """Set the connections and results computed elsewhere, such as in
+        the cache or a worker process."""
+        self.__dict__.update(results)
+
+    def _compute_connections(
+        self, cutoff_radius, neighbor_search, per_orbit, neighbor_count=None
+    ):
+        """Compute the connections and the results set in
+        CONNECTION_RESULT_ATTRIBUTES."""
         self._log_info(CifLog.COMPUTE_CONNECTIONS.value)
-        self.connections = get_site_connections(
-            [
-                self.site_labels,
-                self.unitcell_lengths,
-                self.unitcell_angles,
-            ],
-            self.unitcell_points,
-            self.supercell_points,
-            cutoff_radius=cutoff_radius,
+        parsed_data = [
+            self.site_labels,
+            self.unitcell_lengths,
+            self.unitcell_angles,
+        ]
+        if neighbor_search == "supercell":
+            self.connections = get_site_connections(
+                parsed_data,
+                self.unitcell_point_array,
+                self.supercell_point_array,
+                cutoff_radius=cutoff_radius,
+                per_orbit=per_orbit,
+                neighbor_count=neighbor_count,
+            )
+        elif neighbor_search == "kdtree":
+            self.connections = get_site_connections_by_kdtree(
+                parsed_data,
+                self.unitcell_point_array,
+                cutoff_radius=cutoff_radius,
+                per_orbit=per_orbit,
+                neighbor_count=neighbor_count,
+            )
+        else:
+            raise ValueError(
+                GeneralError.INVALID_NEIGHBOR_SEARCH.value.format(
+                    neighbor_search=neighbor_search
+                )
+            )
+
+        # Neighbor arrays, read as lists of tuples per site
+        self.connections = NeighborList.from_connections(
+            self.connections, labels=self.label_encoding.site_labels
         )
+        self._compute_coordination()
 
+    def _compute_coordination(self):
+        """Compute the results set in CONNECTION_RESULT_ATTRIBUTES from
+        the connections."""
         # Flattened coordinations
-        self._connections_flattened = flat_site_connections(self.connections)
+        self._connections_flattened = flat_site_connections(
+            self.connections, self.label_encoding
+        )
 
         # Shortest distance
         self._shortest_distance = get_shortest_distance(self.connections)
@@ -257,6 +674,7 @@ class Cif:
             self.connections,
             self.is_radius_data_available,
             self.site_mixing_type,
+            self.label_encoding,
         )
 
         # Find the best methods
@@ -279,10 +697,14 @@ class Cif:
         )
         # Bond counts
         self._CN_bond_count_by_min_dist_method = get_bond_counts(
-            self.unique_elements, self.CN_connections_by_min_dist_method
+            self.unique_elements,
+            self.CN_connections_by_min_dist_method,
+            label_encoding=self.label_encoding,
         )
         self._CN_bond_count_by_best_methods = get_bond_counts(
-            self.unique_elements, self.CN_connections_by_best_methods
+            self.unique_elements,
+            self.CN_connections_by_best_methods,
+            label_encoding=self.label_encoding,
         )
 
         # Bond counts sorted by mendeleev
@@ -291,6 +713,7 @@ class Cif:
                 self.unique_elements,
                 self.CN_connections_by_min_dist_method,
                 sorted_by_mendeleev=True,
+                label_encoding=self.label_encoding,
             )
         )
         self._CN_bond_count_by_best_methods_sorted_by_mendeleev = (
@@ -298,6 +721,7 @@ class Cif:
                 self.unique_elements,
                 self.CN_connections_by_best_methods,
                 sorted_by_mendeleev=True,
+                label_encoding=self.label_encoding,
             )
         )
 
@@ -354,6 +778,56 @@ class Cif:
             self.CN_unique_values_by_best_methods
         )
 
+    @property
+    @ensure_unitcell
+    def unitcell_point_array(self):
+        """Property that generates the unit cell points as an array."""
+        return self._unitcell_point_array
+
+    @property
+    @ensure_supercell
+    def supercell_point_array(self):
+        """Property that generates the supercell points as an array."""
+        return self._supercell_point_array
+
+    @property
+    @ensure_unitcell
+    def unitcell_points(self):
+        """Property that returns the unit cell (x, y, z, label) points."""
+        if self._unitcell_points is None:
+            self._unitcell_points = get_points_from_array(
+                self._unitcell_point_array, self.site_labels
+            )
+        return self._unitcell_points
+
+    @property
+    @ensure_supercell
+    def supercell_points(self):
+        """Property that returns the supercell (x, y, z, label) points."""
+        if self._supercell_points is None:
+            self._supercell_points = get_points_from_array(
+                self._supercell_point_array, self.site_labels
+            )
+        return self._supercell_points
+
+    @property
+    @ensure_unitcell
+    def unitcell_atom_count(self):
+        return get_cell_atom_count(self._unitcell_point_array)
+
+    @property
+    @ensure_supercell
+    def supercell_atom_count(self):
+        return get_cell_atom_count(self._supercell_point_array)
+
+    @property
+    def label_encoding(self) -> LabelEncoding:
+        """Property that encodes the site labels and their elements as
+        integer ids."""
+        if self._label_encoding is None:
+            self._label_encoding = LabelEncoding(self.site_labels)
+        return self._label_encoding
+
     @property
     @ensure_connections
     def shortest_distance(self):
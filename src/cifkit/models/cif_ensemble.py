@@ -1,15 +1,100 @@
 import logging
 from collections import Counter
+from functools import partial
+from typing import Iterable
 
 from click import secho
 
 from cifkit import Cif
 from cifkit.figures.histogram import plot_histogram
+from cifkit.models.compact_cif import CompactCif
+from cifkit.models.ensemble_index import (
+    FileMask,
+    RangeIndex,
+    SetIndex,
+    ValueIndex,
+)
 from cifkit.preprocessors.error import move_files_based_on_errors
 from cifkit.preprocessors.format import preprocess_label_element_loop_values
 from cifkit.utils.cif_editor import remove_author_loop
+from cifkit.utils.error_messages import GeneralError
 from cifkit.utils.folder import copy_files, get_file_paths, move_files
 from cifkit.utils.log_messages import CifEnsembleLog
+from cifkit.utils.parallel import map_in_order
+
+# Stats of these attributes are counted together in a single pass
+STATS_ATTRIBUTES_FROM_PARSING = [
+    "structure",
+    "formula",
+    "tag",
+    "space_group_number",
+    "space_group_name",
+    "composition_type",
+    "unique_elements",
+    "site_mixing_type",
+]
+
+# Attributes computed from the connections, which compact records do not
+# keep
+CONNECTION_ATTRIBUTES = [
+    "shortest_distance",
+    "CN_unique_values_by_min_dist_method",
+    "CN_unique_values_by_best_methods",
+]
+
+
+def count_attribute_values(
+    cifs: Iterable[Cif], attribute_names: list[str], transform=None
+) -> dict[str, dict]:
+    """
+    Count the values of the attributes in one pass over the Cif objects,
+    which may be a stream. Set values, such as elements, are counted per
+    member.
+    """
+    counters = {name: Counter() for name in attribute_names}
+    for cif in cifs:
+        for name, counter in counters.items():
+            if not hasattr(cif, name):
+                continue
+            value = getattr(cif, name)
+            if transform:
+                value = transform(value)
+            if isinstance(value, set):
+                counter.update(value)
+            else:
+                counter[value] += 1
+    return {name: dict(counter) for name, counter in counters.items()}
+
+
+def _compute_connection_results(
+    cif: Cif,
+    cutoff_radius: float,
+    neighbor_search: str,
+    per_orbit: bool,
+    neighbor_count=None,
+) -> tuple[dict | None, str | None]:
+    """Compute the connections of the Cif object and return the results,
+    or the error message if it fails."""
+    try:
+        cif.compute_connections(
+            cutoff_radius=cutoff_radius,
+            neighbor_search=neighbor_search,
+            per_orbit=per_orbit,
+            neighbor_count=neighbor_count,
+        )
+    except Exception as e:
+        return None, str(e)
+    return cif._get_connection_results(), None
+
+
+def _preprocess_file(file_path: str) -> str | None:
+    """Format the .cif file in place and return the error message, if any."""
+    try:
+        remove_author_loop(file_path)
+        preprocess_label_element_loop_values(file_path)
+    except Exception as e:
+        return str(e)
+    return None
 
 
 class CifEnsemble:
@@ -19,7 +104,18 @@ class CifEnsemble:
         add_nested_files=False,
         preprocess=True,
         logging_enabled=False,
+        n_workers=1,
+        cache_dir=None,
+        compact=False,
     ) -> None:
+        """Initialize Cif objects for the .cif files in the folder.
+
+        With n_workers greater than 1, files are preprocessed and parsed
+        across a process pool. Results keep the order of the file paths.
+        With cache_dir, the connections of each Cif are loaded from and
+        saved to the cache directory. With compact, CompactCif records are
+        kept instead, for stats and filters on the parsed fields only.
+        """
         # Process each file, handling exceptions that may occur
         self.logging_enabled = logging_enabled
         file_paths = get_file_paths(
@@ -27,17 +123,21 @@ class CifEnsemble:
         )
         self.dir_path = cif_dir_path
 
+        # Cif objects built while validating the files, by file path
+        valid_cifs: dict[str, Cif] = {}
         if preprocess:
             self._log_info(CifEnsembleLog.PREPROCESSING.value)
-            for file_path in file_paths:
-                try:
-                    remove_author_loop(file_path)
-                    preprocess_label_element_loop_values(file_path)
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+            error_messages = map_in_order(
+                _preprocess_file, file_paths, n_workers
+            )
+            for file_path, error_message in zip(file_paths, error_messages):
+                if error_message is not None:
+                    print(f"Error processing {file_path}: {error_message}")
 
             # Move ill-formatted files after processing
-            move_files_based_on_errors(cif_dir_path, file_paths)
+            valid_cifs = move_files_based_on_errors(
+                cif_dir_path, file_paths, n_workers, logging_enabled
+            )
 
         # Initialize new files after ill-formatted files are moved
         self.file_paths = get_file_paths(
@@ -46,18 +146,107 @@ class CifEnsemble:
         self.file_count = len(self.file_paths)
         secho(f"Initializing {self.file_count} Cif objects...", fg="yellow")
 
-        if logging_enabled:
-            self.cifs: list[Cif] = [
-                Cif(file_path, is_formatted=True, logging_enabled=True)
-                for file_path in self.file_paths
-            ]
+        # Only initialize the files that have not been validated above
+        new_file_paths = [
+            file_path
+            for file_path in self.file_paths
+            if file_path not in valid_cifs
+        ]
+        new_cifs = map_in_order(
+            partial(Cif, is_formatted=True, logging_enabled=logging_enabled),
+            new_file_paths,
+            n_workers,
+        )
+        valid_cifs.update(zip(new_file_paths, new_cifs))
+        cifs = [valid_cifs[file_path] for file_path in self.file_paths]
+        if compact:
+            cifs = [cif.to_compact() for cif in cifs]
         else:
-            self.cifs: list[Cif] = [
-                Cif(file_path, is_formatted=True)
-                for file_path in self.file_paths
-            ]
+            for cif in cifs:
+                cif.cache_dir = cache_dir
+        self.cifs = cifs
         secho("Finished initialization!", fg="green")
 
+    @property
+    def cifs(self) -> list[Cif]:
+        return self._cifs
+
+    @cifs.setter
+    def cifs(self, cifs: list[Cif]) -> None:
+        """Set the Cif objects and clear the stats and filter indexes
+        computed from the previous ones. Assign a new list to change the
+        members, since changes made in place are not detected."""
+        self._cifs = cifs
+        self.file_paths = [cif.file_path for cif in cifs]
+        self.file_count = len(cifs)
+        self._is_compact = any(isinstance(cif, CompactCif) for cif in cifs)
+        self._clear_cache()
+
+    def _check_connections_kept(self, name: str) -> None:
+        """Raise for the methods and attributes that need the connections
+        if the ensemble keeps compact records."""
+        if self._is_compact:
+            raise ValueError(
+                GeneralError.COMPACT_ENSEMBLE_CONNECTIONS.value.format(
+                    name=name
+                )
+            )
+
+    def _clear_cache(self) -> None:
+        # Stats by attribute name, computed once on first use
+        self._stats: dict[str, dict] = {}
+        # Indexes of property values for filters, by property name
+        self._value_indexes: dict[str, ValueIndex] = {}
+        self._range_indexes: dict[str, RangeIndex] = {}
+        self._set_indexes: dict[str, SetIndex] = {}
+
+    def compute_connections(
+        self,
+        cutoff_radius=10.0,
+        neighbor_search="supercell",
+        n_workers=1,
+        per_orbit=False,
+        neighbor_count=None,
+    ) -> dict[str, str]:
+        """Compute the connections of all Cif objects, across a process
+        pool with n_workers greater than 1. The results are set on each Cif
+        object. See `Cif.compute_connections` for the other arguments.
+
+        Returns:
+            dict[str, str]: Error message by file path for the files that
+                failed.
+        """
+        self._check_connections_kept("compute_connections")
+        self._log_info(CifEnsembleLog.COMPUTE_CONNECTIONS.value)
+        results = map_in_order(
+            partial(
+                _compute_connection_results,
+                cutoff_radius=cutoff_radius,
+                neighbor_search=neighbor_search,
+                per_orbit=per_orbit,
+                neighbor_count=neighbor_count,
+            ),
+            self.cifs,
+            n_workers,
+        )
+
+        error_messages = {}
+        for cif, (connection_results, error_message) in zip(
+            self.cifs, results
+        ):
+            if error_message is not None:
+                print(
+                    f"Error computing connections for {cif.file_path}: "
+                    f"{error_message}"
+                )
+                error_messages[cif.file_path] = error_message
+                continue
+            cif._set_connection_results(connection_results)
+
+        # Stats and indexes may depend on the previous connections
+        self._clear_cache()
+        return error_messages
+
     def _log_info(self, message):
         """Log a formatted message if logging is enabled."""
         if self.logging_enabled:
@@ -66,11 +255,7 @@ class CifEnsemble:
 
     def _get_unique_property_values(self, property_name: str):
         """Return unique values for a given property from cifs."""
-        return set(
-            getattr(cif, property_name)
-            for cif in self.cifs
-            if hasattr(cif, property_name)
-        )
+        return set(self._attribute_stats(property_name))
 
     @property
     def unique_formulas(self) -> set[str]:
@@ -107,47 +292,48 @@ class CifEnsemble:
         """Get unique composition types from all .cif files in the folder."""
         return self._get_unique_property_values("composition_type")
 
-    def _get_unique_property_values_from_set(self, property_name: str):
-        unique_values = set()
-        for cif in self.cifs:
-            unique_values.update(getattr(cif, property_name))
-        return unique_values
-
     @property
     def unique_elements(self) -> set[str]:
         """Get unique elements from all .cif files in the folder."""
-        return self._get_unique_property_values_from_set("unique_elements")
+        return self._get_unique_property_values("unique_elements")
 
     @property
     def CN_unique_values_by_min_dist_method(self) -> set[str]:
-        return self._get_unique_property_values_from_set(
+        return self._get_unique_property_values(
             "CN_unique_values_by_min_dist_method"
         )
 
     @property
     def CN_unique_values_by_best_methods(self) -> set[str]:
-        return self._get_unique_property_values_from_set(
+        return self._get_unique_property_values(
             "CN_unique_values_by_best_methods"
         )
 
     def _attribute_stats(self, attribute_name, transform=None):
         """
         Helper method to compute the count of each unique value of a given
-        attribute across all Cif objects.
+        attribute across all Cif objects. The counts are kept until the
+        Cif objects change.
         """
-        values = [
-            (
-                transform(getattr(cif, attribute_name))
-                if transform
-                else getattr(cif, attribute_name)
+        if attribute_name in CONNECTION_ATTRIBUTES:
+            self._check_connections_kept(attribute_name)
+        if transform is not None:
+            return count_attribute_values(
+                self.cifs, [attribute_name], transform
+            )[attribute_name]
+
+        if attribute_name not in self._stats:
+            # Attributes parsed from the file are counted in a single pass,
+            # the others are counted when requested since they compute
+            # the supercell or connections
+            if attribute_name in STATS_ATTRIBUTES_FROM_PARSING:
+                attribute_names = STATS_ATTRIBUTES_FROM_PARSING
+            else:
+                attribute_names = [attribute_name]
+            self._stats.update(
+                count_attribute_values(self.cifs, attribute_names)
             )
-            for cif in self.cifs
-            if hasattr(cif, attribute_name)
-        ]
-        # Flatten the list if the attribute is a set of elements
-        if isinstance(values[0], set):
-            values = [elem for sublist in values for elem in sublist]
-        return dict(Counter(values))
+        return dict(self._stats[attribute_name])
 
     @property
     def structure_stats(self) -> dict[str, int]:
@@ -183,7 +369,7 @@ class CifEnsemble:
 
     @property
     def supercell_size_stats(self) -> dict[int, int]:
-        return self._attribute_stats("supercell_points", len)
+        return self._attribute_stats("supercell_atom_count")
 
     @property
     def unique_CN_values_by_min_dist_method_stat(
@@ -199,9 +385,11 @@ class CifEnsemble:
 
     def _collect_cif_data(self, attribute, transform=None):
         """Generic method to collect data from CIF files based on an attribute."""
+        if attribute in CONNECTION_ATTRIBUTES:
+            self._check_connections_kept(attribute)
         collected_data = []
         for cif in self.cifs:
-            attr_value = getattr(cif, attribute, None)
+            attr_value = getattr(cif, attribute)
             if attr_value is not None:
                 if transform:
                     value = transform(attr_value)
@@ -220,123 +408,155 @@ class CifEnsemble:
     def supercell_atom_counts(self) -> list[tuple[str, int]]:
         return self._collect_cif_data("supercell_atom_count")
 
-    def _filter_by_single_value(self, property_name: str, values: list):
-        cif_file_paths = set()
-        for cif in self.cifs:
-            property_value = getattr(cif, property_name, None)
-            if property_value in values:
-                cif_file_paths.add(cif.file_path)
+    def _get_property_values(self, property_name: str) -> list:
+        """Return the property value of each Cif."""
+        if property_name in CONNECTION_ATTRIBUTES:
+            self._check_connections_kept(property_name)
+        return [getattr(cif, property_name) for cif in self.cifs]
+
+    def _get_filter_result(self, mask: FileMask, as_mask: bool):
+        """Return the mask, or the set of file paths selected by it."""
+        return mask if as_mask else mask.file_paths
 
-        return cif_file_paths
+    def _filter_by_single_value(
+        self, property_name: str, values: list, as_mask=False
+    ):
+        # The hash index of each property is built once on first use
+        if property_name not in self._value_indexes:
+            self._value_indexes[property_name] = ValueIndex(
+                self._get_property_values(property_name)
+            )
+        file_ids = self._value_indexes[property_name].lookup(values)
+        mask = FileMask.from_ids(file_ids, self.file_paths)
+        return self._get_filter_result(mask, as_mask)
 
     # With sets
+    def _get_set_index(self, property_name: str) -> SetIndex:
+        # The inverted index of each property is built once on first use
+        if property_name not in self._set_indexes:
+            self._set_indexes[property_name] = SetIndex(
+                self._get_property_values(property_name)
+            )
+        return self._set_indexes[property_name]
+
     def _filter_contains_any(
-        self, property_name: str, values: list
-    ) -> set[str]:
-        cif_file_paths = set()
-        for cif in self.cifs:
-            property_value: str = getattr(cif, property_name)
-            if any(val in property_value for val in values):
-                cif_file_paths.add(cif.file_path)
-        return cif_file_paths
+        self, property_name: str, values: list, as_mask=False
+    ) -> set[str] | FileMask:
+        mask = self._get_set_index(property_name).lookup_any(values)
+        return self._get_filter_result(
+            FileMask(mask, self.file_paths), as_mask
+        )
 
     def _filter_exact_match(
-        self, property_name: str, values: list
-    ) -> set[str]:
-        cif_file_paths = set()
-        for cif in self.cifs:
-            property_value: str = getattr(cif, property_name)
-            if property_value == set(values):
-                cif_file_paths.add(cif.file_path)
-        return cif_file_paths
+        self, property_name: str, values: list, as_mask=False
+    ) -> set[str] | FileMask:
+        mask = self._get_set_index(property_name).lookup_exact(values)
+        return self._get_filter_result(
+            FileMask(mask, self.file_paths), as_mask
+        )
 
-    def filter_by_formulas(self, values: list[str]) -> set[str]:
-        return self._filter_by_single_value("formula", values)
+    """
+    Filters return the set of file paths, or with as_mask=True a FileMask
+    to combine with other masks using &, | and ~
+    """
 
-    def filter_by_structures(self, values: list[str]) -> set[str]:
-        return self._filter_by_single_value("structure", values)
+    def filter_by_formulas(self, values: list[str], as_mask=False):
+        return self._filter_by_single_value("formula", values, as_mask)
 
-    def filter_by_space_group_names(self, values: list[str]) -> set[str]:
-        return self._filter_by_single_value("space_group_name", values)
+    def filter_by_structures(self, values: list[str], as_mask=False):
+        return self._filter_by_single_value("structure", values, as_mask)
 
-    def filter_by_space_group_numbers(self, values: list[int]) -> set[str]:
-        return self._filter_by_single_value("space_group_number", values)
+    def filter_by_space_group_names(self, values: list[str], as_mask=False):
+        return self._filter_by_single_value(
+            "space_group_name", values, as_mask
+        )
 
-    def filter_by_site_mixing_types(self, values: list[str]) -> set[str]:
-        return self._filter_by_single_value("site_mixing_type", values)
+    def filter_by_space_group_numbers(self, values: list[int], as_mask=False):
+        return self._filter_by_single_value(
+            "space_group_number", values, as_mask
+        )
 
-    def filter_by_tags(self, values: list[str]) -> set[str]:
-        return self._filter_by_single_value("tag", values)
+    def filter_by_site_mixing_types(self, values: list[str], as_mask=False):
+        return self._filter_by_single_value(
+            "site_mixing_type", values, as_mask
+        )
 
-    def filter_by_composition_types(self, values: list[int]) -> set[str]:
-        return self._filter_by_single_value("composition_type", values)
+    def filter_by_tags(self, values: list[str], as_mask=False):
+        return self._filter_by_single_value("tag", values, as_mask)
+
+    def filter_by_composition_types(self, values: list[int], as_mask=False):
+        return self._filter_by_single_value(
+            "composition_type", values, as_mask
+        )
 
     # Filter with setsz
-    def filter_by_elements_containing(self, values: list[str]) -> set[str]:
-        return self._filter_contains_any("unique_elements", values)
+    def filter_by_elements_containing(self, values: list[str], as_mask=False):
+        return self._filter_contains_any("unique_elements", values, as_mask)
 
-    def filter_by_elements_exact_matching(self, values: list[str]) -> set[str]:
-        return self._filter_exact_match("unique_elements", values)
+    def filter_by_elements_exact_matching(
+        self, values: list[str], as_mask=False
+    ):
+        return self._filter_exact_match("unique_elements", values, as_mask)
 
     """
     Filter by CN
     """
 
     def filter_by_CN_min_dist_method_containing(
-        self, values: list[int]
-    ) -> set[str]:
+        self, values: list[int], as_mask=False
+    ):
         return self._filter_contains_any(
-            "CN_unique_values_by_min_dist_method", values
+            "CN_unique_values_by_min_dist_method", values, as_mask
         )
 
     def filter_by_CN_min_dist_method_exact_matching(
-        self, values: list[int]
-    ) -> set[str]:
+        self, values: list[int], as_mask=False
+    ):
         return self._filter_exact_match(
-            "CN_unique_values_by_min_dist_method", values
+            "CN_unique_values_by_min_dist_method", values, as_mask
         )
 
     def filter_by_CN_best_methods_containing(
-        self, values: list[int]
-    ) -> set[str]:
+        self, values: list[int], as_mask=False
+    ):
         return self._filter_contains_any(
-            "CN_unique_values_by_best_methods", values
+            "CN_unique_values_by_best_methods", values, as_mask
         )
 
     def filter_by_CN_best_methods_exact_matching(
-        self, values: list[int]
-    ) -> set[str]:
+        self, values: list[int], as_mask=False
+    ):
         return self._filter_exact_match(
-            "CN_unique_values_by_best_methods", values
+            "CN_unique_values_by_best_methods", values, as_mask
         )
 
     def _filter_by_range(
-        self, property: str, min: float | int, max: float | int
-    ) -> set[str]:
-        cif_file_paths = set()
-        for cif in self.cifs:
-            property_value = getattr(cif, property, None)
-            if property_value is None:
-                continue
-            if property_value < min or property_value > max:
-                continue
-            cif_file_paths.add(cif.file_path)
-        return cif_file_paths
+        self, property: str, min: float | int, max: float | int, as_mask=False
+    ):
+        # The sorted index of each property is built once on first use
+        if property not in self._range_indexes:
+            self._range_indexes[property] = RangeIndex(
+                self._get_property_values(property)
+            )
+        file_ids = self._range_indexes[property].lookup(min, max)
+        mask = FileMask.from_ids(file_ids, self.file_paths)
+        return self._get_filter_result(mask, as_mask)
 
     def filter_by_min_distance(
-        self, min_distance: float, max_distance: float
-    ) -> set[str]:
+        self, min_distance: float, max_distance: float, as_mask=False
+    ):
         return self._filter_by_range(
-            "shortest_distance", min_distance, max_distance
+            "shortest_distance", min_distance, max_distance, as_mask
         )
 
     def filter_by_supercell_count(
-        self, min_count: int, max_count: int
-    ) -> set[str]:
+        self, min_count: int, max_count: int, as_mask=False
+    ):
         return self._filter_by_range(
             "supercell_atom_count",
             min_count,
             max_count,
+            as_mask,
         )
 
     def move_cif_files(
@@ -0,0 +1,97 @@
+from functools import partial
+from typing import Callable, Iterator
+
+from cifkit.models.cif import Cif
+from cifkit.models.cif_ensemble import count_attribute_values
+from cifkit.utils.folder import get_file_paths
+from cifkit.utils.parallel import imap_in_order
+
+
+def _load_cif(
+    file_path: str, is_formatted: bool, logging_enabled: bool
+) -> tuple[Cif | None, str | None]:
+    """Return the Cif object, or the error message if it fails."""
+    try:
+        cif = Cif(
+            file_path,
+            is_formatted=is_formatted,
+            logging_enabled=logging_enabled,
+        )
+    except Exception as e:
+        return None, str(e)
+    return cif, None
+
+
+class CifStream:
+    def __init__(
+        self,
+        cif_dir_path: str,
+        add_nested_files=False,
+        is_formatted=False,
+        logging_enabled=False,
+        n_workers=1,
+        prefetch=None,
+    ) -> None:
+        """Stream Cif objects for the .cif files in the folder one at a
+        time, without keeping them in memory like CifEnsemble.
+
+        Parameters
+        ----------
+        cif_dir_path : str
+            Path to the folder of .cif files.
+        add_nested_files : bool, optional
+            Include .cif files in subfolders, by default False
+        is_formatted : bool, optional
+            Skip preprocessing if the files have been formatted, by default
+            False
+        logging_enabled : bool, optional
+            Log each step of initialization, by default False
+        n_workers : int, optional
+            Number of processes parsing files ahead of the consumer, by
+            default 1
+        prefetch : int, optional
+            Maximum number of files parsed ahead, by default twice the
+            number of workers
+        """
+        self.dir_path = cif_dir_path
+        self.file_paths = get_file_paths(
+            cif_dir_path, add_nested_files=add_nested_files
+        )
+        self.file_count = len(self.file_paths)
+        self.is_formatted = is_formatted
+        self.logging_enabled = logging_enabled
+        self.n_workers = n_workers
+        self.prefetch = prefetch
+
+    def __len__(self) -> int:
+        return self.file_count
+
+    def __iter__(self) -> Iterator[Cif]:
+        return self.iter_cifs()
+
+    def iter_cifs(self) -> Iterator[Cif]:
+        """Yield a Cif object per file in order. Files that fail to
+        initialize are reported and skipped."""
+        load_cif = partial(
+            _load_cif,
+            is_formatted=self.is_formatted,
+            logging_enabled=self.logging_enabled,
+        )
+        results = imap_in_order(
+            load_cif, self.file_paths, self.n_workers, self.prefetch
+        )
+        for file_path, (cif, error_message) in zip(self.file_paths, results):
+            if error_message is not None:
+                print(f"Error processing {file_path}: {error_message}")
+                continue
+            yield cif
+
+    def attribute_stats(self, attribute_names: list[str]) -> dict[str, dict]:
+        """Count the values of each attribute in a single pass over the
+        stream, such as {"structure": {"CeAl2Ga2": 3, "W": 3}}."""
+        return count_attribute_values(self.iter_cifs(), attribute_names)
+
+    def filter(self, predicate: Callable[[Cif], bool]) -> set[str]:
+        """Return the file paths of the Cif objects matching the predicate,
+        such as `lambda cif: "Ge" in cif.unique_elements`."""
+        return {cif.file_path for cif in self.iter_cifs() if predicate(cif)}
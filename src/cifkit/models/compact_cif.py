@@ -0,0 +1,174 @@
+import os
+import sys
+import zlib
+
+import numpy as np
+
+from cifkit.preprocessors.supercell import (
+    get_points_from_array,
+    get_unitcell_point_array,
+    shift_point_array,
+)
+
+
+def get_interned_strings(values: list[str]) -> tuple[str, ...]:
+    """Return the strings interned, so records share one copy of each
+    site label and element, freed once no record refers to it."""
+    return tuple(sys.intern(value) for value in values)
+
+
+class CompactCif:
+    """Compact record of the fields parsed from a .cif file. The gemmi
+    block is not kept, the unit cell points are kept as an array and site
+    labels and elements as interned strings shared by all records. Use
+    `to_cif` for the connections and coordination results."""
+
+    __slots__ = (
+        "file_path",
+        "db_source",
+        "formula",
+        "structure",
+        "weight",
+        "space_group_number",
+        "space_group_name",
+        "tag",
+        "site_mixing_type",
+        "unitcell_lengths",
+        "unitcell_angles",
+        "_site_labels",
+        "_elements",
+        "_unitcell_point_array",
+        "_supercell_atom_count",
+        "_content",
+    )
+
+    # Fields stored as they are
+    _FIELDS = (
+        "file_path",
+        "db_source",
+        "formula",
+        "structure",
+        "weight",
+        "space_group_number",
+        "space_group_name",
+        "tag",
+        "site_mixing_type",
+    )
+
+    @classmethod
+    def from_cif(cls, cif) -> "CompactCif":
+        """Copy the parsed fields of the Cif object."""
+        compact_cif = cls.__new__(cls)
+        for field in cls._FIELDS:
+            value = getattr(cif, field)
+            if isinstance(value, str):
+                value = sys.intern(value)
+            setattr(compact_cif, field, value)
+
+        compact_cif.unitcell_lengths = list(cif.unitcell_lengths)
+        compact_cif.unitcell_angles = list(cif.unitcell_angles)
+        compact_cif._site_labels = get_interned_strings(cif.site_labels)
+        compact_cif._elements = get_interned_strings(
+            sorted(cif.unique_elements)
+        )
+        # Only the unit cell is kept, the supercell is shifted from it
+        unitcell_point_array = cif._unitcell_point_array
+        if unitcell_point_array is None:
+            unitcell_point_array = get_unitcell_point_array(cif._block)
+        compact_cif._unitcell_point_array = unitcell_point_array
+        compact_cif._supercell_atom_count = None
+        # Without a file, the content is kept to initialize the Cif again
+        compact_cif._content = None
+        if cif._content is not None:
+            compact_cif._content = zlib.compress(cif._content.encode(), 1)
+        return compact_cif
+
+    def __reduce__(self):
+        # Strings are interned again in the process they are loaded in
+        state = {field: getattr(self, field) for field in self._FIELDS}
+        state["unitcell_lengths"] = self.unitcell_lengths
+        state["unitcell_angles"] = self.unitcell_angles
+        state["site_labels"] = self._site_labels
+        state["elements"] = self._elements
+        state["unitcell_point_array"] = self._unitcell_point_array
+        state["content"] = self._content
+        return (_restore_compact_cif, (state,))
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+    @property
+    def file_name_without_ext(self) -> str:
+        return os.path.splitext(self.file_name)[0]
+
+    @property
+    def site_labels(self) -> list[str]:
+        return list(self._site_labels)
+
+    @property
+    def unique_elements(self) -> set[str]:
+        return set(self._elements)
+
+    @property
+    def composition_type(self) -> int:
+        return len(self._elements)
+
+    @property
+    def unitcell_point_array(self) -> np.ndarray:
+        return self._unitcell_point_array
+
+    @property
+    def supercell_point_array(self) -> np.ndarray:
+        """Property that shifts the unit cell points, not kept to save
+        memory."""
+        return shift_point_array(self._unitcell_point_array, 3)
+
+    @property
+    def unitcell_points(self) -> list[tuple[float, float, float, str]]:
+        return get_points_from_array(
+            self._unitcell_point_array, self.site_labels
+        )
+
+    @property
+    def supercell_points(self) -> list[tuple[float, float, float, str]]:
+        return get_points_from_array(
+            self.supercell_point_array, self.site_labels
+        )
+
+    @property
+    def unitcell_atom_count(self) -> int:
+        return len(self._unitcell_point_array)
+
+    @property
+    def supercell_atom_count(self) -> int:
+        if self._supercell_atom_count is None:
+            self._supercell_atom_count = len(self.supercell_point_array)
+        return self._supercell_atom_count
+
+    def to_cif(self):
+        """Initialize the full Cif object again from the formatted file, or
+        from the content kept for a Cif initialized from memory."""
+        from cifkit.models.cif import Cif
+
+        if self._content is not None:
+            return Cif.from_string(
+                zlib.decompress(self._content).decode(),
+                file_path=self.file_path,
+                is_formatted=True,
+            )
+        return Cif(self.file_path, is_formatted=True)
+
+
+def _restore_compact_cif(state: dict) -> CompactCif:
+    compact_cif = CompactCif.__new__(CompactCif)
+    for field in CompactCif._FIELDS:
+        setattr(compact_cif, field, state[field])
+    compact_cif.unitcell_lengths = state["unitcell_lengths"]
+    compact_cif.unitcell_angles = state["unitcell_angles"]
+    compact_cif._site_labels = get_interned_strings(state["site_labels"])
+    compact_cif._elements = get_interned_strings(state["elements"])
+    compact_cif._unitcell_point_array = state["unitcell_point_array"]
+    compact_cif._supercell_atom_count = None
+    compact_cif._content = state["content"]
+    return compact_cif
@@ -0,0 +1,129 @@
+import numpy as np
+
+from cifkit.utils.error_messages import GeneralError
+
+
+class FileMask:
+    """Boolean mask over the files of an ensemble. Masks from the same
+    ensemble combine with &, | and ~ before turning into file paths."""
+
+    def __init__(self, mask: np.ndarray, file_paths: list[str]) -> None:
+        self.mask = mask
+        self._file_paths = file_paths
+
+    @classmethod
+    def from_ids(cls, file_ids: np.ndarray, file_paths: list[str]):
+        mask = np.zeros(len(file_paths), dtype=bool)
+        mask[file_ids] = True
+        return cls(mask, file_paths)
+
+    def _check_same_files(self, other: "FileMask") -> None:
+        if self._file_paths is not other._file_paths:
+            raise ValueError(GeneralError.MASK_ENSEMBLE_MISMATCH.value)
+
+    def __and__(self, other: "FileMask") -> "FileMask":
+        self._check_same_files(other)
+        return FileMask(self.mask & other.mask, self._file_paths)
+
+    def __or__(self, other: "FileMask") -> "FileMask":
+        self._check_same_files(other)
+        return FileMask(self.mask | other.mask, self._file_paths)
+
+    def __invert__(self) -> "FileMask":
+        return FileMask(~self.mask, self._file_paths)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.mask))
+
+    @property
+    def file_paths(self) -> set[str]:
+        """Return the file paths selected by the mask."""
+        return {self._file_paths[i] for i in np.flatnonzero(self.mask)}
+
+
+class ValueIndex:
+    """Hash index from each value of a scalar attribute to the ids of the
+    files with that value, for equality filters."""
+
+    def __init__(self, values: list) -> None:
+        file_ids = {}
+        for file_id, value in enumerate(values):
+            file_ids.setdefault(value, []).append(file_id)
+        self._file_ids = {
+            value: np.array(ids, dtype=np.intp)
+            for value, ids in file_ids.items()
+        }
+
+    def lookup(self, values: list) -> np.ndarray:
+        """Return the sorted ids of the files matching any of the values."""
+        matched_ids = [
+            self._file_ids[value]
+            for value in set(values)
+            if value in self._file_ids
+        ]
+        if not matched_ids:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(matched_ids))
+
+
+class RangeIndex:
+    """Sorted index of a numeric attribute for range filters. Files without
+    a value are left out."""
+
+    def __init__(self, values: list) -> None:
+        file_ids = np.array(
+            [i for i, value in enumerate(values) if value is not None],
+            dtype=np.intp,
+        )
+        keys = np.array([values[i] for i in file_ids], dtype=float)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._file_ids = file_ids[order]
+
+    def lookup(self, min_value: float, max_value: float) -> np.ndarray:
+        """Return the sorted ids of the files with min <= value <= max."""
+        start = np.searchsorted(self._keys, min_value, side="left")
+        end = np.searchsorted(self._keys, max_value, side="right")
+        return np.sort(self._file_ids[start:end])
+
+
+class SetIndex:
+    """Inverted index from each value of a set attribute, such as elements
+    or CN values, to a boolean mask of the files containing it."""
+
+    def __init__(self, value_sets: list[set]) -> None:
+        self.file_count = len(value_sets)
+        self._set_sizes = np.array([len(values) for values in value_sets])
+        file_ids = {}
+        for file_id, values in enumerate(value_sets):
+            for value in values:
+                file_ids.setdefault(value, []).append(file_id)
+
+        self._masks = {}
+        for value, ids in file_ids.items():
+            mask = np.zeros(self.file_count, dtype=bool)
+            mask[ids] = True
+            self._masks[value] = mask
+
+    def _get_mask(self, value) -> np.ndarray:
+        if value in self._masks:
+            return self._masks[value]
+        return np.zeros(self.file_count, dtype=bool)
+
+    def lookup_any(self, values: list) -> np.ndarray:
+        """Return the mask of the files containing any of the values."""
+        mask = np.zeros(self.file_count, dtype=bool)
+        for value in set(values):
+            mask |= self._get_mask(value)
+        return mask
+
+    def lookup_all(self, values: list) -> np.ndarray:
+        """Return the mask of the files containing all of the values."""
+        mask = np.ones(self.file_count, dtype=bool)
+        for value in set(values):
+            mask &= self._get_mask(value)
+        return mask
+
+    def lookup_exact(self, values: list) -> np.ndarray:
+        """Return the mask of the files whose set equals the values."""
+        return self.lookup_all(values) & (self._set_sizes == len(set(values)))
@@ -0,0 +1,229 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class NeighborList(Mapping):
+    """Neighbors of each site stored as arrays. The center coordinate is
+    kept once per site and the neighbors of all sites are concatenated,
+    with the neighbors of site i at offsets[i]:offsets[i + 1].
+
+    It reads as the {label: [(other_label, dist, cart_1, cart_2), ...]}
+    connections, with the tuples of a site built on access."""
+
+    __slots__ = (
+        "site_labels",
+        "labels",
+        "centers",
+        "offsets",
+        "neighbor_label_ids",
+        "distances",
+        "coordinates",
+        "_site_indices",
+    )
+
+    def __init__(
+        self,
+        site_labels: list[str],
+        labels: list[str],
+        centers: np.ndarray,
+        offsets: np.ndarray,
+        neighbor_label_ids: np.ndarray,
+        distances: np.ndarray,
+        coordinates: np.ndarray,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        site_labels : list[str]
+            Label of each site, in order.
+        labels : list[str]
+            Labels indexed by the neighbor label ids.
+        centers : np.ndarray
+            (n_sites, 3) Cartesian coordinates of each site.
+        offsets : np.ndarray
+            (n_sites + 1,) start of the neighbors of each site.
+        neighbor_label_ids : np.ndarray
+            (n_neighbors,) label id of each neighbor.
+        distances : np.ndarray
+            (n_neighbors,) distance to each neighbor.
+        coordinates : np.ndarray
+            (n_neighbors, 3) Cartesian coordinates of each neighbor.
+        """
+        self.site_labels = site_labels
+        self.labels = labels
+        self.centers = centers
+        self.offsets = offsets
+        self.neighbor_label_ids = neighbor_label_ids
+        self.distances = distances
+        self.coordinates = coordinates
+        self._site_indices = {
+            label: site_index for site_index, label in enumerate(site_labels)
+        }
+
+    @classmethod
+    def from_connections(
+        cls, connections: Mapping, labels: list[str] | None = None
+    ) -> "NeighborList":
+        """Store the connections as arrays. The labels of the neighbor
+        label ids default to the labels in order of appearance."""
+        if isinstance(connections, NeighborList):
+            return connections
+
+        site_labels = list(connections)
+        labels = list(labels or [])
+        label_ids = {label: label_id for label_id, label in enumerate(labels)}
+        centers = np.full((len(site_labels), 3), np.nan)
+        offsets = np.zeros(len(site_labels) + 1, dtype=np.intp)
+        neighbor_label_ids = []
+        distances = []
+        coordinates = []
+        for site_index, site_connections in enumerate(connections.values()):
+            offsets[site_index + 1] = offsets[site_index] + len(
+                site_connections
+            )
+            if site_connections:
+                centers[site_index] = site_connections[0][2]
+            for other_label, dist, _, cart_2 in site_connections:
+                if other_label not in label_ids:
+                    label_ids[other_label] = len(labels)
+                    labels.append(other_label)
+                neighbor_label_ids.append(label_ids[other_label])
+                distances.append(dist)
+                coordinates.append(cart_2)
+
+        return cls(
+            site_labels,
+            labels,
+            centers,
+            offsets,
+            np.array(neighbor_label_ids, dtype=np.intp),
+            np.array(distances, dtype=float),
+            np.array(coordinates, dtype=float).reshape(-1, 3),
+        )
+
+    def __getitem__(self, label: str) -> list[tuple]:
+        site_index = self._site_indices[label]
+        start, end = self.offsets[site_index : site_index + 2]
+        center = self.centers[site_index].tolist()
+        return [
+            (self.labels[label_id], dist, list(center), cart_2)
+            for label_id, dist, cart_2 in zip(
+                self.neighbor_label_ids[start:end].tolist(),
+                self.distances[start:end].tolist(),
+                self.coordinates[start:end].tolist(),
+            )
+        ]
+
+    def __iter__(self):
+        return iter(self.site_labels)
+
+    def __len__(self) -> int:
+        return len(self.site_labels)
+
+    def __contains__(self, label) -> bool:
+        return label in self._site_indices
+
+    def __repr__(self) -> str:
+        return (
+            f"NeighborList({len(self)} sites, "
+            f"{len(self.distances)} neighbors)"
+        )
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if name != "_site_indices"
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    @property
+    def neighbor_counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def _get_range(self, label: str) -> slice:
+        site_index = self._site_indices[label]
+        return slice(self.offsets[site_index], self.offsets[site_index + 1])
+
+    def get_center(self, label: str) -> np.ndarray:
+        return self.centers[self._site_indices[label]]
+
+    def get_distances(self, label: str) -> np.ndarray:
+        return self.distances[self._get_range(label)]
+
+    def get_coordinates(self, label: str) -> np.ndarray:
+        return self.coordinates[self._get_range(label)]
+
+    def get_neighbor_label_ids(self, label: str) -> np.ndarray:
+        return self.neighbor_label_ids[self._get_range(label)]
+
+    def get_neighbor_labels(self, label: str) -> list[str]:
+        return [
+            self.labels[label_id]
+            for label_id in self.get_neighbor_label_ids(label).tolist()
+        ]
+
+    def get_encoded_label_ids(
+        self, label_ids: dict[str, int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the label ids of the site of each neighbor and of the
+        neighbor itself, in another encoding of the labels."""
+        site_ids = np.array(
+            [label_ids[label] for label in self.site_labels], dtype=np.intp
+        )
+        neighbor_ids = np.array(
+            [label_ids[label] for label in self.labels], dtype=np.intp
+        )
+        return (
+            np.repeat(site_ids, self.neighbor_counts),
+            neighbor_ids[self.neighbor_label_ids],
+        )
+
+    def truncate(self, counts: dict[str, int]) -> "NeighborList":
+        """Return the first neighbors of the sites in counts, sliced as
+        `connections[label][:count]`."""
+        site_indices = [self._site_indices[label] for label in counts]
+        neighbor_indices = []
+        offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        for i, (site_index, count) in enumerate(
+            zip(site_indices, counts.values())
+        ):
+            start = self.offsets[site_index]
+            _, stop, _ = slice(count).indices(
+                self.offsets[site_index + 1] - start
+            )
+            neighbor_indices.append(np.arange(start, start + stop))
+            offsets[i + 1] = offsets[i] + stop
+
+        neighbor_indices = np.concatenate(
+            [np.empty(0, dtype=np.intp), *neighbor_indices]
+        )
+        return NeighborList(
+            list(counts),
+            self.labels,
+            self.centers[site_indices].reshape(-1, 3),
+            offsets,
+            self.neighbor_label_ids[neighbor_indices],
+            self.distances[neighbor_indices],
+            self.coordinates[neighbor_indices],
+        )
+
+    def truncate_by_distance(self, cutoff_radius: float) -> "NeighborList":
+        """Return the neighbors closer than the cutoff radius. The
+        neighbors of each site are sorted by distance."""
+        counts = {
+            label: int(
+                np.searchsorted(
+                    self.get_distances(label), cutoff_radius, side="left"
+                )
+            )
+            for label in self.site_labels
+        }
+        return self.truncate(counts)
+
+    def to_dict(self) -> dict[str, list[tuple]]:
+        """Return the connections as lists of tuples."""
+        return {label: self[label] for label in self.site_labels}
@@ -1,6 +1,14 @@
+import heapq
+
 import numpy as np
+from scipy.spatial import cKDTree
 
-from cifkit.utils import distance, unit
+from cifkit.coordination.method import CN_NEIGHBOR_COUNT
+from cifkit.preprocessors.supercell import (
+    POINT_DTYPE,
+    get_point_array_coordinates,
+)
+from cifkit.utils import unit
 
 
 def get_site_connections(
@@ -8,25 +16,63 @@ def get_site_connections(
     unitcell_points,
     supercell_points,
     cutoff_radius: float,
+    per_orbit=False,
+    neighbor_count: int | None = None,
 ) -> dict:
     """
-    Compute all pair distances per site label.
+    Compute all pair distances per site label. The points are either lists
+    of (x, y, z, label) tuples or structured arrays whose label field
+    indexes the site labels in parsed_data. With neighbor_count, only the
+    nearest neighbors of each site are kept, see `keep_nearest_connections`.
+    Every distance within the cutoff is still computed and the connections
+    are trimmed afterwards, unlike `get_site_connections_by_kdtree`.
+
+    The copies of a site label in the unit cell form one symmetry orbit
+    and share the same environment. With per_orbit, only the copy farthest
+    inside the supercell is computed. If the supercell cuts off its 20
+    nearest neighbors, all copies are computed and the most connected one
+    is kept. Neighbors beyond may be cut off differently than the most
+    connected copy, as the supercell is finite in both cases.
     """
     labels, lengths, angles = parsed_data
 
+    if per_orbit:
+        unitcell_coords, _ = get_coordinates_and_labels(
+            unitcell_points, labels
+        )
+        supercell_coords, _ = get_coordinates_and_labels(
+            supercell_points, labels
+        )
+
     all_labels_connections = {}
     for site_label in labels:
-        filtered_unitcell_points = [
-            point for point in unitcell_points if point[3] == site_label
-        ]
-
-        dist_result = get_nearest_dists_per_site(
-            filtered_unitcell_points,
-            supercell_points,
-            cutoff_radius,
-            lengths,
-            angles,
+        filtered_unitcell_points = filter_points_by_label(
+            unitcell_points, site_label, labels
         )
+        dist_result = None
+        if per_orbit and len(filtered_unitcell_points) > 1:
+            dist_result = get_orbit_dists_per_site(
+                filtered_unitcell_points,
+                unitcell_coords,
+                supercell_coords,
+                supercell_points,
+                cutoff_radius,
+                lengths,
+                angles,
+                labels,
+                neighbor_count=neighbor_count or CN_NEIGHBOR_COUNT,
+            )
+
+        # Compute every copy of the site
+        if dist_result is None:
+            dist_result = get_nearest_dists_per_site(
+                filtered_unitcell_points,
+                supercell_points,
+                cutoff_radius,
+                lengths,
+                angles,
+                site_labels=labels,
+            )
 
         dist_dict, dist_set = dist_result
 
@@ -36,7 +82,89 @@ def get_site_connections(
         ) = get_most_connected_point_per_site(site_label, dist_dict, dist_set)
 
         all_labels_connections[label] = connections
-    return remove_duplicate_connections(all_labels_connections)
+    all_labels_connections = remove_duplicate_connections(
+        all_labels_connections
+    )
+    if neighbor_count is not None:
+        return keep_nearest_connections(all_labels_connections, neighbor_count)
+    return all_labels_connections
+
+
+def get_orbit_dists_per_site(
+    filtered_unitcell_points,
+    unitcell_coords: np.ndarray,
+    supercell_coords: np.ndarray,
+    supercell_points,
+    cutoff_radius: float,
+    lengths,
+    angles_rad,
+    site_labels: list[str],
+    neighbor_count=CN_NEIGHBOR_COUNT,
+):
+    """
+    Compute the distances of one representative of the symmetry orbit.
+    Return None if the supercell cuts off its environment within the
+    nearest neighbor_count neighbors, which the CN is determined from.
+    """
+    cell_matrix = unit.get_cell_matrix(lengths, angles_rad)
+    ref_coords, _ = get_coordinates_and_labels(
+        filtered_unitcell_points, site_labels
+    )
+    index, complete_radius = get_orbit_representative(
+        ref_coords, unitcell_coords, supercell_coords, cell_matrix
+    )
+    dist_dict, dist_set = get_nearest_dists_per_site(
+        filtered_unitcell_points[index : index + 1],
+        supercell_points,
+        cutoff_radius,
+        lengths,
+        angles_rad,
+        site_labels=site_labels,
+    )
+    if not dist_dict:
+        return None
+
+    # Distances are rounded to 0.001
+    nearest_dists = heapq.nsmallest(
+        neighbor_count, [connection[1] for connection in dist_dict[0]]
+    )
+    if cutoff_radius >= complete_radius and (
+        len(nearest_dists) < neighbor_count
+        or nearest_dists[-1] + 0.001 >= complete_radius
+    ):
+        return None
+    return dist_dict, dist_set
+
+
+def get_orbit_representative(
+    ref_coords: np.ndarray,
+    unitcell_coords: np.ndarray,
+    supercell_coords: np.ndarray,
+    cell_matrix: np.ndarray,
+) -> tuple[int, float]:
+    """
+    Return the index of the reference point farthest inside the supercell
+    and the radius within which its environment is complete.
+
+    The supercell holds the images of the unit cell points shifted by a
+    block of cell shifts. An image from outside the block is at least the
+    returned radius away from the reference point.
+    """
+    # Fractional distance per Angstrom along each axis, 1 / d_hkl
+    reciprocal_lengths = np.linalg.norm(np.linalg.inv(cell_matrix), axis=1)
+    unitcell_min = unitcell_coords.min(axis=0)
+    unitcell_max = unitcell_coords.max(axis=0)
+    shift_min = np.round(supercell_coords.min(axis=0) - unitcell_min)
+    shift_max = np.round(supercell_coords.max(axis=0) - unitcell_max)
+
+    lower_margins = ref_coords - (unitcell_max + shift_min - 1)
+    upper_margins = (unitcell_min + shift_max + 1) - ref_coords
+    # Margins in Angstrom, the smallest along any axis
+    complete_radii = (
+        np.minimum(lower_margins, upper_margins) / reciprocal_lengths
+    ).min(axis=1)
+    index = int(np.argmax(complete_radii))
+    return index, float(complete_radii[index])
 
 
 def get_nearest_dists_per_site(
@@ -45,57 +173,318 @@ def get_nearest_dists_per_site(
     cutoff_radius: float,
     lengths,
     angles_rad,
+    site_labels=None,
 ):
+    """
+    Compute the distances from each reference point to every supercell
+    point at once. The cell matrix is built a single time and all points
+    are converted to Cartesian coordinates in one matrix multiplication.
+    The site labels are required for points given as structured arrays.
+    """
     # Initialize a dictionary to store the relationships
     dist_dict = {}
     dist_set = set()
 
-    # Loop through each point in the filtered list
-    for i, point_1 in enumerate(filtered_unitcell_points):
-        point_2_info = []
-        for j, point_2 in enumerate(supercell_points):
-            if point_1 == point_2:
-                continue  # Skip comparison with itself
-            # Convert fractional to Cartesian coordinates
-            cart_1 = unit.fractional_to_cartesian(
-                [point_1[0], point_1[1], point_1[2]],
-                lengths,
-                angles_rad,
+    if len(filtered_unitcell_points) == 0 or len(supercell_points) == 0:
+        return dist_dict, dist_set
+
+    cell_matrix = unit.get_cell_matrix(lengths, angles_rad)
+    ref_coords, ref_labels = get_coordinates_and_labels(
+        filtered_unitcell_points, site_labels
+    )
+    other_coords, other_labels = get_coordinates_and_labels(
+        supercell_points, site_labels
+    )
+
+    # Convert fractional to Cartesian coordinates
+    ref_carts = unit.fractional_to_cartesian_array(ref_coords, cell_matrix)
+    other_carts = unit.fractional_to_cartesian_array(other_coords, cell_matrix)
+
+    # Calculate the dist between all pairs of points
+    diffs = other_carts[None, :, :] - ref_carts[:, None, :]
+    dists = np.round(np.linalg.norm(diffs, axis=2), 3)
+
+    # Skip comparison with itself
+    is_self = np.all(
+        ref_coords[:, None, :] == other_coords[None, :, :], axis=2
+    ) & (ref_labels[:, None] == other_labels[None, :])
+
+    dist_set.update(dists[~is_self].tolist())
+
+    # Check the dist
+    is_within_cutoff = (dists < cutoff_radius) & (dists > 0.1) & ~is_self
+
+    ref_carts_rounded = np.round(ref_carts, 3).tolist()
+    other_carts_rounded = np.round(other_carts, 3)
+
+    for i in range(len(ref_coords)):
+        indices = np.flatnonzero(is_within_cutoff[i])
+        if indices.size == 0:
+            continue
+        # Store the list in the dictionary with `i` as the key
+        dist_dict[i] = [
+            (label, dist, list(ref_carts_rounded[i]), cart_2)
+            for label, dist, cart_2 in zip(
+                other_labels[indices].tolist(),
+                dists[i, indices].tolist(),
+                other_carts_rounded[indices].tolist(),
             )
-            cart_2 = unit.fractional_to_cartesian(
-                [point_2[0], point_2[1], point_2[2]],
-                lengths,
-                angles_rad,
+        ]
+
+    return dist_dict, dist_set
+
+
+def get_coordinates_and_labels(
+    points, site_labels=None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split (x, y, z, label) points into an (N, 3) array of fractional
+    coordinates and an array of site labels. For a structured array, the
+    label indices are mapped to the site labels.
+    """
+    if is_point_array(points):
+        coordinates = get_point_array_coordinates(points)
+        labels = np.array(site_labels, dtype=object)[points["label"]]
+        return coordinates, labels
+
+    coordinates = np.array(
+        [point[:3] for point in points], dtype=float
+    ).reshape(-1, 3)
+    labels = np.array([point[3] for point in points], dtype=object)
+    return coordinates, labels
+
+
+def filter_points_by_label(points, site_label: str, site_labels: list[str]):
+    """
+    Return the points of the site label, keeping the form of the points.
+    """
+    if is_point_array(points):
+        return points[points["label"] == site_labels.index(site_label)]
+    return [point for point in points if point[3] == site_label]
+
+
+def is_point_array(points) -> bool:
+    """
+    Check whether the points are a structured array of POINT_DTYPE.
+    """
+    return isinstance(points, np.ndarray) and points.dtype == POINT_DTYPE
+
+
+def get_site_connections_by_kdtree(
+    parsed_data: list[str],
+    unitcell_points,
+    cutoff_radius: float,
+    per_orbit=False,
+    neighbor_count: int | None = None,
+) -> dict:
+    """
+    Compute all pair distances per site label using a KD-tree built over
+    the periodic images of the unit cell. Only the images that can lie
+    within the cutoff radius are generated, so the cost scales with the
+    number of neighbors instead of the 3x3x3 supercell size.
+
+    The images cover the environment of every unit cell point, so with
+    per_orbit only the first copy of each site label is queried.
+
+    With neighbor_count, the images are generated within a radius derived
+    from the atomic density, doubled until every point has neighbor_count
+    neighbors within it, and only the nearest neighbors are queried.
+    """
+    labels, lengths, angles = parsed_data
+    cell_matrix = unit.get_cell_matrix(lengths, angles)
+    unitcell_coords, unitcell_labels = get_coordinates_and_labels(
+        unitcell_points, labels
+    )
+
+    search_radius = cutoff_radius
+    if neighbor_count is not None:
+        search_radius = min(
+            cutoff_radius,
+            get_density_radius(
+                len(unitcell_coords), cell_matrix, neighbor_count
+            ),
+        )
+    while True:
+        image_coords, image_labels = get_periodic_image_points(
+            unitcell_coords,
+            unitcell_labels,
+            cell_matrix,
+            search_radius,
+        )
+        image_carts = unit.fractional_to_cartesian_array(
+            image_coords, cell_matrix
+        )
+        image_carts_rounded = np.round(image_carts, 3)
+        tree = cKDTree(image_carts)
+        if neighbor_count is None:
+            break
+        # Sites sharing a position are one neighbor after removing the
+        # duplicate connections, so count the unique positions
+        _, position_indices = np.unique(
+            image_carts_rounded, axis=0, return_index=True
+        )
+        position_tree = cKDTree(image_carts[position_indices])
+        if search_radius >= cutoff_radius:
+            break
+        nearest_max_dists = get_nearest_max_dists(
+            position_tree,
+            unit.fractional_to_cartesian_array(unitcell_coords, cell_matrix),
+            neighbor_count,
+            search_radius,
+        )
+        if np.isfinite(nearest_max_dists).all():
+            break
+        search_radius = min(2 * search_radius, cutoff_radius)
+
+    all_labels_connections = {}
+    for site_label in labels:
+        ref_coords = unitcell_coords[unitcell_labels == site_label]
+        if per_orbit:
+            ref_coords = ref_coords[:1]
+        ref_carts = unit.fractional_to_cartesian_array(ref_coords, cell_matrix)
+        ref_carts_rounded = np.round(ref_carts, 3).tolist()
+
+        # Query up to the nearest neighbors and those tied with the last
+        max_dists = np.full(len(ref_carts), np.inf)
+        if neighbor_count is not None:
+            max_dists = get_nearest_max_dists(
+                position_tree, ref_carts, neighbor_count, search_radius
+            )
+
+        dist_dict = {}
+        dist_set = set()
+        neighbor_indices = tree.query_ball_point(
+            ref_carts,
+            r=np.minimum(max_dists + 0.001, cutoff_radius),
+            return_sorted=True,
+        )
+        for i, indices in enumerate(neighbor_indices):
+            indices = np.asarray(indices, dtype=int)
+            dists = np.round(
+                np.linalg.norm(image_carts[indices] - ref_carts[i], axis=1),
+                3,
             )
+            # Rank the points on the distances to the others, as the
+            # supercell search does
+            dist_set.update(dists[dists > 0.1].tolist())
 
-            # Calculate the dist between two points
-            dist = distance.calc_dist_two_cart_points(cart_1, cart_2)
-            dist = float(np.round(dist, 3))
-
-            # Check the dist
-            if dist < cutoff_radius and dist > 0.1:
-                point_2_info.append(
-                    (
-                        point_2[3],  # site label
-                        dist,
-                        [
-                            float(np.round(cart_1[0], 3)),  # x
-                            float(np.round(cart_1[1], 3)),  # y
-                            float(np.round(cart_1[2], 3)),  # z
-                        ],
-                        [
-                            float(np.round(cart_2[0], 3)),  # x
-                            float(np.round(cart_2[1], 3)),  # y
-                            float(np.round(cart_2[2], 3)),  # z
-                        ],
-                    )
+            # Skip the point itself and any point beyond the cutoff
+            is_neighbor = (
+                (dists < cutoff_radius)
+                & (dists > 0.1)
+                & (dists <= max_dists[i])
+            )
+            indices = indices[is_neighbor]
+            if indices.size == 0:
+                continue
+            dist_dict[i] = [
+                (label, dist, list(ref_carts_rounded[i]), cart_2)
+                for label, dist, cart_2 in zip(
+                    image_labels[indices].tolist(),
+                    dists[is_neighbor].tolist(),
+                    image_carts_rounded[indices].tolist(),
                 )
-            dist_set.add(dist)
-        # Store the list in the dictionary with `i` as the key
-        if point_2_info:
-            dist_dict[i] = point_2_info
+            ]
 
-    return dist_dict, dist_set
+        (
+            label,
+            connections,
+        ) = get_most_connected_point_per_site(site_label, dist_dict, dist_set)
+
+        all_labels_connections[label] = connections
+    all_labels_connections = remove_duplicate_connections(
+        all_labels_connections
+    )
+    if neighbor_count is not None:
+        return keep_nearest_connections(all_labels_connections, neighbor_count)
+    return all_labels_connections
+
+
+def get_density_radius(
+    atom_count: int, cell_matrix: np.ndarray, neighbor_count: int
+) -> float:
+    """
+    Return the radius of a sphere holding neighbor_count atoms at the
+    atomic density of the unit cell, with a margin for uneven packing.
+    """
+    volume = abs(np.linalg.det(cell_matrix))
+    sphere_volume = (neighbor_count + 1) * volume / max(atom_count, 1)
+    return 1.5 * float((3 * sphere_volume / (4 * np.pi)) ** (1 / 3))
+
+
+def get_nearest_max_dists(
+    tree: cKDTree,
+    ref_carts: np.ndarray,
+    neighbor_count: int,
+    search_radius: float,
+) -> np.ndarray:
+    """
+    Return the rounded distance from each reference point to its
+    neighbor_count-th nearest neighbor, or inf if there are fewer within
+    the search radius. The reference point itself is skipped.
+    """
+    dists, _ = tree.query(
+        ref_carts,
+        k=neighbor_count + 1,
+        distance_upper_bound=search_radius,
+    )
+    return np.round(dists.reshape(len(ref_carts), -1)[:, -1], 3)
+
+
+def get_periodic_image_points(
+    unitcell_coords: np.ndarray,
+    unitcell_labels: np.ndarray,
+    cell_matrix: np.ndarray,
+    cutoff_radius: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the unique periodic images of the unit cell points that can be
+    within the cutoff radius of any unit cell point.
+    """
+    # Wrap the points into [0, 1) and remove the translation duplicates
+    wrapped_coords = np.round(unitcell_coords - np.floor(unitcell_coords), 5)
+    wrapped_coords[wrapped_coords >= 1.0] = 0.0
+    _, unique_indices = np.unique(
+        np.column_stack(
+            [
+                wrapped_coords,
+                np.unique(unitcell_labels, return_inverse=True)[1],
+            ]
+        ),
+        axis=0,
+        return_index=True,
+    )
+    unique_indices = np.sort(unique_indices)
+    base_coords = wrapped_coords[unique_indices]
+    base_labels = unitcell_labels[unique_indices]
+
+    # Fractional reach of the cutoff along each axis, 1 / d_hkl * cutoff
+    reach = cutoff_radius * np.linalg.norm(np.linalg.inv(cell_matrix), axis=1)
+    shift_min = np.floor(unitcell_coords.min(axis=0) - 1.0 - reach)
+    shift_max = np.ceil(unitcell_coords.max(axis=0) + reach)
+    shifts = np.stack(
+        np.meshgrid(
+            *[
+                np.arange(low, high + 1)
+                for low, high in zip(shift_min, shift_max)
+            ],
+            indexing="ij",
+        ),
+        axis=-1,
+    ).reshape(-1, 3)
+
+    image_coords = (base_coords[None, :, :] + shifts[:, None, :]).reshape(
+        -1, 3
+    )
+    image_labels = np.tile(base_labels, len(shifts))
+
+    # Keep the images inside the box reachable from the unit cell points
+    is_reachable = np.all(
+        (image_coords >= unitcell_coords.min(axis=0) - reach)
+        & (image_coords <= unitcell_coords.max(axis=0) + reach),
+        axis=1,
+    )
+    return image_coords[is_reachable], image_labels[is_reachable]
 
 
 def get_most_connected_point_per_site(
@@ -140,8 +529,31 @@ def get_most_connected_point_per_site(
         ]
 
 
+def keep_nearest_connections(connections: dict, neighbor_count: int) -> dict:
+    """
+    Keep the first neighbor_count connections of each site, sorted by
+    distance, and the following ones tied with the last kept distance.
+    """
+    nearest_connections = {}
+    for label, label_connections in connections.items():
+        if len(label_connections) <= neighbor_count:
+            nearest_connections[label] = label_connections
+            continue
+        max_dist = label_connections[neighbor_count - 1][1]
+        nearest_connections[label] = [
+            connection
+            for connection in label_connections
+            if connection[1] <= max_dist
+        ]
+    return nearest_connections
+
+
 def remove_duplicate_connections(connections):
-    """Remove duplicate connections based on the last set of coordinates."""
+    """
+    Remove duplicate connections based on the last set of coordinates.
+    Of the sites sharing a position, the first in the atom site loop is
+    kept, as the points are sorted by site label index.
+    """
     unique_connections = {}
     for key, value in connections.items():
         seen = set()
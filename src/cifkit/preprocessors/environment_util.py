@@ -1,24 +1,32 @@
 import numpy as np
 
-from cifkit.utils.string_parser import get_atom_type_from_label
+from cifkit.models.neighbor_list import NeighborList
+from cifkit.utils.label_encoding import LabelEncoding
 
 
 def flat_site_connections(
     site_connections: dict,
+    label_encoding: LabelEncoding | None = None,
 ):
     """
     Transform site connections into a sorted list of tuples,
     each containing a pair of alphabetically distance.
     """
+    if label_encoding is None:
+        label_encoding = LabelEncoding.from_connections(site_connections)
+    if isinstance(site_connections, NeighborList):
+        return flat_neighbor_list(site_connections, label_encoding)
+    label_ids = label_encoding.label_ids
+    label_pairs = label_encoding.get_label_pairs()
+
     flattened_points = []
     for site_label, connections in site_connections.items():
+        # Element pairs sorted alphabetically, by connected label id
+        site_label_pairs = label_pairs[label_ids[site_label]]
         for connection in connections:
             other_site_label = connection[0]
             distance = connection[1]
-            site_element = get_atom_type_from_label(site_label)
-            other_site_element = get_atom_type_from_label(other_site_label)
-            # Sort the site label and other site label alphabetically
-            bond_pair = tuple(sorted((site_element, other_site_element)))
+            bond_pair = site_label_pairs[label_ids[other_site_label]]
             flattened_points.append((bond_pair, distance))
 
     # Sort primarily by distance, secondarily by element pair
@@ -26,6 +34,34 @@ def flat_site_connections(
     return flattened_points
 
 
+def flat_neighbor_list(
+    neighbor_list: NeighborList, label_encoding: LabelEncoding
+):
+    """
+    Flatten the neighbor list in the order of `flat_site_connections`,
+    sorted on the arrays of distances and element pair ids.
+    """
+    site_ids, neighbor_ids = neighbor_list.get_encoded_label_ids(
+        label_encoding.label_ids
+    )
+    element_ids = label_encoding.label_element_ids
+    # Elements are sorted alphabetically, so the ids order the pairs
+    pair_ids = label_encoding.alphabetical_pair_ids[
+        element_ids[site_ids], element_ids[neighbor_ids]
+    ]
+    # Stable sort by distance, then by element pair
+    order = np.lexsort(
+        (pair_ids[:, 1], pair_ids[:, 0], neighbor_list.distances)
+    )
+    elements = label_encoding.elements
+    return [
+        ((elements[first_id], elements[second_id]), distance)
+        for (first_id, second_id), distance in zip(
+            pair_ids[order].tolist(), neighbor_list.distances[order].tolist()
+        )
+    ]
+
+
 def calculate_normalized_distances(connections):
     """
     Calculate normalized distances for each connection
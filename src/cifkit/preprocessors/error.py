@@ -1,8 +1,10 @@
 import os
+from functools import partial
 from pathlib import Path
 
 from cifkit.models.cif import Cif
-from cifkit.utils.cif_parser import check_unique_atom_site_labels
+from cifkit.utils.cif_parser import check_unique_atom_site_labels_from_block
+from cifkit.utils.parallel import map_in_order
 
 
 def make_directory_and_move(file_path, dir_path, new_file_path):
@@ -14,7 +16,62 @@ def make_directory_and_move(file_path, dir_path, new_file_path):
     os.rename(file_path, new_file_path)
 
 
-def move_files_based_on_errors(dir_path, file_paths):
+def get_error_type(error_message: str) -> str:
+    """
+    Return the error folder name based on the error message.
+    """
+    # Example of handling specific errors, adjust as needed
+    if "symmetry operation" in error_message:
+        return "error_operations"
+    elif "contains duplicate atom site labels" in error_message:
+        return "error_duplicate_labels"
+    elif "Wrong number of values in loop" in error_message:
+        return "error_wrong_loop_value"
+    elif "missing atomic coordinates" in error_message:
+        return "error_coords"
+    elif "element was not correctly parsed" in error_message:
+        return "error_invalid_label"
+    else:
+        return "error_others"
+
+
+def get_cif_and_error_message(
+    file_path: str, logging_enabled=False
+) -> tuple[Cif | None, str | None]:
+    """
+    Return the Cif object if the file is valid, otherwise the error message
+    raised while initializing it.
+    """
+    try:
+        cif = Cif(
+            file_path, is_formatted=True, logging_enabled=logging_enabled
+        )
+        # Check the labels on the block parsed by the Cif object
+        check_unique_atom_site_labels_from_block(cif._block)
+        # Generate the unit cell to catch symmetry operation errors, the
+        # supercell is only shifted from it when needed
+        cif.unitcell_point_array
+    except Exception as e:
+        return None, str(e)
+    return cif, None
+
+
+def get_file_error_message(file_path: str) -> str | None:
+    """
+    Return the error message raised while initializing the Cif object,
+    or None if the file is valid.
+    """
+    return get_cif_and_error_message(file_path)[1]
+
+
+def move_files_based_on_errors(
+    dir_path, file_paths, n_workers=1, logging_enabled=False
+) -> dict[str, Cif]:
+    """
+    Move the files that fail to initialize into error folders and return
+    the Cif objects of the valid files by file path, so they do not have to
+    be initialized again.
+    """
     print(f"\nCIF Preprocessing in {dir_path} begun...\n")
 
     # Ensure dir_path is a Path object
@@ -33,40 +90,35 @@ def move_files_based_on_errors(dir_path, file_paths):
     # Ensure all direct
     num_files_moved = {key: 0 for key in error_directories.keys()}
 
-    for i, file_path in enumerate(file_paths, start=1):
+    # Validate files across workers, errors are collected per file
+    results = map_in_order(
+        partial(get_cif_and_error_message, logging_enabled=logging_enabled),
+        file_paths,
+        n_workers,
+    )
+
+    valid_cifs = {}
+    for i, (file_path, (cif, error_message)) in enumerate(
+        zip(file_paths, results), start=1
+    ):
         filename = os.path.basename(file_path)
         print(f"Preprocessing {file_path} ({i}/{len(file_paths)})")
-        try:
-            # Check the label before instantiating the Cif object to save time
-            check_unique_atom_site_labels(file_path)
-            # Instantiate the Cif object fully
-            Cif(file_path, is_formatted=True)
-        except Exception as e:
-            error_message = str(e)
-            # Example of handling specific errors, adjust as needed
-            if "symmetry operation" in error_message:
-                error_type = "error_operations"
-            elif "contains duplicate atom site labels" in error_message:
-                error_type = "error_duplicate_labels"
-            elif "Wrong number of values in loop" in error_message:
-                error_type = "error_wrong_loop_value"
-            elif "missing atomic coordinates" in error_message:
-                error_type = "error_coords"
-            elif "element was not correctly parsed" in error_message:
-                error_type = "error_invalid_label"
-            else:
-                error_type = "error_others"
-
-            make_directory_and_move(
-                file_path, error_directories[error_type], filename
-            )
-            num_files_moved[error_type] += 1
-            print(
-                f"File {filename} moved to '{error_type}' due to: {error_message}"
-            )
+        if error_message is None:
+            valid_cifs[file_path] = cif
+            continue
+
+        error_type = get_error_type(error_message)
+        make_directory_and_move(
+            file_path, error_directories[error_type], filename
+        )
+        num_files_moved[error_type] += 1
+        print(
+            f"File {filename} moved to '{error_type}' due to: {error_message}"
+        )
 
     # Display the number of files moved to each folder
     print("\nSUMMARY")
     for error_type, count in num_files_moved.items():
         print(f"# of files moved to '{error_type}' folder: {count}")
     print()
+    return valid_cifs
@@ -8,14 +8,35 @@ def preprocess_label_element_loop_values(file_path: str) -> None:
     have two elements provided such as "In1,Co3B". Each case is handled
     with specific examples demonstrated in the source and test code.
     """
+    original_lines = cif_parser.get_file_lines(file_path)
+    cif_block = cif_parser.get_cif_block_from_lines(original_lines, file_path)
+    modified_lines = preprocess_label_element_loop_values_from_lines(
+        original_lines, cif_block
+    )
+
+    # Write the modified content back to the file
+    if modified_lines != original_lines:
+        with open(file_path, "w") as f:
+            f.writelines(modified_lines)
+
+
+def preprocess_label_element_loop_values_from_lines(
+    lines: list[str], cif_block=None
+) -> list[str]:
+    """
+    Return the lines of a .cif file with the atomic site labels modified.
+    The parsed block of the same lines may be provided to avoid parsing
+    the content again.
+    """
     is_cif_file_updated = False
-    cif_block = cif_parser.get_cif_block(file_path)
+    if cif_block is None:
+        cif_block = cif_parser.get_cif_block_from_lines(lines)
     loop_values = cif_parser.get_loop_values(cif_block)
 
     # Get lines in _atom_site_occupancy only
     modified_lines = []
-    content_lines = cif_parser.get_line_content_from_tag(
-        file_path, "_atom_site_occupancy"
+    content_lines = cif_parser.get_line_content_from_lines(
+        lines, "_atom_site_occupancy"
     )
 
     for line in content_lines:
@@ -229,19 +250,16 @@ def preprocess_label_element_loop_values(file_path: str) -> None:
 
         modified_lines.append(line + "\n")
 
-    if is_cif_file_updated:
-        with open(file_path, "r") as f:
-            original_lines = f.readlines()
-
-        (
-            start_index,
-            end_index,
-        ) = cif_parser.get_start_end_line_indexes(
-            file_path, "_atom_site_occupancy"
-        )
-        # Replace the specific section in original_lines with modified_lines
-        original_lines[start_index:end_index] = modified_lines
+    if not is_cif_file_updated:
+        return lines
 
-        # Write the modified content back to the file
-        with open(file_path, "w") as f:
-            f.writelines(original_lines)
+    (
+        start_index,
+        end_index,
+    ) = cif_parser.get_start_end_line_indexes_from_lines(
+        lines, "_atom_site_occupancy"
+    )
+    # Replace the specific section in original_lines with modified_lines
+    original_lines = list(lines)
+    original_lines[start_index:end_index] = modified_lines
+    return original_lines
@@ -1,9 +1,17 @@
+from itertools import product
+
 import gemmi
 import numpy as np
 from gemmi.cif import Block
 
 from cifkit.utils import cif_parser
 
+# Supercell points as (x, y, z) fractional coordinates and the index of
+# the site label in the atom site loop
+POINT_DTYPE = np.dtype(
+    [("x", float), ("y", float), ("z", float), ("label", np.int32)]
+)
+
 
 def get_supercell_points(
     block,
@@ -12,24 +20,93 @@ def get_supercell_points(
     """
     Return supercell points
     """
-    supercell_points = []
     loop_values = cif_parser.get_loop_values(block)
+    point_array = get_supercell_point_array(block, supercell_generation_method)
+    return get_points_from_array(point_array, loop_values[0])
+
+
+def get_supercell_point_array(
+    block: Block,
+    supercell_generation_method: int,
+) -> np.ndarray:
+    """
+    Return the unique supercell points as a structured array of POINT_DTYPE.
+    """
+    return shift_point_array(
+        get_unitcell_point_array(block), supercell_generation_method
+    )
+
+
+def get_unitcell_point_array(block: Block) -> np.ndarray:
+    """
+    Return the unique unit cell points after symmetry operations as a
+    structured array of POINT_DTYPE.
+    """
     all_coords_list = get_unitcell_coords_for_all_labels(block)
+    if len(all_coords_list) == 0:
+        return np.empty(0, dtype=POINT_DTYPE)
+
+    coords = [flatten_original_coordinates(c) for c in all_coords_list]
+    label_indices = [
+        np.full(len(c), i, dtype=np.int32) for i, c in enumerate(coords)
+    ]
+    return get_unique_point_array(
+        np.concatenate(coords).reshape(-1, 3), np.concatenate(label_indices)
+    )
+
+
+def shift_point_array(
+    point_array: np.ndarray, supercell_generation_method: int
+) -> np.ndarray:
+    """
+    Shift and duplicate the points to create a supercell, in one broadcast
+    over all points.
+    """
+    shifts = get_supercell_shifts(supercell_generation_method)
+    coords = get_point_array_coordinates(point_array)
+    shifted_coords = coords[:, None, :] + shifts[None, :, :]
+    label_indices = np.repeat(point_array["label"], len(shifts))
+    return get_unique_point_array(
+        np.round(shifted_coords, 5).reshape(-1, 3), label_indices
+    )
 
-    # Get the total number of atoms in the unit cell
-    for i, all_coords in enumerate(all_coords_list):
-        points = flatten_original_coordinates(all_coords)
-        atom_site_label = loop_values[0][i]
 
-        supercell_points.extend(
-            shift_and_append_points(
-                points,
-                atom_site_label,
-                supercell_generation_method,
-            )
-        )
+def get_unique_point_array(
+    coords: np.ndarray, label_indices: np.ndarray
+) -> np.ndarray:
+    """
+    Return the structured array of unique points sorted by coordinates,
+    then by site label index. Sites sharing a position, as in mixed
+    occupancy, are kept in the order of the atom site loop.
+    """
+    point_array = np.empty(len(coords), dtype=POINT_DTYPE)
+    # Adding 0.0 turns -0.0 into 0.0 before removing duplicates
+    point_array["x"] = coords[:, 0] + 0.0
+    point_array["y"] = coords[:, 1] + 0.0
+    point_array["z"] = coords[:, 2] + 0.0
+    point_array["label"] = label_indices
+    return np.unique(point_array)
+
 
-    return list(set(supercell_points))
+def get_point_array_coordinates(point_array: np.ndarray) -> np.ndarray:
+    """
+    Return the (N, 3) fractional coordinates of the structured array.
+    """
+    return np.column_stack(
+        [point_array["x"], point_array["y"], point_array["z"]]
+    ).reshape(-1, 3)
+
+
+def get_points_from_array(
+    point_array: np.ndarray, site_labels: list[str]
+) -> list[tuple[float, float, float, str]]:
+    """
+    Convert the structured array to a list of (x, y, z, label) tuples.
+    """
+    return [
+        (x, y, z, site_labels[label])
+        for x, y, z, label in point_array.tolist()
+    ]
 
 
 def get_unitcell_coords_for_all_labels(
@@ -42,91 +119,132 @@ def get_unitcell_coords_for_all_labels(
 
     loop_values = cif_parser.get_loop_values(block)
     loop_length = len(loop_values[0])
-    coords_list = []
+    site_labels = []
+    site_coords = []
     for i in range(loop_length):
         (
             site_label,
             _,
             coordinates,
         ) = cif_parser.get_label_occupancy_coordinates(loop_values, i)
+        site_labels.append(site_label)
+        site_coords.append(coordinates)
 
-        coords_after_symmetry_operations = (
-            get_unitcell_coords_after_sym_operations_per_label(
-                block,
-                coordinates,
-                site_label,
-            )
-        )
-        coords_list.append(coords_after_symmetry_operations)
-    return coords_list
+    # Compile the symmetry operations once and apply them to all sites
+    rotations, translations = get_symmetry_operation_arrays(block)
+    new_coords = apply_symmetry_operations(
+        rotations, translations, np.array(site_coords).reshape(-1, 3)
+    )
+    return [
+        get_unique_points(coords, site_label)
+        for coords, site_label in zip(new_coords, site_labels)
+    ]
 
 
 # Function to find and return the appropriate loop for symmetry operations
 def find_symmetry_operations(block):
     # Try to find _space_group_symop_operation_xyz
+    for tag in [
+        "_space_group_symop_operation_xyz",
+        "_symmetry_equiv_pos_as_xyz",
+    ]:
+        symmetry_operations = block.find_loop(tag)
+        if symmetry_operations:
+            return symmetry_operations
+
+    raise ValueError("No symmetry operations found in the CIF file.")
+
+
+def get_symmetry_operation_arrays(
+    block: Block,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the symmetry operations of the block once into stacked rotation
+    matrices (n, 3, 3) and translation vectors (n, 3), both scaled by
+    gemmi.Op.DEN.
+    """
+    rotations = []
+    translations = []
+    for operation in find_symmetry_operations(block):
+        operation = operation.replace("'", "")
+        try:
+            op = gemmi.Op(operation)
+        except RuntimeError as e:
+            print(f"Skipping operation '{operation}': {str(e)}")
+            continue
+        rotations.append(op.rot)
+        translations.append(op.tran)
+
+    return (
+        np.array(rotations, dtype=float).reshape(-1, 3, 3),
+        np.array(translations, dtype=float).reshape(-1, 3),
+    )
 
-    if block.find_loop("_space_group_symop_operation_xyz"):
-        return block.find_loop("_space_group_symop_operation_xyz")
-    elif block.find_loop("_symmetry_equiv_pos_as_xyz"):
-        return block.find_loop("_symmetry_equiv_pos_as_xyz")
-    else:
-        raise ValueError("No symmetry operations found in the CIF file.")
+
+def apply_symmetry_operations(
+    rotations: np.ndarray,
+    translations: np.ndarray,
+    fractional_coords: np.ndarray,
+) -> np.ndarray:
+    """
+    Apply all symmetry operations to the fractional coordinates at once.
+    Return an (n_ops, 3) array for a single point or (n_points, n_ops, 3)
+    for an (n_points, 3) array.
+    """
+    coords = np.asarray(fractional_coords, dtype=float)[..., None, None, :]
+    # Same order of operations as gemmi.Op.apply_to_xyz
+    return (
+        rotations[:, :, 0] * coords[..., 0]
+        + rotations[:, :, 1] * coords[..., 1]
+        + rotations[:, :, 2] * coords[..., 2]
+        + translations
+    ) / gemmi.Op.DEN
+
+
+def get_unique_points(
+    coords: np.ndarray, atom_site_label: str
+) -> list[tuple[float, float, float, str]]:
+    """
+    Round the coordinates and return the unique points with the label.
+    """
+    # Adding 0.0 turns -0.0 into 0.0 before removing duplicates
+    rounded_coords = (np.round(coords, 5) + 0.0).tolist()
+    return list(
+        dict.fromkeys((x, y, z, atom_site_label) for x, y, z in rounded_coords)
+    )
 
 
 def get_unitcell_coords_after_sym_operations_per_label(
     block: Block,
     atom_site_fracs: tuple[float, float, float],
     atom_site_label: str,
+    operations: tuple[np.ndarray, np.ndarray] | None = None,
 ) -> list[tuple[float, float, float, str]]:
     """
     Generate a list of coordinates for each atom
     site after applying symmetry operations.
     """
 
-    symmetry_operations = find_symmetry_operations(block)
-    if symmetry_operations is not None:
-        all_coords = set()
-        for operation in symmetry_operations:
-            operation = operation.replace("'", "")
-            try:
-                op = gemmi.Op(operation)
-                new_x, new_y, new_z = op.apply_to_xyz(
-                    [
-                        atom_site_fracs[0],
-                        atom_site_fracs[1],
-                        atom_site_fracs[2],
-                    ]
-                )
-
-                all_coords.add(
-                    (
-                        round(new_x, 5),
-                        round(new_y, 5),
-                        round(new_z, 5),
-                        atom_site_label,
-                    )
-                )
-
-            except RuntimeError as e:
-                print(f"Skipping operation '{operation}': {str(e)}")
-
-        return list(all_coords)
+    if operations is None:
+        operations = get_symmetry_operation_arrays(block)
+
+    rotations, translations = operations
+    new_coords = apply_symmetry_operations(
+        rotations, translations, atom_site_fracs
+    )
+    return get_unique_points(new_coords, atom_site_label)
 
 
 def flatten_original_coordinates(
     all_coords: list[tuple[float, float, float, str]],
 ):
     points = np.array([list(map(float, coord[:-1])) for coord in all_coords])
-    return points
+    return points.reshape(-1, 3)
 
 
-def shift_and_append_points(
-    points,
-    atom_site_label: str,
-    supercell_generation_method: int,
-):
+def get_supercell_shifts(supercell_generation_method: int) -> np.ndarray:
     """
-    Shift and duplicate points to create a supercell.
+    Return the cell shifts for the supercell generation method.
     """
 
     # Method 1 - No sfhits
@@ -134,75 +252,28 @@ def shift_and_append_points(
     # Method 3 - +-1 +-1 +-1 shifts
 
     if supercell_generation_method == 1:
-        shifts = np.array([[0, 0, 0]])
-        shifted_points = points[:, None, :] + shifts[None, :, :]
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-        return all_points
+        return np.array([[0, 0, 0]])
 
     if supercell_generation_method == 2:
-        shifts = np.array(
-            [
-                [0, 0, 0],
-                [1, 0, 0],
-                [0, 1, 0],
-                [0, 0, 1],
-                [1, 1, 0],
-                [1, 0, 1],
-                [0, 1, 1],
-                [1, 1, 1],
-            ]
-        )
-        shifted_points = points[:, None, :] + shifts[None, :, :]
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-
-        return all_points
+        return np.array(list(product([0, 1], repeat=3)))
 
     if supercell_generation_method == 3:
-        shifts = np.array(
-            [
-                [0, 0, 0],
-                [1, 0, 0],
-                [0, 1, 0],
-                [0, 0, 1],
-                [-1, 0, 0],
-                [0, -1, 0],
-                [0, 0, -1],
-                [1, 1, 0],
-                [1, -1, 0],
-                [-1, 1, 0],
-                [-1, -1, 0],
-                [1, 0, 1],
-                [1, 0, -1],
-                [0, 1, 1],
-                [0, 1, -1],
-                [-1, 0, 1],
-                [-1, 0, -1],
-                [0, -1, 1],
-                [0, -1, -1],
-                [1, 1, 1],
-                [1, 1, -1],
-                [1, -1, 1],
-                [1, -1, -1],
-                [-1, 1, 1],
-                [-1, 1, -1],
-                [-1, -1, 1],
-                [-1, -1, -1],
-            ]
-        )
-
-        shifted_points = points[:, None, :] + shifts[None, :, :]
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-
-        return all_points
+        return np.array(list(product([-1, 0, 1], repeat=3)))
+
+    raise ValueError("Supercell generation method must be 1, 2, or 3.")
+
+
+def shift_and_append_points(
+    points,
+    atom_site_label: str,
+    supercell_generation_method: int,
+):
+    """
+    Shift and duplicate points to create a supercell.
+    """
+    shifts = get_supercell_shifts(supercell_generation_method)
+    shifted_points = points[:, None, :] + shifts[None, :, :]
+    return [
+        (x, y, z, atom_site_label)
+        for x, y, z in np.round(shifted_points, 5).reshape(-1, 3).tolist()
+    ]
@@ -0,0 +1,114 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from cifkit.utils.cache import get_cifkit_version
+
+# Metrics compared against the baseline, by result key
+BENCHMARK_METRICS = ["min_time", "peak_memory"]
+
+
+def measure(
+    func: Callable, setup: Callable | None = None, repeat: int = 3
+) -> dict:
+    """
+    Time the function over repeated runs and trace its peak memory in one
+    more run, as tracing slows it down. With setup, it is called before
+    each run, untimed, and its result is passed to the function.
+    """
+    times = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    args = () if setup is None else (setup(),)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeat": repeat,
+        "times": times,
+        "min_time": min(times),
+        "median_time": statistics.median(times),
+        "peak_memory": peak_memory,
+    }
+
+
+def get_benchmark_metadata() -> dict:
+    """Return the versions and platform the benchmarks are run on."""
+    return {
+        "cifkit_version": get_cifkit_version(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save_benchmark_results(
+    file_path: str, benchmarks: dict[str, dict]
+) -> dict:
+    """Save the results by benchmark name with the metadata as JSON."""
+    results = {
+        "metadata": get_benchmark_metadata(),
+        "benchmarks": benchmarks,
+    }
+    with open(file_path, "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def load_benchmark_results(file_path: str) -> dict[str, dict]:
+    """Return the results by benchmark name saved in the JSON file."""
+    with open(file_path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def compare_benchmark_results(
+    benchmarks: dict[str, dict],
+    baseline: dict[str, dict],
+    time_tolerance=0.2,
+    memory_tolerance=0.2,
+    min_time_delta=0.001,
+    min_memory_delta=65536,
+) -> list[dict]:
+    """
+    Return the regressions against the baseline, where a metric grows by
+    more than the tolerance as a fraction of the baseline value. Growth
+    below the minimum delta, in seconds or bytes, is taken as noise.
+    Benchmarks missing from either results are skipped.
+    """
+    thresholds = {
+        "min_time": (time_tolerance, min_time_delta),
+        "peak_memory": (memory_tolerance, min_memory_delta),
+    }
+    regressions = []
+    for name, result in benchmarks.items():
+        if name not in baseline:
+            continue
+        for metric in BENCHMARK_METRICS:
+            baseline_value = baseline[name].get(metric)
+            value = result.get(metric)
+            if not baseline_value or value is None:
+                continue
+            tolerance, min_delta = thresholds[metric]
+            ratio = value / baseline_value
+            if ratio > 1 + tolerance and value - baseline_value > min_delta:
+                regressions.append(
+                    {
+                        "name": name,
+                        "metric": metric,
+                        "baseline": baseline_value,
+                        "value": value,
+                        "ratio": round(ratio, 3),
+                    }
+                )
+    return regressions
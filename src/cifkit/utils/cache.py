@@ -0,0 +1,115 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+
+
+def get_cifkit_version() -> str:
+    """
+    Return the installed cifkit version, or "unknown" if not installed.
+    """
+    try:
+        return version("cifkit")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def get_source_hash() -> str:
+    """
+    Return the SHA-256 hash of the cifkit source files, which changes with
+    the code even where the installed version does not.
+    """
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sha = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(package_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py"):
+                continue
+            file_path = os.path.join(dir_path, file_name)
+            sha.update(os.path.relpath(file_path, package_dir).encode())
+            with open(file_path, "rb") as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def get_content_hash(lines: list[str]) -> str:
+    """
+    Return the SHA-256 hash of the .cif content.
+    """
+    content = "".join(lines).encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_cache_key(
+    content_hash: str,
+    cutoff_radius: float,
+    neighbor_search: str,
+    per_orbit=False,
+    neighbor_count: int | None = None,
+) -> str:
+    """
+    Return the cache key for the content, cifkit code and parameters used
+    to compute connections. The source hash keeps entries from being
+    reused after code changes in checkouts and editable installs, whose
+    version is unknown or unchanged.
+    """
+    key = ":".join(
+        [
+            content_hash,
+            get_cifkit_version(),
+            get_source_hash(),
+            repr(float(cutoff_radius)),
+            neighbor_search,
+            str(bool(per_orbit)),
+            str(neighbor_count),
+        ]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_cache_file_path(cache_dir: str, cache_key: str) -> str:
+    """
+    Return the cache file path, sharded by the first two characters of the
+    key to keep directories small.
+    """
+    return os.path.join(cache_dir, cache_key[:2], f"{cache_key}.pkl.z")
+
+
+def load_cached_results(cache_dir: str, cache_key: str) -> dict | None:
+    """
+    Return the cached results, or None if missing or unreadable.
+    """
+    file_path = get_cache_file_path(cache_dir, cache_key)
+    try:
+        with open(file_path, "rb") as f:
+            return pickle.loads(zlib.decompress(f.read()))
+    except Exception:
+        # Any load error is a cache miss: missing or corrupted entries, or
+        # entries of classes since renamed or moved, are recomputed and
+        # overwritten
+        return None
+
+
+def save_cached_results(cache_dir: str, cache_key: str, results: dict):
+    """
+    Save the results as compressed pickle. The file is written to a
+    temporary file first so concurrent readers never see partial files.
+    """
+    file_path = get_cache_file_path(cache_dir, cache_key)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    data = zlib.compress(
+        pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL), 1
+    )
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
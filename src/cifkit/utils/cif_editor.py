@@ -9,21 +9,29 @@ def remove_author_loop(file_path: str) -> None:
     caused by a wrongly formatted author block. This is a common issue in
     PCD files.
     """
+    original_lines = cif_parser.get_file_lines(file_path)
+    modified_lines = remove_author_loop_from_lines(original_lines)
+
+    with open(file_path, "w") as f:
+        f.writelines(modified_lines)
+
+
+def remove_author_loop_from_lines(lines: list[str]) -> list[str]:
+    """
+    Return the lines of a .cif file with the author section replaced by an
+    empty text field.
+    """
     (
         start_index,
         end_index,
-    ) = cif_parser.get_start_end_line_indexes(
-        file_path, "_publ_author_address"
+    ) = cif_parser.get_start_end_line_indexes_from_lines(
+        lines, "_publ_author_address"
     )
 
-    with open(file_path, "r") as f:
-        original_lines = f.readlines()
-
-        # Replace the specific section in original_lines with modified_lines
-        original_lines[start_index:end_index] = ["''\n", ";\n", ";\n"]
-
-    with open(file_path, "w") as f:
-        f.writelines(original_lines)
+    # Replace the specific section in original_lines with modified_lines
+    modified_lines = list(lines)
+    modified_lines[start_index:end_index] = ["''\n", ";\n", ";\n"]
+    return modified_lines
 
 
 def add_hashtag_in_first_line(file_path: str):
@@ -36,14 +44,24 @@ def add_hashtag_in_first_line(file_path: str):
         raise FileNotFoundError("File does not exist or is not a CIF file")
 
     # Read the contents of the file
-    with open(file_path, "r") as file:
-        lines = file.readlines()
+    lines = cif_parser.get_file_lines(file_path)
+    modified_lines = add_hashtag_in_first_line_from_lines(lines)
+
+    # Write the modified content back to the file
+    if modified_lines != lines:
+        with open(file_path, "w") as file:
+            file.writelines(modified_lines)
+
+
+def add_hashtag_in_first_line_from_lines(lines: list[str]) -> list[str]:
+    """
+    Return the lines of a .cif file with a # added before a leading (C).
+    """
+    modified_lines = list(lines)
 
     # Check if the first line starts with (C)
-    if lines and lines[0].startswith("(C)"):
+    if modified_lines and modified_lines[0].startswith("(C)"):
         # Modify the first line by adding a # right after (C)
-        lines[0] = lines[0].replace("(C)", "# (C)", 1)
+        modified_lines[0] = modified_lines[0].replace("(C)", "# (C)", 1)
 
-        # Write the modified content back to the file
-        with open(file_path, "w") as file:
-            file.writelines(lines)
+    return modified_lines
@@ -28,6 +28,36 @@ def get_cif_block(file_path: str) -> Block:
     return block
 
 
+def get_cif_block_from_lines(
+    lines: list[str], file_path: str = "string"
+) -> Block:
+    """
+    Return CIF block from the lines of a .cif file already in memory.
+    The file path replaces "string" at the start of parse errors, as
+    gemmi reports them for files.
+    """
+    try:
+        doc = gemmi.cif.read_string("".join(lines))
+    except ValueError as e:
+        message = str(e)
+        if message.startswith("string:"):
+            message = file_path + message[len("string") :]
+        raise ValueError(message) from None
+    block = doc.sole_block()
+
+    return block
+
+
+def get_file_lines(file_path: str) -> list[str]:
+    """
+    Return all lines of a .cif file.
+    """
+    with open(file_path, "r") as f:
+        lines = f.readlines()
+
+    return lines
+
+
 def get_unitcell_lengths(
     block: Block,
 ) -> list[float]:
@@ -181,10 +211,17 @@ def get_start_end_line_indexes(
     """
     Find the starting and ending indexes of the lines in atom_site_loop
     """
+    lines = get_file_lines(file_path)
+    return get_start_end_line_indexes_from_lines(lines, start_keyword)
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
 
+def get_start_end_line_indexes_from_lines(
+    lines: list[str], start_keyword: str
+) -> tuple[int, int]:
+    """
+    Find the starting and ending indexes of the lines in atom_site_loop
+    from the lines of a .cif file.
+    """
     start_index = 0
     end_index = 0
 
@@ -209,16 +246,24 @@ def get_line_content_from_tag(file_path: str, start_keyword: str) -> list[str]:
     This function only appropriate for PCD format for removing the author
     section.
     """
-    start_index, end_index = get_start_end_line_indexes(
-        file_path, start_keyword
+    lines = get_file_lines(file_path)
+    return get_line_content_from_lines(lines, start_keyword)
+
+
+def get_line_content_from_lines(
+    lines: list[str], start_keyword: str
+) -> list[str]:
+    """
+    Returns a list containing the content with starting keyword from the
+    lines of a .cif file.
+    """
+    start_index, end_index = get_start_end_line_indexes_from_lines(
+        lines, start_keyword
     )
 
     if start_index is None or end_index is None:
         return None
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-
     # Extract the content between start_index and end_index
     content_lines = lines[start_index:end_index]
 
@@ -294,30 +339,47 @@ def get_tag_from_third_line(file_path: str, db_source="PCD") -> str:
 
     with open(file_path, "r") as f:
         # Read first three lines
-        f.readline()  # First line
-        f.readline()  # Second line
-        third_line = f.readline().strip()  # Thrid line
-        third_line = third_line.replace(",", "")
+        lines = [f.readline() for _ in range(3)]
+
+    return get_tag_from_lines(lines, db_source)
+
+
+def get_tag_from_lines(lines: list[str], db_source="PCD") -> str:
+    """
+    Extract the tag from the third line of a .cif file
+    appropriate for PCD db source only.
+    """
+
+    if not db_source == "PCD":
+        return None
 
-        # Split based on '#' and filter out empty strings
-        third_line_parts = [
-            part.strip() for part in third_line.split("#") if part.strip()
-        ]
+    third_line = lines[2].strip() if len(lines) > 2 else ""  # Thrid line
+    third_line = third_line.replace(",", "")
 
-        formula_tag = third_line_parts[1]
-        parts = formula_tag.split()
+    # Split based on '#' and filter out empty strings
+    third_line_parts = [
+        part.strip() for part in third_line.split("#") if part.strip()
+    ]
+
+    formula_tag = third_line_parts[1]
+    parts = formula_tag.split()
 
-        # Return concatenated string of parts excluding the first one
-        if len(parts) > 1:
-            return "_".join(parts[1:])
-        else:
-            return ""
+    # Return concatenated string of parts excluding the first one
+    if len(parts) > 1:
+        return "_".join(parts[1:])
+    else:
+        return ""
 
 
 def parse_atom_site_occupancy_info(file_path: str) -> dict:
     """Parse atom site loop information including element, occupancy,
     fractional coordinates, multiplicity, and wyckoff symbol."""
     block = get_cif_block(file_path)
+    return parse_atom_site_occupancy_info_from_block(block)
+
+
+def parse_atom_site_occupancy_info_from_block(block: Block) -> dict:
+    """Parse atom site loop information from an already parsed block."""
     loop_vals = get_loop_values(block)
     label_count = len(loop_vals[0])
 
@@ -370,7 +432,11 @@ def parse_atom_site_occupancy_info(file_path: str) -> dict:
 def check_unique_atom_site_labels(file_path: str):
     """Check whether all parsed atom site labels are unique."""
     block = get_cif_block(file_path)
+    check_unique_atom_site_labels_from_block(block)
+
 
+def check_unique_atom_site_labels_from_block(block: Block):
+    """Check whether all atom site labels in the parsed block are unique."""
     loop_values = get_loop_values(block)
 
     # Check how many unique labels - use _atom_site_label of length 4
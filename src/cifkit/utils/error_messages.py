@@ -12,6 +12,25 @@ class GeneralError(Enum):
         "No matching element was parsed from the site label."
     )
     INVALID_CIF_BLOCK = "The CIF block should not be None."
+    INVALID_NEIGHBOR_SEARCH = (
+        "Unknown neighbor search '{neighbor_search}'. "
+        "Use 'supercell' or 'kdtree'."
+    )
+    INVALID_NEIGHBOR_COUNT = (
+        "The neighbor count must be a positive integer, got "
+        "{neighbor_count}."
+    )
+    MASK_ENSEMBLE_MISMATCH = (
+        "Only masks from the same ensemble can be combined."
+    )
+    EMPTY_SITE_CONNECTIONS = (
+        "No neighbors of {labels} within the cutoff radius " "{cutoff_radius}."
+    )
+    COMPACT_ENSEMBLE_CONNECTIONS = (
+        "{name} needs the connections, which compact records do not keep. "
+        "Initialize CifEnsemble with compact=False or convert the records "
+        "with CompactCif.to_cif()."
+    )
 
 
 class CifParserError(Enum):
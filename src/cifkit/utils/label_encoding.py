@@ -0,0 +1,110 @@
+from typing import Iterable
+
+import numpy as np
+
+from cifkit.data.mendeleeve_handler import MENDELEEV_NUMBERS
+from cifkit.models.neighbor_list import NeighborList
+from cifkit.utils.string_parser import get_atom_type_from_label
+
+
+def get_pair_index_matrix(element_ranks: np.ndarray) -> np.ndarray:
+    """
+    Return the (n, n, 2) matrix of element id pairs, each ordered by the
+    rank of the elements.
+    """
+    element_ids = np.arange(len(element_ranks))
+    first_ids, second_ids = np.meshgrid(
+        element_ids, element_ids, indexing="ij"
+    )
+    is_ordered = element_ranks[first_ids] <= element_ranks[second_ids]
+    return np.stack(
+        [
+            np.where(is_ordered, first_ids, second_ids),
+            np.where(is_ordered, second_ids, first_ids),
+        ],
+        axis=-1,
+    )
+
+
+class LabelEncoding:
+    """Integer ids of site labels and their elements. Each label is parsed
+    into its element once, and element pairs are ordered alphabetically or
+    by Mendeleev number from precomputed index matrices."""
+
+    def __init__(self, site_labels: Iterable[str]) -> None:
+        self.site_labels = list(dict.fromkeys(site_labels))
+        self.label_ids = {
+            label: label_id for label_id, label in enumerate(self.site_labels)
+        }
+        label_elements = [
+            get_atom_type_from_label(label) for label in self.site_labels
+        ]
+        self.elements = sorted(set(label_elements))
+        self.element_ids = {
+            element: element_id
+            for element_id, element in enumerate(self.elements)
+        }
+        self.label_element_ids = np.array(
+            [self.element_ids[element] for element in label_elements],
+            dtype=np.intp,
+        )
+
+        # Elements are sorted alphabetically, so ranks are the ids. Ties in
+        # Mendeleev numbers are ordered alphabetically.
+        mendeleev_order = sorted(
+            range(len(self.elements)),
+            key=lambda i: (MENDELEEV_NUMBERS.get(self.elements[i], 0), i),
+        )
+        mendeleev_ranks = np.empty(len(self.elements), dtype=np.intp)
+        mendeleev_ranks[mendeleev_order] = np.arange(len(self.elements))
+        self.alphabetical_pair_ids = get_pair_index_matrix(
+            np.arange(len(self.elements))
+        )
+        self.mendeleev_pair_ids = get_pair_index_matrix(mendeleev_ranks)
+        self._label_pairs: dict[bool, list[list[tuple[str, str]]]] = {}
+
+    @classmethod
+    def from_connections(cls, connections: dict) -> "LabelEncoding":
+        """Encode the labels of the sites and their connected sites."""
+        labels = list(connections)
+        if isinstance(connections, NeighborList):
+            return cls(labels + list(connections.labels))
+        for label_connections in connections.values():
+            labels.extend(connection[0] for connection in label_connections)
+        return cls(labels)
+
+    def get_element(self, label: str) -> str:
+        return self.elements[self.label_element_ids[self.label_ids[label]]]
+
+    def get_label_pairs(
+        self, sorted_by_mendeleev=False
+    ) -> list[list[tuple[str, str]]]:
+        """
+        Return the ordered element pair for each pair of label ids, such
+        that `pairs[label_ids[a]][label_ids[b]]` is the pair of a and b.
+        """
+        if sorted_by_mendeleev not in self._label_pairs:
+            pair_ids = (
+                self.mendeleev_pair_ids
+                if sorted_by_mendeleev
+                else self.alphabetical_pair_ids
+            )
+            label_pair_ids = pair_ids[
+                np.ix_(self.label_element_ids, self.label_element_ids)
+            ].tolist()
+            self._label_pairs[sorted_by_mendeleev] = [
+                [
+                    (self.elements[first_id], self.elements[second_id])
+                    for first_id, second_id in row
+                ]
+                for row in label_pair_ids
+            ]
+        return self._label_pairs[sorted_by_mendeleev]
+
+    def get_element_pair(
+        self, label: str, other_label: str, sorted_by_mendeleev=False
+    ) -> tuple[str, str]:
+        """Return the ordered element pair of the two labels."""
+        return self.get_label_pairs(sorted_by_mendeleev)[
+            self.label_ids[label]
+        ][self.label_ids[other_label]]
@@ -3,9 +3,13 @@ from enum import Enum
 
 class CifLog(Enum):
     PREPROCESSING = "Preprocessing {file_path}"
-    LOADING_DATA = "Parsing .cif and generating supercell for {file_name}"
+    LOADING_DATA = "Parsing .cif for {file_name}"
+    GENERATE_UNITCELL = "Generating unit cell for {file_name}"
+    GENERATE_SUPERCELL = "Generating supercell for {file_name}"
     COMPUTE_CONNECTIONS = "Computing pair distances for {file_name}"
+    LOAD_CACHED_CONNECTIONS = "Loading cached pair distances for {file_name}"
 
 
 class CifEnsembleLog(Enum):
     PREPROCESSING = "Preprocessing {dir_path}"
+    COMPUTE_CONNECTIONS = "Computing pair distances for {dir_path}"
@@ -0,0 +1,45 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+
+def map_in_order(func, items: list, n_workers: int = 1) -> list:
+    """
+    Apply a function to each item and return the results in the input
+    order. With more than one worker, the items are distributed across a
+    process pool, so the function and items must be picklable.
+    """
+    if n_workers is None or n_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    chunk_size = max(1, len(items) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(func, items, chunksize=chunk_size))
+
+
+def imap_in_order(
+    func, items: Iterable, n_workers: int = 1, prefetch: int | None = None
+) -> Iterator:
+    """
+    Lazily apply a function to each item and yield the results in the input
+    order. With more than one worker, at most `prefetch` items, twice the
+    number of workers by default, are processed ahead of the consumer.
+    """
+    if n_workers is None or n_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    prefetch = max(1, prefetch or 2 * n_workers)
+    executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        futures = deque()
+        for item in items:
+            futures.append(executor.submit(func, item))
+            if len(futures) >= prefetch:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        # Stop pending work if the consumer stops early
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -16,13 +16,26 @@ def round_float(distance: float, precision: int = 3) -> float:
     return round(distance, precision)
 
 
-def fractional_to_cartesian(
-    fractional_coords: list[float],
+def round_array(values: np.ndarray, precision: int = 3) -> np.ndarray:
+    """
+    Round each value to the same float as Python's round. Values scaled
+    close to a half, where np.round may differ, are rounded by Python.
+    """
+    values = np.asarray(values, dtype=float)
+    scaled_values = values * 10.0**precision
+    rounded_values = np.rint(scaled_values) / 10.0**precision
+    fractions = scaled_values - np.floor(scaled_values)
+    for i in zip(*np.nonzero(np.abs(fractions - 0.5) < 1e-6)):
+        rounded_values[i] = round(float(values[i]), precision)
+    return rounded_values
+
+
+def get_cell_matrix(
     cell_lengths: list[float],
     cell_angles_rad: list[float],
-) -> list[float]:
+) -> np.ndarray:
     """
-    Convert fractional coordinates to Cartesian
+    Return the 3x3 transformation matrix from fractional to Cartesian
     coordinates using cell lengths and angles.
     """
     alpha, beta, gamma = cell_angles_rad
@@ -61,11 +74,36 @@ def fractional_to_cartesian(
         ]
     )
 
+    return matrix
+
+
+def fractional_to_cartesian(
+    fractional_coords: list[float],
+    cell_lengths: list[float],
+    cell_angles_rad: list[float],
+) -> list[float]:
+    """
+    Convert fractional coordinates to Cartesian
+    coordinates using cell lengths and angles.
+    """
+    matrix = get_cell_matrix(cell_lengths, cell_angles_rad)
     cartesian_coords = np.dot(matrix, fractional_coords).flatten()
 
     return cartesian_coords
 
 
+def fractional_to_cartesian_array(
+    fractional_coords: np.ndarray,
+    cell_matrix: np.ndarray,
+) -> np.ndarray:
+    """
+    Convert an (N, 3) array of fractional coordinates to Cartesian
+    coordinates with a single matrix multiplication.
+    """
+    fractional_coords = np.asarray(fractional_coords, dtype=float)
+    return fractional_coords.reshape(-1, 3) @ cell_matrix.T
+
+
 def round_dict_values(dict, precision=3):
     if dict is None:
         return None
@@ -1,9 +1,12 @@
 import pytest
 
 from cifkit.coordination.filter import (
+    compute_candidate_polyhedron_metrics,
     find_best_polyhedron,
     get_CN_connections_by_min_dist_method,
+    get_polyhedron_point_count,
 )
+from cifkit.models.neighbor_list import NeighborList
 
 
 @pytest.mark.fast
@@ -56,3 +59,44 @@ def test_get_CN_connections_by_dist_min_method(
     assert len(CN_connections["Rh1"]) == 9
     assert len(CN_connections["Rh2"]) == 9
     assert len(CN_connections["U1"]) == 11
+
+
+@pytest.mark.fast
+def test_compute_candidate_polyhedron_metrics(
+    max_gaps_per_label_URhIn, connections_URhIn
+):
+    metrics_per_label = compute_candidate_polyhedron_metrics(
+        max_gaps_per_label_URhIn, connections_URhIn
+    )
+    best_polyhedrons = find_best_polyhedron(
+        max_gaps_per_label_URhIn, connections_URhIn
+    )
+    for label, CN_data_per_method in max_gaps_per_label_URhIn.items():
+        # One polyhedron per distinct CN
+        assert set(metrics_per_label[label]) == {
+            CN_data["CN"] for CN_data in CN_data_per_method.values()
+        }
+        best_polyhedron = dict(best_polyhedrons[label])
+        method_used = best_polyhedron.pop("method_used")
+        CN = CN_data_per_method[method_used]["CN"]
+        assert metrics_per_label[label][CN] == best_polyhedron
+
+
+@pytest.mark.fast
+def test_find_best_polyhedron_neighbor_list(
+    monkeypatch, max_gaps_per_label_URhIn, connections_URhIn
+):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    assert get_polyhedron_point_count(neighbor_list, "U1", 3) == 3
+    assert get_polyhedron_point_count(neighbor_list, "U1", 10**6) == len(
+        connections_URhIn["U1"]
+    )
+
+    # The point counts are read without building the connections
+    def fail(self, label):
+        raise AssertionError("Connections built")
+
+    monkeypatch.setattr(NeighborList, "__getitem__", fail)
+    assert find_best_polyhedron(
+        max_gaps_per_label_URhIn, neighbor_list
+    ) == find_best_polyhedron(max_gaps_per_label_URhIn, connections_URhIn)
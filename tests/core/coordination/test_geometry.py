@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 from scipy.spatial import ConvexHull
 
 from cifkit.coordination.geometry import (
     compute_polyhedron_metrics,
+    get_hull_edges,
     get_polyhedron_coordinates_labels,
 )
 
@@ -69,3 +71,17 @@ def test_compute_polyhedron_metrics():
         "volume_of_inscribed_sphere": 34.961,
         "packing_efficiency": 0.577,
     }
+
+
+@pytest.mark.fast
+def test_get_hull_edges():
+    # Tetrahedron with faces in both orientations
+    simplices = np.array([[0, 1, 2], [0, 3, 1], [1, 3, 2], [2, 3, 0]])
+    assert get_hull_edges(simplices).tolist() == [
+        [0, 1],
+        [0, 2],
+        [0, 3],
+        [1, 2],
+        [1, 3],
+        [2, 3],
+    ]
@@ -1,6 +1,10 @@
 import pytest
 
-from cifkit.coordination.method import compute_CN_max_gap_per_site
+from cifkit.coordination.method import (
+    compute_CN_max_gap_per_site,
+    get_neighbor_matrices,
+)
+from cifkit.utils.label_encoding import LabelEncoding
 
 
 @pytest.mark.fast
@@ -43,3 +47,32 @@ def test_compute_CN_max_gap_per_site_dist_min_method_only(
         "Rh1": {"dist_by_shortest_dist": {"max_gap": 0.315, "CN": 9}},
         "Rh2": {"dist_by_shortest_dist": {"max_gap": 0.31, "CN": 9}},
     }
+
+
+@pytest.mark.fast
+def test_get_neighbor_matrices(connections_URhIn):
+    label_encoding = LabelEncoding.from_connections(connections_URhIn)
+    distances, connected_label_ids = get_neighbor_matrices(
+        connections_URhIn, label_encoding, 20
+    )
+    assert distances.shape == (4, 20)
+    for site_index, connection_data in enumerate(connections_URhIn.values()):
+        assert distances[site_index].tolist() == [
+            connection[1] for connection in connection_data[:20]
+        ]
+        assert [
+            label_encoding.site_labels[label_id]
+            for label_id in connected_label_ids[site_index]
+        ] == [connection[0] for connection in connection_data[:20]]
+
+
+@pytest.mark.fast
+def test_compute_CN_max_gap_per_site_few_neighbors():
+    connections = {
+        "In1": [("Rh1", 2.0, None, None), ("U1", 3.0, None, None)],
+        "U1": [("In1", 3.0, None, None)],
+    }
+    assert compute_CN_max_gap_per_site(None, connections, False, "") == {
+        "In1": {"dist_by_shortest_dist": {"max_gap": 0.5, "CN": 1}},
+        "U1": {"dist_by_shortest_dist": {"max_gap": 0, "CN": -1}},
+    }
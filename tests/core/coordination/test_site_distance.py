@@ -4,12 +4,28 @@ from cifkit.coordination.site_distance import (
     get_shortest_distance,
     get_shortest_distance_per_site,
 )
+from cifkit.models.neighbor_list import NeighborList
 
 
 def test_get_shortest_distance(connections_URhIn):
     assert get_shortest_distance(connections_URhIn) == 2.697
 
 
+@pytest.mark.fast
+@pytest.mark.parametrize("empty_label", ["In1", "U1", "Rh2"])
+def test_get_shortest_distance_empty_site(connections_URhIn, empty_label):
+    # Sites without neighbors are skipped, also the first and last
+    neighbor_list = NeighborList.from_connections(
+        {**connections_URhIn, empty_label: []}
+    )
+    expected = min(
+        label_connections[0][1]
+        for label, label_connections in connections_URhIn.items()
+        if label != empty_label
+    )
+    assert get_shortest_distance(neighbor_list) == expected
+
+
 def test_get_shortest_distance_per_site(connections_URhIn):
     expected = {
         "In1": ("Rh2", 2.697),
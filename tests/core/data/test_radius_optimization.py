@@ -1,6 +1,13 @@
+import numpy as np
 import pytest
 
-from cifkit.data.radius_optimization import get_refined_CIF_radius
+from cifkit.data import radius_optimization
+from cifkit.data.radius_optimization import (
+    get_refined_CIF_radii,
+    get_refined_CIF_radius,
+    objective,
+    solve_refined_radii,
+)
 
 
 def test_optimization(cif_URhIn):
@@ -20,3 +27,69 @@ def test_optimization(cif_URhIn):
     )
     expected_radii = {"U": 1.6143, "Rh": 1.3687, "In": 1.3283}
     assert optimized_radii == pytest.approx(expected_radii, abs=1e-3, rel=1e-3)
+
+
+@pytest.mark.fast
+def test_solve_refined_radii():
+    original_radii = np.array([[1.624, 1.345, 1.377], [1.2, 1.3, 1.4]])
+    pair_distances = np.array([[2.697, 2.983], [2.4, 2.8]])
+    refined_radii = solve_refined_radii(original_radii, pair_distances)
+
+    # Constraints hold exactly
+    assert refined_radii[:, :-1] + refined_radii[:, 1:] == pytest.approx(
+        pair_distances, abs=1e-12
+    )
+    # Any other radii satisfying the constraints cost more
+    for radii, original in zip(refined_radii, original_radii):
+        for step in [-0.01, 0.01]:
+            other = radii + step * np.array([1, -1, 1])
+            assert objective(other, original) > objective(radii, original)
+
+
+@pytest.mark.fast
+def test_solve_refined_radii_single_element():
+    original_radii = np.array([[1.624]])
+    refined_radii = solve_refined_radii(original_radii, np.empty((1, 0)))
+    assert refined_radii.tolist() == [[1.624]]
+
+
+@pytest.mark.fast
+def test_get_refined_CIF_radii(cif_URhIn):
+    radius_optimization._REFINED_RADIUS_CACHE.clear()
+    shortest_distances = cif_URhIn.shortest_bond_pair_distance
+    element_systems = [["U", "Rh", "In"], ["In", "Rh"], ["In"]]
+    refined_radii = get_refined_CIF_radii(
+        element_systems, [shortest_distances] * 3
+    )
+    for elements, radii in zip(element_systems, refined_radii):
+        assert radii == get_refined_CIF_radius(elements, shortest_distances)
+    assert refined_radii[1]["In"] + refined_radii[1]["Rh"] == pytest.approx(
+        2.697
+    )
+    assert refined_radii[2] == {"In": 1.624}
+
+    # Memoized by elements and shortest distances
+    assert len(radius_optimization._REFINED_RADIUS_CACHE) == 3
+    get_refined_CIF_radii(element_systems, [shortest_distances] * 3)
+    assert len(radius_optimization._REFINED_RADIUS_CACHE) == 3
+
+
+@pytest.mark.fast
+def test_get_refined_CIF_radii_order_and_cache_size(cif_URhIn, monkeypatch):
+    radius_optimization._REFINED_RADIUS_CACHE.clear()
+    monkeypatch.setattr(radius_optimization, "REFINED_RADIUS_CACHE_SIZE", 2)
+    shortest_distances = cif_URhIn.shortest_bond_pair_distance
+    element_systems = [["U", "Rh", "In"], ["Rh", "In"], ["In"]]
+    refined_radii = get_refined_CIF_radii(
+        element_systems, [shortest_distances] * 3
+    )
+
+    # Radii keep the order of the elements given
+    for elements, radii in zip(element_systems, refined_radii):
+        assert list(radii) == elements
+
+    # The least recently used radii are dropped beyond the size
+    assert len(radius_optimization._REFINED_RADIUS_CACHE) == 2
+    assert get_refined_CIF_radius(
+        ["U", "Rh", "In"], shortest_distances
+    ) == pytest.approx(refined_radii[0])
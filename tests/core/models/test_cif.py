@@ -1,5 +1,6 @@
 import logging
 import os
+import pickle
 import shutil
 
 import pytest
@@ -141,6 +142,208 @@ def test_lazy_loading(cif_URhIn):
     assert cif_URhIn.connections is not None
 
 
+@pytest.mark.fast
+def test_init_does_not_rewrite_formatted_file(tmpdir):
+    file_path = os.path.join(tmpdir, "URhIn.cif")
+    shutil.copy("tests/data/cif/URhIn.cif", file_path)
+    os.utime(file_path, (0, 0))
+    Cif(file_path)
+    assert os.path.getmtime(file_path) == 0
+
+
+@pytest.mark.fast
+def test_init_from_string(cif_URhIn):
+    with open("tests/data/cif/URhIn.cif", "r") as f:
+        content = f.read()
+    cif = Cif.from_string(content, file_path="URhIn.cif")
+    assert cif.file_name == "URhIn.cif"
+    assert cif.db_source == "PCD"
+    assert cif.tag == "rt"
+    assert cif.formula == cif_URhIn.formula
+    assert cif.site_labels == cif_URhIn.site_labels
+    assert cif.atom_site_info == cif_URhIn.atom_site_info
+    assert cif.supercell_atom_count == cif_URhIn.supercell_atom_count
+
+
+@pytest.mark.fast
+def test_init_from_bytes_without_writing():
+    file_path = "tests/data/cif/sources/ICSD/EntryWithCollCode43054.cif"
+    with open(file_path, "rb") as f:
+        content = f.read()
+    cif = Cif.from_bytes(content)
+    assert cif.file_path == "memory.cif"
+    assert cif.db_source == "ICSD"
+    assert cif.unitcell_lengths == [4.7, 4.7, 4.7]
+
+    # Preprocessing runs in memory only
+    with open(file_path, "rb") as f:
+        assert f.read() == content
+
+
+@pytest.mark.fast
+def test_lazy_supercell():
+    cif = Cif("tests/data/cif/URhIn.cif")
+    assert cif._unitcell_point_array is None
+    assert cif.formula == "URhIn"
+
+    # Generated on first access, the supercell only when needed
+    assert cif.unitcell_atom_count == 22
+    assert cif._supercell_point_array is None
+    assert cif.supercell_atom_count == 336
+    assert cif._supercell_point_array is not None
+    assert cif.unitcell_atom_count == 22
+    assert len(cif.supercell_points) == 336
+    assert set(cif.unitcell_points) <= set(cif.supercell_points)
+
+
+@pytest.mark.fast
+def test_compute_connections_with_cache(tmp_path, caplog):
+    cif = Cif("tests/data/cif/URhIn.cif")
+    cif.compute_connections(cache_dir=str(tmp_path))
+
+    # Loaded from the cache without computing the supercell
+    cached_cif = Cif("tests/data/cif/URhIn.cif", logging_enabled=True)
+    cached_cif.cache_dir = str(tmp_path)
+    with caplog.at_level(logging.INFO):
+        assert cached_cif.shortest_distance == 2.697
+        assert "Loading cached pair distances" in caplog.text
+    assert cached_cif._supercell_point_array is None
+    assert cached_cif.connections == cif.connections
+    assert cached_cif.CN_best_methods == cif.CN_best_methods
+    assert (
+        cached_cif.CN_bond_fractions_by_best_methods
+        == cif.CN_bond_fractions_by_best_methods
+    )
+
+    # A different cutoff radius is computed again
+    cached_cif.compute_connections(cutoff_radius=5.0)
+    assert "Computing pair distances" in caplog.text
+    assert len(list(tmp_path.glob("*/*.pkl.z"))) == 2
+
+
+@pytest.mark.fast
+def test_compute_connections_per_orbit(cif_URhIn):
+    cif = Cif("tests/data/cif/URhIn.cif")
+    cif.compute_connections(per_orbit=True)
+    assert cif.shortest_distance == cif_URhIn.shortest_distance
+    assert (
+        cif.CN_unique_values_by_best_methods
+        == cif_URhIn.CN_unique_values_by_best_methods
+    )
+    assert (
+        cif.CN_bond_count_by_best_methods
+        == cif_URhIn.CN_bond_count_by_best_methods
+    )
+
+
+@pytest.mark.fast
+def test_pickle_round_trip(cif_URhIn):
+    cif = pickle.loads(pickle.dumps(cif_URhIn))
+    assert cif.formula == "URhIn"
+    assert cif.site_labels == cif_URhIn.site_labels
+    assert cif.supercell_atom_count == cif_URhIn.supercell_atom_count
+    assert cif.shortest_distance == 2.697
+
+
+@pytest.mark.fast
+def test_compute_connections_kdtree():
+    cif = Cif("tests/data/cif/URhIn.cif")
+    cif.compute_connections(neighbor_search="kdtree")
+    assert cif.shortest_distance == 2.697
+    assert cif.CN_unique_values_by_min_dist_method == {9, 11, 14}
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("neighbor_search", ["supercell", "kdtree"])
+def test_compute_connections_co_located_sites(neighbor_search):
+    # Each In site shares its position with the Co site listed before it
+    cif = Cif("tests/data/cif/ErCoIn_test/1234749.cif")
+    cif.compute_connections(neighbor_search=neighbor_search)
+    for label in cif.connections:
+        neighbor_labels = cif.connections.get_neighbor_labels(label)
+        assert set(neighbor_labels) <= {"Co1A", "Co2A", "Co3A", "Er1", "Er2"}
+        # One neighbor per position
+        neighbor_coordinates = [
+            tuple(connection[3]) for connection in cif.connections[label]
+        ]
+        assert len(set(neighbor_coordinates)) == len(neighbor_coordinates)
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("neighbor_search", ["supercell", "kdtree"])
+def test_compute_connections_nearest_neighbors(cif_URhIn, neighbor_search):
+    cif = Cif("tests/data/cif/URhIn.cif")
+    cif.compute_connections(
+        neighbor_search=neighbor_search, neighbor_count=True
+    )
+    assert all(
+        20 <= len(connections) < len(cif_URhIn.connections[label])
+        for label, connections in cif.connections.items()
+    )
+    assert cif.shortest_distance == 2.697
+    assert (
+        cif.CN_unique_values_by_best_methods
+        == cif_URhIn.CN_unique_values_by_best_methods
+    )
+
+
+@pytest.mark.fast
+def test_compute_connections_sweep(cif_URhIn):
+    cif = Cif("tests/data/cif/URhIn.cif")
+    results = cif.compute_connections_sweep(
+        [4.0, 10.0], neighbor_search="kdtree"
+    )
+    assert list(results) == [4.0, 10.0]
+
+    expected_cif = Cif("tests/data/cif/URhIn.cif")
+    expected_cif.compute_connections(4.0, neighbor_search="kdtree")
+    assert results[4.0]["connections"] == expected_cif.connections
+    for name in [
+        "CN_best_methods",
+        "CN_bond_count_by_best_methods",
+        "CN_bond_fractions_by_best_methods",
+        "CN_unique_values_by_min_dist_method",
+    ]:
+        assert results[4.0][name] == getattr(expected_cif, name)
+
+    # The Cif object keeps the results of the largest radius
+    assert cif.connections is results[10.0]["connections"]
+    assert cif.CN_best_methods == results[10.0]["CN_best_methods"]
+    assert cif.CN_unique_values_by_min_dist_method == {9, 11, 14}
+
+
+@pytest.mark.fast
+def test_compute_connections_sweep_empty_site():
+    cif = Cif("tests/data/cif/URhIn.cif")
+    cif.compute_connections()
+    CN_best_methods = cif.CN_best_methods
+
+    # U1 has no neighbors within 2.9 Å
+    with pytest.raises(ValueError) as e:
+        cif.compute_connections_sweep([2.9, 10.0])
+    assert "No neighbors of U1 within the cutoff radius 2.9" in str(e.value)
+
+    # The results of the largest radius are kept
+    assert len(cif.connections["U1"]) > 0
+    assert cif.CN_best_methods == CN_best_methods
+    assert cif.shortest_distance == 2.697
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("neighbor_count", [0, 2.5])
+def test_compute_connections_invalid_neighbor_count(cif_URhIn, neighbor_count):
+    with pytest.raises(ValueError) as e:
+        cif_URhIn.compute_connections(neighbor_count=neighbor_count)
+    assert "The neighbor count must be a positive integer" in str(e.value)
+
+
+@pytest.mark.fast
+def test_compute_connections_invalid_neighbor_search(cif_URhIn):
+    with pytest.raises(ValueError) as e:
+        cif_URhIn.compute_connections(neighbor_search="unknown")
+    assert "Unknown neighbor search 'unknown'" in str(e.value)
+
+
 """
 Test log
 """
@@ -162,12 +365,11 @@ def test_init_with_log(caplog):
     with caplog.at_level(logging.INFO):
         cif = Cif(file_path, logging_enabled=True)
         assert "Preprocessing tests/data/cif/URhIn.cif" in caplog.text
-        assert (
-            "Parsing .cif and generating supercell for URhIn.cif"
-            in caplog.text
-        )
+        assert "Parsing .cif for URhIn.cif" in caplog.text
+        assert "Generating supercell for URhIn.cif" not in caplog.text
 
         cif.compute_connections()
+        assert "Generating supercell for URhIn.cif" in caplog.text
         assert "Computing pair distances for URhIn.cif" in caplog.text
 
 
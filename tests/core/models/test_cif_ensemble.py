@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from cifkit import CifEnsemble
+from cifkit import Cif, CifEnsemble
 from cifkit.utils.folder import get_file_count, get_file_paths
 
 
@@ -531,3 +531,125 @@ def test_init_without_preprocessing(
 
     with caplog.at_level(logging.INFO):
         assert "Preprocessing tests/data/cif/folder" not in caplog.text
+
+
+@pytest.mark.fast
+def test_init_with_workers(cif_ensemble_test: CifEnsemble):
+    ensemble = CifEnsemble(
+        "tests/data/cif/ensemble_test", preprocess=False, n_workers=2
+    )
+    assert ensemble.file_paths == cif_ensemble_test.file_paths
+    assert [cif.formula for cif in ensemble.cifs] == [
+        cif.formula for cif in cif_ensemble_test.cifs
+    ]
+    assert ensemble.unique_formulas == cif_ensemble_test.unique_formulas
+
+
+@pytest.mark.fast
+def test_init_reuses_validated_cifs(tmp_path: Path, monkeypatch):
+    source_dir = "tests/data/cif/ensemble_test"
+    for file_path in get_file_paths(source_dir):
+        shutil.copy(file_path, tmp_path)
+
+    # Cif objects built during validation are passed to the ensemble
+    def fail(*args, **kwargs):
+        raise AssertionError("Cif initialized twice")
+
+    monkeypatch.setattr("cifkit.models.cif_ensemble.Cif", fail)
+    ensemble = CifEnsemble(str(tmp_path))
+    assert ensemble.file_count == 6
+    assert [cif.file_path for cif in ensemble.cifs] == ensemble.file_paths
+
+
+@pytest.mark.fast
+def test_init_without_supercell(tmp_path: Path):
+    source_dir = "tests/data/cif/ensemble_test"
+    for file_path in get_file_paths(source_dir):
+        shutil.copy(file_path, tmp_path)
+
+    # Validation generates the unit cell only
+    ensemble = CifEnsemble(str(tmp_path))
+    assert all(cif._unitcell_point_array is not None for cif in ensemble.cifs)
+    assert ensemble.unique_formulas == {
+        "EuIr2Ge2",
+        "CeRu2Ge2",
+        "LaRu2Ge2",
+        "Mo",
+    }
+    assert len(ensemble.filter_by_space_group_numbers([139])) == 3
+    assert ensemble.structure_stats == {"CeAl2Ga2": 3, "W": 3}
+    assert all(cif._supercell_point_array is None for cif in ensemble.cifs)
+
+
+@pytest.mark.fast
+def test_filter_as_mask(cif_ensemble_test: CifEnsemble):
+    structure_mask = cif_ensemble_test.filter_by_structures(
+        ["CeAl2Ga2"], as_mask=True
+    )
+    elements_mask = cif_ensemble_test.filter_by_elements_containing(
+        ["La", "Eu"], as_mask=True
+    )
+    supercell_mask = cif_ensemble_test.filter_by_supercell_count(
+        50, 60, as_mask=True
+    )
+
+    assert (structure_mask & elements_mask).file_paths == {
+        "tests/data/cif/ensemble_test/300169.cif",
+        "tests/data/cif/ensemble_test/300171.cif",
+    }
+    assert (structure_mask & ~elements_mask).file_paths == {
+        "tests/data/cif/ensemble_test/300170.cif",
+    }
+    assert (elements_mask | supercell_mask).file_paths == {
+        "tests/data/cif/ensemble_test/300169.cif",
+        "tests/data/cif/ensemble_test/300171.cif",
+        "tests/data/cif/ensemble_test/260171.cif",
+        "tests/data/cif/ensemble_test/250697.cif",
+        "tests/data/cif/ensemble_test/250709.cif",
+    }
+
+
+@pytest.mark.fast
+def test_stats_cleared_when_cifs_change():
+    ensemble = CifEnsemble("tests/data/cif/ensemble_test", preprocess=False)
+    assert ensemble.structure_stats == {"CeAl2Ga2": 3, "W": 3}
+    assert ensemble.filter_by_structures(["W"]) == {
+        "tests/data/cif/ensemble_test/260171.cif",
+        "tests/data/cif/ensemble_test/250697.cif",
+        "tests/data/cif/ensemble_test/250709.cif",
+    }
+
+    # Parsed attributes are counted together and kept
+    assert set(ensemble._stats) >= {"structure", "formula", "tag"}
+    ensemble.structure_stats["W"] = 0
+    assert ensemble.structure_stats["W"] == 3
+
+    ensemble.cifs = [cif for cif in ensemble.cifs if cif.structure == "W"]
+    assert ensemble.file_count == 3
+    assert ensemble.structure_stats == {"W": 3}
+    assert ensemble.unique_elements == {"Mo"}
+    assert ensemble.filter_by_structures(["CeAl2Ga2"]) == set()
+
+
+@pytest.mark.fast
+def test_compute_connections_with_workers():
+    ensemble = CifEnsemble("tests/data/cif/ensemble_test", preprocess=False)
+    assert ensemble.compute_connections(cutoff_radius=8.0, n_workers=2) == {}
+
+    for cif in ensemble.cifs:
+        expected_cif = Cif(cif.file_path)
+        expected_cif.compute_connections(cutoff_radius=8.0)
+        assert cif.connections == expected_cif.connections
+        assert cif.shortest_distance == expected_cif.shortest_distance
+        assert (
+            cif.CN_unique_values_by_best_methods
+            == expected_cif.CN_unique_values_by_best_methods
+        )
+
+
+@pytest.mark.fast
+def test_compute_connections_reports_errors():
+    ensemble = CifEnsemble("tests/data/cif/ensemble_test", preprocess=False)
+    error_messages = ensemble.compute_connections(neighbor_search="unknown")
+    assert set(error_messages) == set(ensemble.file_paths)
+    assert all(cif.connections is None for cif in ensemble.cifs)
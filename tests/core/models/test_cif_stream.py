@@ -0,0 +1,52 @@
+import shutil
+
+import pytest
+
+from cifkit import CifEnsemble, CifStream
+
+
+@pytest.mark.fast
+def test_iter_cifs(cif_ensemble_test: CifEnsemble):
+    stream = CifStream("tests/data/cif/ensemble_test", is_formatted=True)
+    assert len(stream) == 6
+
+    formulas = [cif.formula for cif in stream]
+    assert formulas == [cif.formula for cif in cif_ensemble_test.cifs]
+
+
+@pytest.mark.fast
+def test_iter_cifs_with_workers():
+    stream = CifStream(
+        "tests/data/cif/ensemble_test",
+        is_formatted=True,
+        n_workers=2,
+        prefetch=2,
+    )
+    file_paths = [cif.file_path for cif in stream.iter_cifs()]
+    assert file_paths == stream.file_paths
+
+
+@pytest.mark.fast
+def test_attribute_stats(cif_ensemble_test: CifEnsemble):
+    stream = CifStream("tests/data/cif/ensemble_test", is_formatted=True)
+    stats = stream.attribute_stats(["structure", "unique_elements"])
+    assert stats["structure"] == cif_ensemble_test.structure_stats
+    assert stats["unique_elements"] == cif_ensemble_test.unique_elements_stats
+
+
+@pytest.mark.fast
+def test_filter(cif_ensemble_test: CifEnsemble):
+    stream = CifStream("tests/data/cif/ensemble_test", is_formatted=True)
+    assert stream.filter(
+        lambda cif: cif.structure == "W"
+    ) == cif_ensemble_test.filter_by_structures(["W"])
+
+
+@pytest.mark.fast
+def test_iter_cifs_skips_errors(tmp_path, capsys):
+    shutil.copy("tests/data/cif/URhIn.cif", tmp_path)
+    shutil.copy("tests/data/cif/error/combined/457848.cif", tmp_path)
+
+    cifs = list(CifStream(str(tmp_path)))
+    assert [cif.formula for cif in cifs] == ["URhIn"]
+    assert "Error processing" in capsys.readouterr().out
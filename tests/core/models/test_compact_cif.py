@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+from cifkit import Cif, CifEnsemble
+from cifkit.models.compact_cif import CompactCif
+
+
+@pytest.mark.fast
+def test_to_compact(cif_URhIn: Cif):
+    compact_cif = cif_URhIn.to_compact()
+    assert isinstance(compact_cif, CompactCif)
+    assert not hasattr(compact_cif, "__dict__")
+    assert not hasattr(compact_cif, "_block")
+
+    assert compact_cif.file_name == "URhIn.cif"
+    assert compact_cif.formula == "URhIn"
+    assert compact_cif.structure == "ZrNiAl"
+    assert compact_cif.space_group_number == 189
+    assert compact_cif.site_labels == cif_URhIn.site_labels
+    assert compact_cif.unique_elements == {"In", "Rh", "U"}
+    assert compact_cif.composition_type == 3
+    assert compact_cif.unitcell_lengths == cif_URhIn.unitcell_lengths
+    assert compact_cif.unitcell_atom_count == 22
+    assert compact_cif.supercell_atom_count == 336
+    assert set(compact_cif.supercell_points) == set(cif_URhIn.supercell_points)
+
+
+@pytest.mark.fast
+def test_compact_pickle_round_trip(cif_URhIn: Cif):
+    compact_cif = pickle.loads(pickle.dumps(cif_URhIn.to_compact()))
+    assert compact_cif.site_labels == cif_URhIn.site_labels
+    assert compact_cif.unique_elements == {"In", "Rh", "U"}
+    assert compact_cif.unitcell_atom_count == 22
+
+
+@pytest.mark.fast
+def test_to_cif(cif_URhIn: Cif):
+    cif = cif_URhIn.to_compact().to_cif()
+    assert cif.shortest_distance == 2.697
+
+
+@pytest.mark.fast
+def test_compact_ensemble(cif_ensemble_test: CifEnsemble):
+    ensemble = CifEnsemble(
+        "tests/data/cif/ensemble_test", preprocess=False, compact=True
+    )
+    assert all(isinstance(cif, CompactCif) for cif in ensemble.cifs)
+    assert ensemble.structure_stats == cif_ensemble_test.structure_stats
+    assert ensemble.unique_elements == cif_ensemble_test.unique_elements
+    assert ensemble.filter_by_elements_exact_matching(
+        ["Mo"]
+    ) == cif_ensemble_test.filter_by_elements_exact_matching(["Mo"])
+    assert ensemble.filter_by_supercell_count(
+        50, 60
+    ) == cif_ensemble_test.filter_by_supercell_count(50, 60)
+
+
+@pytest.mark.fast
+def test_compact_shares_strings(cif_URhIn: Cif):
+    compact_cifs = [cif_URhIn.to_compact(), cif_URhIn.to_compact()]
+    assert all(
+        label_1 is label_2
+        for label_1, label_2 in zip(
+            compact_cifs[0]._site_labels, compact_cifs[1]._site_labels
+        )
+    )
+
+
+@pytest.mark.fast
+def test_to_cif_from_string(file_path_URhIn: str):
+    with open(file_path_URhIn) as f:
+        content = f.read()
+    compact_cif = Cif.from_string(content).to_compact()
+    compact_cif = pickle.loads(pickle.dumps(compact_cif))
+
+    # Initialized from the kept content, as there is no file
+    cif = compact_cif.to_cif()
+    assert cif.file_path == "memory.cif"
+    assert cif.db_source == "PCD"
+    assert cif.shortest_distance == 2.697
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize(
+    "get_value",
+    [
+        lambda ensemble: ensemble.compute_connections(),
+        lambda ensemble: ensemble.minimum_distances,
+        lambda ensemble: ensemble.CN_unique_values_by_best_methods,
+        lambda ensemble: ensemble.unique_CN_values_by_min_dist_method_stat,
+        lambda ensemble: ensemble.filter_by_min_distance(2.0, 3.0),
+        lambda ensemble: ensemble.filter_by_CN_min_dist_method_containing([4]),
+    ],
+)
+def test_compact_ensemble_connections(get_value):
+    ensemble = CifEnsemble(
+        "tests/data/cif/ensemble_test", preprocess=False, compact=True
+    )
+    with pytest.raises(ValueError, match="compact=False"):
+        get_value(ensemble)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from cifkit.models.ensemble_index import (
+    FileMask,
+    RangeIndex,
+    SetIndex,
+    ValueIndex,
+)
+
+
+@pytest.mark.fast
+def test_value_index():
+    index = ValueIndex(["LaRu2Ge2", "Mo", None, "Mo", "CeRu2Ge2"])
+    assert np.array_equal(index.lookup(["Mo"]), [1, 3])
+    assert np.array_equal(index.lookup(["CeRu2Ge2", "LaRu2Ge2"]), [0, 4])
+    assert np.array_equal(index.lookup([None]), [2])
+    assert index.lookup(["EuIr2Ge2"]).size == 0
+    assert index.lookup([]).size == 0
+
+
+@pytest.mark.fast
+def test_range_index():
+    index = RangeIndex([2.4, None, 2.7, 2.2, 3.1, 2.7])
+    assert np.array_equal(index.lookup(2.0, 2.5), [0, 3])
+    # Both bounds are inclusive
+    assert np.array_equal(index.lookup(2.7, 3.1), [2, 4, 5])
+    assert index.lookup(3.2, 4.0).size == 0
+    assert index.lookup(0, 10).size == 5
+
+
+@pytest.mark.fast
+def test_set_index():
+    index = SetIndex([{"La", "Ru", "Ge"}, {"Mo"}, {"Ce", "Ru", "Ge"}, set()])
+    assert index.lookup_any(["Mo", "La"]).tolist() == [1, 1, 0, 0]
+    assert index.lookup_all(["Ru", "Ge"]).tolist() == [1, 0, 1, 0]
+    assert index.lookup_exact(["Ce", "Ru", "Ge"]).tolist() == [0, 0, 1, 0]
+    assert index.lookup_exact(["Ru", "Ge"]).tolist() == [0, 0, 0, 0]
+    assert index.lookup_exact([]).tolist() == [0, 0, 0, 1]
+    assert index.lookup_any(["Eu"]).tolist() == [0, 0, 0, 0]
+
+
+@pytest.mark.fast
+def test_file_mask():
+    file_paths = ["a.cif", "b.cif", "c.cif"]
+    mask_a = FileMask(np.array([True, True, False]), file_paths)
+    mask_b = FileMask.from_ids(np.array([1, 2]), file_paths)
+    assert (mask_a & mask_b).file_paths == {"b.cif"}
+    assert (mask_a | mask_b).file_paths == {"a.cif", "b.cif", "c.cif"}
+    assert (~mask_a).file_paths == {"c.cif"}
+    assert len(mask_a) == 2
+
+    other_mask = FileMask(np.array([True, True, False]), list(file_paths))
+    with pytest.raises(ValueError) as e:
+        mask_a & other_mask
+    assert str(e.value) == "Only masks from the same ensemble can be combined."
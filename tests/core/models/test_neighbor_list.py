@@ -0,0 +1,89 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from cifkit.coordination.composition import get_bond_counts
+from cifkit.models.neighbor_list import NeighborList
+from cifkit.preprocessors.environment_util import flat_site_connections
+
+
+@pytest.mark.fast
+def test_neighbor_list_reads_as_connections(connections_URhIn):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    assert list(neighbor_list) == list(connections_URhIn)
+    assert len(neighbor_list) == len(connections_URhIn)
+    assert neighbor_list == connections_URhIn
+    assert neighbor_list.to_dict() == connections_URhIn
+    assert "In1" in neighbor_list
+    assert "In2" not in neighbor_list
+
+    # Each site keeps its center once
+    assert len(neighbor_list.centers) == len(connections_URhIn)
+    assert neighbor_list.get_center("In1").tolist() == (
+        connections_URhIn["In1"][0][2]
+    )
+    assert neighbor_list.get_distances("In1").tolist() == [
+        connection[1] for connection in connections_URhIn["In1"]
+    ]
+    assert neighbor_list.get_neighbor_labels("In1") == [
+        connection[0] for connection in connections_URhIn["In1"]
+    ]
+
+
+@pytest.mark.fast
+def test_neighbor_list_truncate(connections_URhIn):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    counts = {"U1": 11, "In1": -1, "Rh1": 0}
+    truncated = neighbor_list.truncate(counts)
+    assert isinstance(truncated, NeighborList)
+    assert truncated == {
+        label: connections_URhIn[label][:count]
+        for label, count in counts.items()
+    }
+
+
+@pytest.mark.fast
+def test_neighbor_list_truncate_by_distance(connections_URhIn):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    assert neighbor_list.truncate_by_distance(3.294) == {
+        label: [
+            connection
+            for connection in label_connections
+            if connection[1] < 3.294
+        ]
+        for label, label_connections in connections_URhIn.items()
+    }
+
+
+@pytest.mark.fast
+def test_neighbor_list_pickle(connections_URhIn):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    restored = pickle.loads(pickle.dumps(neighbor_list))
+    assert restored == connections_URhIn
+    assert np.array_equal(restored.offsets, neighbor_list.offsets)
+
+
+@pytest.mark.fast
+def test_neighbor_list_matches_connections(cif_URhIn, connections_URhIn):
+    neighbor_list = NeighborList.from_connections(connections_URhIn)
+    assert flat_site_connections(neighbor_list) == flat_site_connections(
+        connections_URhIn
+    )
+    for sorted_by_mendeleev in [False, True]:
+        assert get_bond_counts(
+            cif_URhIn.unique_elements,
+            neighbor_list,
+            sorted_by_mendeleev=sorted_by_mendeleev,
+        ) == get_bond_counts(
+            cif_URhIn.unique_elements,
+            connections_URhIn,
+            sorted_by_mendeleev=sorted_by_mendeleev,
+        )
+
+
+@pytest.mark.fast
+def test_cif_connections_neighbor_list(cif_URhIn):
+    cif_URhIn.compute_connections()
+    assert isinstance(cif_URhIn.connections, NeighborList)
+    assert isinstance(cif_URhIn.CN_connections_by_best_methods, NeighborList)
@@ -1,7 +1,19 @@
 import numpy as np
 import pytest
 
-from cifkit.preprocessors.environment import remove_duplicate_connections
+from cifkit.preprocessors import environment
+from cifkit.preprocessors.environment import (
+    get_nearest_dists_per_site,
+    get_orbit_representative,
+    get_site_connections,
+    get_site_connections_by_kdtree,
+    keep_nearest_connections,
+    remove_duplicate_connections,
+)
+from cifkit.preprocessors.supercell import (
+    get_supercell_point_array,
+    get_unitcell_point_array,
+)
 
 
 def assert_minimum_distance(label, connections_dict, expected_min_distance):
@@ -26,6 +38,241 @@ def test_get_nearest_dists_per_site_cooridnation_number(
     assert_minimum_distance("Rh2", connections_URhIn, 2.697)
 
 
+@pytest.mark.fast
+def test_get_site_connections_from_point_arrays(
+    cif_block_URhIn,
+    parsed_cif_data_URhIn,
+    unitcell_points_URhIn,
+    supercell_points_URhIn,
+):
+    connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        get_unitcell_point_array(cif_block_URhIn),
+        get_supercell_point_array(cif_block_URhIn, 3),
+        cutoff_radius=10.0,
+    )
+    # Same points as tuples are sorted the same way as the arrays
+    expected = get_site_connections(
+        parsed_cif_data_URhIn,
+        sorted(unitcell_points_URhIn),
+        sorted(supercell_points_URhIn),
+        cutoff_radius=10.0,
+    )
+    assert connections == expected
+
+
+@pytest.mark.fast
+def test_get_orbit_representative():
+    cell_matrix = np.diag([4.0, 4.0, 4.0])
+    unitcell_coords = np.array([[0.1] * 3, [0.3] * 3, [0.5] * 3])
+    supercell_coords = np.concatenate(
+        [unitcell_coords - 1.0, unitcell_coords + 1.0]
+    )
+    index, complete_radius = get_orbit_representative(
+        unitcell_coords, unitcell_coords, supercell_coords, cell_matrix
+    )
+    # The nearest images outside the supercell, shifted by 2 cells, are at
+    # 0.5 - 2 and 0.1 + 2, 1.8 cells from the middle point
+    assert index == 1
+    assert complete_radius == pytest.approx(7.2)
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("cutoff_radius", [5.0, 10.0])
+def test_get_site_connections_per_orbit(
+    parsed_cif_data_URhIn,
+    unitcell_points_URhIn,
+    supercell_points_URhIn,
+    cutoff_radius,
+):
+    connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        supercell_points_URhIn,
+        cutoff_radius=cutoff_radius,
+    )
+    orbit_connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        supercell_points_URhIn,
+        cutoff_radius=cutoff_radius,
+        per_orbit=True,
+    )
+    assert orbit_connections.keys() == connections.keys()
+    for label, label_connections in connections.items():
+        # The nearest neighbors match up to rounding of the coordinates
+        for conn, orbit_conn in zip(
+            label_connections[:20], orbit_connections[label][:20]
+        ):
+            assert orbit_conn[1] == pytest.approx(conn[1], abs=0.001)
+
+    kdtree_connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn, unitcell_points_URhIn, cutoff_radius
+    )
+    orbit_kdtree_connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        cutoff_radius,
+        per_orbit=True,
+    )
+    for label, label_connections in kdtree_connections.items():
+        assert [conn[1] for conn in label_connections] == pytest.approx(
+            [conn[1] for conn in orbit_kdtree_connections[label]], abs=0.001
+        )
+
+
+@pytest.mark.fast
+def test_get_site_connections_by_kdtree(
+    parsed_cif_data_URhIn, unitcell_points_URhIn, supercell_points_URhIn
+):
+    # The 3x3x3 supercell contains every neighbor within 5 Å
+    connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        supercell_points_URhIn,
+        cutoff_radius=5.0,
+    )
+    kdtree_connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn, unitcell_points_URhIn, cutoff_radius=5.0
+    )
+    assert connections.keys() == kdtree_connections.keys()
+    for label, label_connections in connections.items():
+        assert sorted(conn[:2] for conn in label_connections) == sorted(
+            conn[:2] for conn in kdtree_connections[label]
+        )
+
+
+@pytest.mark.fast
+def test_get_site_connections_by_kdtree_beyond_supercell(
+    parsed_cif_data_URhIn, unitcell_points_URhIn, supercell_points_URhIn
+):
+    # The c axis is 3.881 Å so the supercell misses neighbors within 10 Å
+    connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        supercell_points_URhIn,
+        cutoff_radius=10.0,
+    )
+    kdtree_connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn, unitcell_points_URhIn, cutoff_radius=10.0
+    )
+    for label, label_connections in kdtree_connections.items():
+        assert len(label_connections) > len(connections[label])
+        # Rounding ties depend on the order of the supercell points
+        assert label_connections[0][1] == pytest.approx(
+            connections[label][0][1], abs=0.001
+        )
+        assert all(conn[1] < 10.0 for conn in label_connections)
+
+
+@pytest.mark.fast
+def test_get_site_connections_by_kdtree_skips_self_distance(
+    monkeypatch, parsed_cif_data_URhIn, unitcell_points_URhIn
+):
+    dist_sets = []
+    get_most_connected = environment.get_most_connected_point_per_site
+
+    def record_dist_set(label, dist_dict, dist_set):
+        dist_sets.append(dist_set)
+        return get_most_connected(label, dist_dict, dist_set)
+
+    monkeypatch.setattr(
+        environment, "get_most_connected_point_per_site", record_dist_set
+    )
+    get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn, unitcell_points_URhIn, cutoff_radius=10.0
+    )
+    # The points are ranked on the distances to the others only
+    assert dist_sets
+    assert all(min(dist_set) > 0.1 for dist_set in dist_sets)
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("neighbor_count", [1, 5, 20])
+def test_get_site_connections_nearest_neighbors(
+    parsed_cif_data_URhIn,
+    unitcell_points_URhIn,
+    supercell_points_URhIn,
+    neighbor_count,
+):
+    connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn, unitcell_points_URhIn, cutoff_radius=10.0
+    )
+    expected = keep_nearest_connections(connections, neighbor_count)
+    supercell_connections = get_site_connections(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        supercell_points_URhIn,
+        cutoff_radius=10.0,
+        neighbor_count=neighbor_count,
+    )
+    kdtree_connections = get_site_connections_by_kdtree(
+        parsed_cif_data_URhIn,
+        unitcell_points_URhIn,
+        cutoff_radius=10.0,
+        neighbor_count=neighbor_count,
+    )
+    for label, label_connections in expected.items():
+        expected_dists = [conn[1] for conn in label_connections]
+        for nearest_connections in [
+            supercell_connections[label],
+            kdtree_connections[label],
+        ]:
+            # Rounding and so ties depend on the copy of the site
+            dists = [conn[1] for conn in nearest_connections]
+            assert len(dists) >= neighbor_count
+            assert dists[:neighbor_count] == pytest.approx(
+                expected_dists[:neighbor_count], abs=0.0011
+            )
+            assert dists[-1] <= expected_dists[-1] + 0.0011
+
+
+@pytest.mark.fast
+def test_keep_nearest_connections():
+    connections = {
+        "Fe1": [
+            ("Co1", 2.0, [0.0, 0.0, 0.0], [2.0, 0.0, 0.0]),
+            ("Fe1", 3.0, [0.0, 0.0, 0.0], [3.0, 0.0, 0.0]),
+            ("Co1", 3.0, [0.0, 0.0, 0.0], [0.0, 3.0, 0.0]),
+            ("Fe1", 4.0, [0.0, 0.0, 0.0], [4.0, 0.0, 0.0]),
+        ],
+        "Co1": [("Fe1", 2.0, [2.0, 0.0, 0.0], [0.0, 0.0, 0.0])],
+    }
+    # Connections tied with the last kept distance are kept
+    nearest_connections = keep_nearest_connections(connections, 2)
+    assert nearest_connections["Fe1"] == connections["Fe1"][:3]
+    assert nearest_connections["Co1"] == connections["Co1"]
+    assert keep_nearest_connections(connections, 1)["Fe1"] == (
+        connections["Fe1"][:1]
+    )
+
+
+@pytest.mark.fast
+def test_get_nearest_dists_per_site():
+    lengths = [4.0, 4.0, 4.0]
+    angles_rad = [1.5708, 1.5708, 1.5708]
+    unitcell_points = [(0.0, 0.0, 0.0, "Fe1")]
+    supercell_points = [
+        (0.0, 0.0, 0.0, "Fe1"),
+        (0.5, 0.0, 0.0, "Co1"),
+        (0.0, 1.0, 0.0, "Fe1"),
+        (0.0, 0.0, 3.0, "Fe1"),
+    ]
+    dist_dict, dist_set = get_nearest_dists_per_site(
+        unitcell_points, supercell_points, 10.0, lengths, angles_rad
+    )
+
+    # The point itself is skipped and the 12 Å point is beyond the cutoff
+    assert dist_set == {2.0, 4.0, 12.0}
+    assert list(dist_dict.keys()) == [0]
+    assert [(label, dist) for label, dist, _, _ in dist_dict[0]] == [
+        ("Co1", 2.0),
+        ("Fe1", 4.0),
+    ]
+    assert dist_dict[0][0][2] == [0.0, 0.0, 0.0]
+    assert dist_dict[0][0][3] == [2.0, 0.0, 0.0]
+
+
 @pytest.mark.fast
 def test_remove_duplicate_connections():
     connections = {
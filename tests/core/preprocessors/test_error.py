@@ -3,12 +3,19 @@ import shutil
 
 import pytest
 
-from cifkit.preprocessors.error import move_files_based_on_errors
+from cifkit.models import cif as cif_module
+from cifkit.preprocessors.error import (
+    get_cif_and_error_message,
+    get_error_type,
+    move_files_based_on_errors,
+)
+from cifkit.utils import cif_parser
 from cifkit.utils.folder import get_file_count, get_file_paths
 
 
 @pytest.mark.fast
-def test_move_files_based_on_errors(tmpdir):
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_move_files_based_on_errors(tmpdir, n_workers):
     # Setup source directory and temporary directory for testing
     source_dir = "tests/data/cif/error/combined"
     file_paths = get_file_paths(source_dir)
@@ -27,8 +34,44 @@ def test_move_files_based_on_errors(tmpdir):
     }
 
     # Run the function with the paths in the temporary directory
-    move_files_based_on_errors(str(tmpdir), new_paths)
+    move_files_based_on_errors(str(tmpdir), new_paths, n_workers)
 
     # Assert the number of files in eoach directory
     assert get_file_count(expected_dirs["error_duplicate_labels"]) == 1
     assert get_file_count(expected_dirs["error_invalid_label"]) == 1
+
+
+@pytest.mark.fast
+def test_move_files_based_on_errors_returns_valid_cifs(tmpdir):
+    file_paths = []
+    for file_path in get_file_paths("tests/data/cif/folder"):
+        new_file_path = os.path.join(tmpdir, os.path.basename(file_path))
+        shutil.copy(file_path, new_file_path)
+        file_paths.append(new_file_path)
+
+    valid_cifs = move_files_based_on_errors(str(tmpdir), file_paths)
+    assert list(valid_cifs) == file_paths
+    assert all(cif.file_path in file_paths for cif in valid_cifs.values())
+
+
+@pytest.mark.fast
+def test_get_cif_and_error_message_reads_once(monkeypatch):
+    file_paths = []
+    get_file_lines = cif_module.get_file_lines
+
+    def record_file_lines(file_path):
+        file_paths.append(file_path)
+        return get_file_lines(file_path)
+
+    monkeypatch.setattr(cif_module, "get_file_lines", record_file_lines)
+    monkeypatch.setattr(cif_parser, "get_cif_block", None)
+
+    # The labels are checked on the block parsed by the Cif object
+    cif, error_message = get_cif_and_error_message("tests/data/cif/URhIn.cif")
+    assert error_message is None
+    assert file_paths == ["tests/data/cif/URhIn.cif"]
+
+    _, error_message = get_cif_and_error_message(
+        "tests/data/cif/bad_cif_format/duplicate_labels.cif"
+    )
+    assert get_error_type(error_message) == "error_duplicate_labels"
@@ -1,7 +1,14 @@
+import gemmi
+import numpy as np
 import pytest
 
 from cifkit.preprocessors.supercell import (
+    POINT_DTYPE,
+    apply_symmetry_operations,
+    get_points_from_array,
+    get_supercell_point_array,
     get_supercell_points,
+    get_symmetry_operation_arrays,
     get_unitcell_coords_for_all_labels,
 )
 
@@ -194,3 +201,38 @@ def test_get_supercell_points_no_shift(cif_block_URhIn, unitcell_points_URhIn):
     supercell_points = get_supercell_points(cif_block_URhIn, 1)
     assert set(supercell_points) == unitcell_points_URhIn
     assert len(supercell_points) == 22
+
+
+def test_get_symmetry_operation_arrays(cif_block_URhIn):
+    rotations, translations = get_symmetry_operation_arrays(cif_block_URhIn)
+    assert rotations.shape == (12, 3, 3)
+    assert translations.shape == (12, 3)
+
+    # Match gemmi applied one operation at a time
+    fracs = (0.5925, 0.0, 0.0)
+    new_coords = apply_symmetry_operations(rotations, translations, fracs)
+    operations = cif_block_URhIn.find_loop("_space_group_symop_operation_xyz")
+    expected = [
+        gemmi.Op(op.replace("'", "")).apply_to_xyz(list(fracs))
+        for op in operations
+    ]
+    assert np.array_equal(new_coords, np.array(expected))
+
+    # All sites at once
+    all_coords = apply_symmetry_operations(
+        rotations, translations, np.array([fracs, fracs])
+    )
+    assert all_coords.shape == (2, 12, 3)
+    assert np.array_equal(all_coords[1], new_coords)
+
+
+def test_get_supercell_point_array(cif_block_URhIn):
+    point_array = get_supercell_point_array(cif_block_URhIn, 3)
+    assert point_array.dtype == POINT_DTYPE
+    assert len(point_array) == 336
+
+    # Sorted by coordinates, labels index the atom site loop
+    assert np.all(np.diff(point_array["x"]) >= 0)
+    site_labels = ["In1", "U1", "Rh1", "Rh2"]
+    points = get_points_from_array(point_array, site_labels)
+    assert set(points) == set(get_supercell_points(cif_block_URhIn, 3))
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from cifkit.utils.benchmark import (
+    compare_benchmark_results,
+    load_benchmark_results,
+    measure,
+    save_benchmark_results,
+)
+
+
+@pytest.mark.fast
+def test_measure():
+    setup_values = []
+
+    def setup():
+        setup_values.append(len(setup_values))
+        return setup_values[-1]
+
+    calls = []
+    result = measure(lambda value: calls.append(value), setup, repeat=2)
+    assert result["repeat"] == 2
+    assert len(result["times"]) == 2
+    assert result["min_time"] == min(result["times"])
+    assert result["peak_memory"] >= 0
+
+    # Two timed runs and one traced run, each after its setup
+    assert calls == [0, 1, 2]
+
+
+@pytest.mark.fast
+def test_measure_peak_memory():
+    result = measure(lambda: bytearray(10_000_000), repeat=1)
+    assert result["peak_memory"] >= 10_000_000
+
+
+@pytest.mark.fast
+def test_save_and_load_benchmark_results(tmp_path):
+    file_path = str(tmp_path / "results.json")
+    benchmarks = {"cif_init[tests]": {"min_time": 0.5, "peak_memory": 100}}
+    save_benchmark_results(file_path, benchmarks)
+
+    with open(file_path) as f:
+        assert "python_version" in json.load(f)["metadata"]
+    assert load_benchmark_results(file_path) == benchmarks
+
+
+@pytest.mark.fast
+def test_compare_benchmark_results():
+    baseline = {
+        "cif_init[tests]": {"min_time": 1.0, "peak_memory": 1_000_000},
+        "site_connections[tests]": {"min_time": 2.0, "peak_memory": 100},
+        "ensemble_filters[tests]": {"min_time": 0.0001, "peak_memory": 0},
+    }
+    benchmarks = {
+        "cif_init[tests]": {"min_time": 1.5, "peak_memory": 1_100_000},
+        # Memory growth below the minimum delta is noise
+        "site_connections[tests]": {"min_time": 2.1, "peak_memory": 1000},
+        # Time growth below the minimum delta is noise
+        "ensemble_filters[tests]": {"min_time": 0.0005, "peak_memory": 10},
+        "supercell_points[tests]": {"min_time": 9.0, "peak_memory": 100},
+    }
+    assert compare_benchmark_results(benchmarks, baseline) == [
+        {
+            "name": "cif_init[tests]",
+            "metric": "min_time",
+            "baseline": 1.0,
+            "value": 1.5,
+            "ratio": 1.5,
+        }
+    ]
+    assert (
+        compare_benchmark_results(benchmarks, baseline, time_tolerance=0.6)
+        == []
+    )
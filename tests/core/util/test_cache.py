@@ -0,0 +1,71 @@
+import os
+import sys
+import zlib
+
+import pytest
+
+from cifkit.utils.cache import (
+    get_cache_file_path,
+    get_cache_key,
+    get_content_hash,
+    get_source_hash,
+    load_cached_results,
+    save_cached_results,
+)
+
+
+class StaleResults:
+    pass
+
+
+@pytest.mark.fast
+def test_get_source_hash():
+    assert len(get_source_hash()) == 64
+    assert get_source_hash() == get_source_hash()
+
+
+@pytest.mark.fast
+def test_get_cache_key():
+    content_hash = get_content_hash(["data_URhIn\n", "_cell_length_a 7.4\n"])
+    key = get_cache_key(content_hash, 10.0, "supercell")
+    assert len(key) == 64
+    assert key == get_cache_key(content_hash, 10, "supercell")
+    assert key != get_cache_key(content_hash, 5.0, "supercell")
+    assert key != get_cache_key(content_hash, 10.0, "kdtree")
+    assert key != get_cache_key(content_hash, 10.0, "supercell", True)
+    assert key != get_cache_key(content_hash, 10.0, "supercell", False, 20)
+    assert key != get_cache_key(
+        get_content_hash(["data_URhIn\n"]), 10.0, "supercell"
+    )
+
+
+@pytest.mark.fast
+def test_save_and_load_cached_results(tmp_path):
+    cache_dir = str(tmp_path)
+    key = get_cache_key(get_content_hash(["data_URhIn\n"]), 10.0, "kdtree")
+    assert load_cached_results(cache_dir, key) is None
+
+    results = {"connections": {"In1": [("Rh2", 2.697, [0, 0, 0], [1, 1, 1])]}}
+    save_cached_results(cache_dir, key, results)
+    assert load_cached_results(cache_dir, key) == results
+    assert os.listdir(tmp_path / key[:2]) == [f"{key}.pkl.z"]
+
+    # Corrupted entries are treated as missing
+    with open(get_cache_file_path(cache_dir, key), "wb") as f:
+        f.write(b"corrupted")
+    assert load_cached_results(cache_dir, key) is None
+
+
+@pytest.mark.fast
+def test_load_cached_results_stale_class(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    key = get_cache_key(get_content_hash(["data_URhIn\n"]), 10.0, "kdtree")
+    save_cached_results(cache_dir, key, {"connections": StaleResults()})
+
+    # Entries of classes since renamed or moved are treated as missing
+    monkeypatch.delattr(sys.modules[__name__], "StaleResults")
+    assert load_cached_results(cache_dir, key) is None
+
+    with open(get_cache_file_path(cache_dir, key), "wb") as f:
+        f.write(zlib.compress(b"ccifkit.removed_module\nResults\n."))
+    assert load_cached_results(cache_dir, key) is None
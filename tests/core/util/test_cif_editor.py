@@ -6,8 +6,12 @@ import tempfile
 import gemmi
 import pytest
 
-from cifkit.utils.cif_editor import add_hashtag_in_first_line, remove_author_loop
-from cifkit.utils.cif_parser import get_unitcell_lengths
+from cifkit.utils.cif_editor import (
+    add_hashtag_in_first_line,
+    remove_author_loop,
+    remove_author_loop_from_lines,
+)
+from cifkit.utils.cif_parser import get_file_lines, get_unitcell_lengths
 
 
 @pytest.fixture
@@ -32,6 +36,14 @@ def test_remove_author_loop(setup_and_teardown_file):
     ), "The modified file does not match the reference file."
 
 
+def test_remove_author_loop_from_lines():
+    lines = get_file_lines("tests/data/cif/format_author/author.cif")
+    reference_lines = get_file_lines(
+        "tests/data/cif/format_author/author_removed.cif"
+    )
+    assert remove_author_loop_from_lines(lines) == reference_lines
+
+
 @pytest.mark.fast
 def test_hashtag_in_first_line(tmpdir):
     temp_file_path = os.path.join(tmpdir, "test.cif")
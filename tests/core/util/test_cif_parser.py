@@ -4,6 +4,8 @@ from cifkit.utils import folder
 from cifkit.utils.cif_parser import (
     check_unique_atom_site_labels,
     get_cif_block,
+    get_cif_block_from_lines,
+    get_file_lines,
     get_formula_structure_weight_s_group,
     get_label_occupancy_coordinates,
     get_line_content_from_tag,
@@ -11,6 +13,8 @@ from cifkit.utils.cif_parser import (
     get_loop_value_dict,
     get_loop_values,
     get_start_end_line_indexes,
+    get_start_end_line_indexes_from_lines,
+    get_tag_from_lines,
     get_tag_from_third_line,
     get_unique_elements_from_loop,
     get_unique_formulas_structures_weights_s_groups,
@@ -19,6 +23,7 @@ from cifkit.utils.cif_parser import (
     get_unitcell_angles_rad,
     get_unitcell_lengths,
     parse_atom_site_occupancy_info,
+    parse_atom_site_occupancy_info_from_block,
 )
 from cifkit.utils.error_messages import CifParserError
 
@@ -27,6 +32,25 @@ def test_get_cif_block(cif_block_URhIn):
     assert cif_block_URhIn is not None
 
 
+@pytest.mark.fast
+def test_get_cif_block_from_lines(file_path_URhIn, cif_block_URhIn):
+    block = get_cif_block_from_lines(get_file_lines(file_path_URhIn))
+    assert get_unitcell_lengths(block) == get_unitcell_lengths(cif_block_URhIn)
+    assert parse_atom_site_occupancy_info_from_block(
+        block
+    ) == parse_atom_site_occupancy_info(file_path_URhIn)
+
+
+@pytest.mark.fast
+def test_get_cif_block_from_lines_error_file_path():
+    file_path = "tests/data/cif/error/nested/URhIn_wrong_loop.cif"
+    with pytest.raises(ValueError) as e:
+        get_cif_block_from_lines(get_file_lines(file_path), file_path)
+    assert str(e.value) == (
+        f"{file_path}:92:0(3409): Wrong number of values in loop _atom_site_*"
+    )
+
+
 def test_get_unit_cell_lengths_angles(cif_block_URhIn):
     lengths = get_unitcell_lengths(cif_block_URhIn)
     angles = get_unitcell_angles_rad(cif_block_URhIn)
@@ -148,6 +172,15 @@ def test_get_start_end_line_indexes():
     )
 
 
+def test_get_start_end_line_indexes_from_lines():
+    lines = get_file_lines("tests/data/cif/format_author/author.cif")
+    keyword = "_publ_author_address"
+    assert get_start_end_line_indexes_from_lines(lines, keyword) == (
+        54,
+        103,
+    )
+
+
 def test_get_line_content_from_tag(file_path_URhIn):
     content_lines = get_line_content_from_tag(
         file_path_URhIn, "_atom_site_occupancy"
@@ -200,6 +233,12 @@ def test_get_tag_from_third_line():
     assert get_tag_from_third_line(file_path) == "rt_hex"
 
 
+def test_get_tag_from_lines():
+    lines = get_file_lines("tests/data/cif/tag/1817275_rt_hex.cif")
+    assert get_tag_from_lines(lines) == "rt_hex"
+    assert get_tag_from_lines(lines, db_source="ICSD") is None
+
+
 @pytest.mark.fast
 def test_get_parsed_atom_site_occupancy_info(file_path_URhIn):
     atom_site_info = parse_atom_site_occupancy_info(file_path_URhIn)
@@ -0,0 +1,38 @@
+import pytest
+
+from cifkit.utils.bond_pair import order_tuple_pair_by_mendeleev
+from cifkit.utils.label_encoding import LabelEncoding
+
+
+@pytest.mark.fast
+def test_label_encoding():
+    label_encoding = LabelEncoding(["U1", "Rh1", "Rh2", "In1", "U1"])
+    assert label_encoding.site_labels == ["U1", "Rh1", "Rh2", "In1"]
+    assert label_encoding.elements == ["In", "Rh", "U"]
+    assert label_encoding.label_element_ids.tolist() == [2, 1, 1, 0]
+    assert label_encoding.get_element("Rh2") == "Rh"
+
+
+@pytest.mark.fast
+def test_get_element_pair():
+    labels = ["U1", "Rh1", "In1", "Co1", "Ga1"]
+    label_encoding = LabelEncoding(labels)
+    for label in labels:
+        for other_label in labels:
+            elements = (
+                label_encoding.get_element(label),
+                label_encoding.get_element(other_label),
+            )
+            assert label_encoding.get_element_pair(
+                label, other_label
+            ) == tuple(sorted(elements))
+            assert label_encoding.get_element_pair(
+                label, other_label, sorted_by_mendeleev=True
+            ) == order_tuple_pair_by_mendeleev(elements)
+
+
+@pytest.mark.fast
+def test_from_connections(connections_URhIn):
+    label_encoding = LabelEncoding.from_connections(connections_URhIn)
+    assert set(label_encoding.site_labels) == {"In1", "U1", "Rh1", "Rh2"}
+    assert label_encoding.elements == ["In", "Rh", "U"]
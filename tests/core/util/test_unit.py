@@ -3,7 +3,10 @@ import pytest
 
 from cifkit.utils.unit import (
     fractional_to_cartesian,
+    fractional_to_cartesian_array,
+    get_cell_matrix,
     get_radians_from_degrees,
+    round_array,
     round_dict_values,
     round_float,
 )
@@ -55,6 +58,21 @@ def test_fractional_to_cartesian():
     ), f"Expected {expected_cart}, but got {cart_1}"
 
 
+@pytest.mark.fast
+def test_fractional_to_cartesian_array():
+    frac_pts = [[0.2505, 0, 0.5], [0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
+    lengths = [7.476, 7.476, 3.881]
+    angles_rad = get_radians_from_degrees([90, 90, 120])
+
+    cell_matrix = get_cell_matrix(lengths, angles_rad)
+    cart_pts = fractional_to_cartesian_array(frac_pts, cell_matrix)
+
+    assert cart_pts.shape == (3, 3)
+    for frac_pt, cart_pt in zip(frac_pts, cart_pts):
+        expected_cart = fractional_to_cartesian(frac_pt, lengths, angles_rad)
+        assert np.allclose(cart_pt, expected_cart, atol=1e-10)
+
+
 @pytest.mark.fast
 def test_round_dict_values():
     input_dict = {
@@ -76,3 +94,15 @@ def test_round_dict_values():
     assert (
         round_dict_values(input_dict) == expected_dict
     ), "The dictionary values were not rounded correctly."
+
+
+@pytest.mark.fast
+def test_round_array():
+    # np.round gives 0.002 and 0.006 for the values close to a half
+    values = np.array([[0.0025, 0.0055, 0.1234], [1.5, np.nan, 3.0]])
+    expected = [[round(value, 3) for value in row] for row in values.tolist()]
+    rounded_values = round_array(values, 3)
+    assert rounded_values[0].tolist() == expected[0] == [0.003, 0.005, 0.123]
+    assert rounded_values[1, 0] == 1.5
+    assert np.isnan(rounded_values[1, 1])
+    assert rounded_values[1, 2] == 3.0